@@ -127,7 +127,7 @@ export interface Job {
   id: string;
   processor_id: string;
   original_filename: string;
-  status: "pending" | "processing" | "completed" | "failed";
+  status: "pending" | "queued" | "processing" | "completed" | "failed" | "cancelled";
   progress: number;
   message: string;
   result_extension: string;
@@ -152,6 +152,23 @@ export interface BatchWithJobs extends Batch {
   jobs: Job[];
 }
 
+export interface BatchSummary {
+  total: number;
+  pending: number;
+  queued: number;
+  processing: number;
+  completed: number;
+  failed: number;
+  cancelled: number;
+  progress: number;
+}
+
+export type BatchProgressMessage =
+  | { type: "snapshot"; batch: BatchSummary; jobs: Job[] }
+  | { type: "progress"; batch: BatchSummary; jobs: Record<string, ProgressEvent> }
+  | { type: "job_finished"; batch: BatchSummary; job: Job }
+  | { type: "done"; batch: BatchSummary };
+
 export async function fetchProcessors(): Promise<Processor[]> {
   const res = await fetch(`${API_URL()}/processors`);
   if (!res.ok) throw new Error("Failed to fetch processors");
@@ -192,7 +209,31 @@ export function subscribeProgress(
   es.onmessage = (msg) => {
     const data: ProgressEvent = JSON.parse(msg.data);
     onEvent(data);
-    if (data.status === "completed" || data.status === "failed") {
+    if (data.status === "completed" || data.status === "failed" || data.status === "cancelled") {
+      es.close();
+      onDone();
+    }
+  };
+
+  es.onerror = () => {
+    es.close();
+    onDone();
+  };
+
+  return () => es.close();
+}
+
+export function subscribeBatchProgress(
+  batchId: string,
+  onMessage: (m: BatchProgressMessage) => void,
+  onDone: () => void,
+): () => void {
+  const es = new EventSource(`${API_URL()}/jobs/batch/${batchId}/progress`);
+
+  es.onmessage = (msg) => {
+    const data: BatchProgressMessage = JSON.parse(msg.data);
+    onMessage(data);
+    if (data.type === "done") {
       es.close();
       onDone();
     }
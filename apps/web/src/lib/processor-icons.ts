@@ -10,6 +10,7 @@ import Minimize from "lucide-svelte/icons/minimize";
 import Stamp from "lucide-svelte/icons/stamp";
 import FileText from "lucide-svelte/icons/file-text";
 import Camera from "lucide-svelte/icons/camera";
+import Layers from "lucide-svelte/icons/layers";
 import Cpu from "lucide-svelte/icons/cpu";
 import Merge from "lucide-svelte/icons/merge";
 import SplitSquareHorizontal from "lucide-svelte/icons/columns-2";
@@ -38,6 +39,7 @@ const icons: Record<string, ComponentType> = {
   "image-watermark": Stamp,
   "pdf-to-image": FileText,
   "video-thumbnail": Camera,
+  "video-bundle": Layers,
   "pdf-merge": Merge,
   "pdf-split": SplitSquareHorizontal,
   "pdf-compress": FileArchive,
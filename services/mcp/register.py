@@ -11,6 +11,7 @@ Usage:
 
 from __future__ import annotations
 
+import hashlib
 import json
 import logging
 import os
@@ -340,6 +341,44 @@ def ensure_registered(port: int = DEFAULT_MCP_PORT) -> dict[str, str]:
     return results
 
 
+def _fingerprint(port: int) -> str:
+    """Hash of everything registration depends on: port, config files
+    (mtime and size), install hints and this module itself."""
+    parts: list[object] = [port]
+    for path in [Path(__file__)] + [p.resolve_config_path() for p in PROVIDERS]:
+        try:
+            stat = path.stat()
+            parts.append([str(path), stat.st_mtime_ns, stat.st_size])
+        except OSError:
+            parts.append([str(path), None])
+    for provider in PROVIDERS:
+        hint = provider.resolve_detect_hint()
+        parts.append(hint is not None and hint.exists())
+    return hashlib.sha256(json.dumps(parts).encode()).hexdigest()
+
+
+def ensure_registered_cached(state_path: Path, port: int = DEFAULT_MCP_PORT) -> dict[str, str] | None:
+    """Like ``ensure_registered``, but skipped when nothing changed since the last run.
+
+    The fingerprint of the config files after the last registration is
+    kept in ``state_path``. Returns None when registration was skipped.
+    """
+    try:
+        if state_path.read_text(encoding="utf-8").strip() == _fingerprint(port):
+            return None
+    except OSError:
+        pass
+
+    results = ensure_registered(port)
+    if "error" not in results.values():
+        try:
+            state_path.parent.mkdir(parents=True, exist_ok=True)
+            state_path.write_text(_fingerprint(port) + "\n", encoding="utf-8")
+        except OSError as exc:
+            logger.warning("Could not save registration state to %s: %s", state_path, exc)
+    return results
+
+
 def ensure_removed() -> dict[str, str]:
     """Remove Vimix MCP from all agent configurations.
 
@@ -7,6 +7,11 @@ All file processing happens 100% locally — files are read from disk, sent to t
 local Vimix backend at localhost:8787, processed on your machine, and saved back
 to disk. No data ever leaves your computer.
 
+When the backend runs on this machine and allows the file's directory
+(``VIMIX_LOCAL_PATH_ROOTS`` on the backend), files are submitted by path
+instead of uploaded, and the backend writes results straight to their
+destination. Otherwise the files are uploaded as before.
+
 Usage:
     python server.py                  # Streamable HTTP on :8788 (default)
     python server.py stdio            # stdio transport (for subprocess-based agents)
@@ -14,17 +19,22 @@ Usage:
 Environment variables:
     VIMIX_API_URL   — backend URL (default: http://localhost:8787)
     VIMIX_MCP_PORT  — server port (default: 8788)
+    VIMIX_MCP_DOWNLOADS — batch results downloaded at once (default: 4)
 """
 
 from __future__ import annotations
 
 import asyncio
+import contextlib
 import json
 import logging
 import mimetypes
 import os
 import sys
+import time
 from pathlib import Path
+from typing import AsyncIterator
+from urllib.parse import urlparse
 
 import httpx
 from mcp.server.fastmcp import FastMCP
@@ -33,9 +43,15 @@ logger = logging.getLogger("vimix.mcp")
 
 VIMIX_API_URL = os.environ.get("VIMIX_API_URL", "http://localhost:8787")
 VIMIX_MCP_PORT = int(os.environ.get("VIMIX_MCP_PORT", "8788"))
-POLL_INTERVAL = 2  # seconds
+POLL_INTERVAL = 2  # seconds, only when progress streams are unavailable
 POLL_TIMEOUT = 300  # 5 minutes
 MAX_POLL_RETRIES = 5  # consecutive transient errors before giving up
+HEALTH_TTL = 10  # seconds a successful health check is trusted
+STATUS_CHUNK = 100  # job ids per bulk status request
+FINISHED_STATUSES = ("completed", "failed", "cancelled")
+DOWNLOAD_CONCURRENCY = max(1, int(os.environ.get("VIMIX_MCP_DOWNLOADS", "4")))
+CHUNK_SIZE = 1024 * 1024
+LOCAL_BACKEND = urlparse(VIMIX_API_URL).hostname in ("localhost", "127.0.0.1", "::1")
 
 mcp = FastMCP(
     "vimix",
@@ -43,6 +59,8 @@ mcp = FastMCP(
         "Vimix is a local media-processing toolkit that processes files 100% on your machine. "
         "No data ever leaves your computer. Use list_processors to discover available tools "
         "and their options, then process_file or batch_process to run them. "
+        "For long jobs (e.g. video background removal) or many files, use submit_job, "
+        "then get_job_status and fetch_result, so you are not blocked while they run. "
         "The Vimix desktop app (or API backend) must be running."
     ),
     host="127.0.0.1",
@@ -50,15 +68,32 @@ mcp = FastMCP(
 )
 
 
+_http: httpx.AsyncClient | None = None
+_healthy_until = 0.0
+# Output directory of each job started with submit_job, for fetch_result
+_result_dirs: dict[str, Path] = {}
+
+
 def _client() -> httpx.AsyncClient:
-    return httpx.AsyncClient(
-        base_url=VIMIX_API_URL,
-        timeout=httpx.Timeout(connect=10, read=120, write=120, pool=10),
-    )
+    """Return the shared client, so connections are reused across tool calls."""
+    global _http
+    if _http is None or _http.is_closed:
+        _http = httpx.AsyncClient(
+            base_url=VIMIX_API_URL,
+            timeout=httpx.Timeout(connect=10, read=120, write=120, pool=10),
+            limits=httpx.Limits(max_connections=64, max_keepalive_connections=16),
+        )
+    return _http
 
 
 async def _health_check(client: httpx.AsyncClient) -> None:
-    """Raise a clear error if the Vimix backend is not reachable."""
+    """Raise a clear error if the Vimix backend is not reachable.
+
+    A successful check is reused for ``HEALTH_TTL`` seconds.
+    """
+    global _healthy_until
+    if time.monotonic() < _healthy_until:
+        return
     try:
         resp = await client.get("/health")
         resp.raise_for_status()
@@ -70,61 +105,229 @@ async def _health_check(client: httpx.AsyncClient) -> None:
         )
     except httpx.HTTPStatusError as exc:
         raise RuntimeError(f"Vimix backend health check failed: {exc.response.status_code}")
+    _healthy_until = time.monotonic() + HEALTH_TTL
 
 
-async def _poll_job(client: httpx.AsyncClient, job_id: str) -> dict:
-    """Poll a job until it reaches a terminal state (completed/failed) or timeout.
+def _job_outcome(job: dict) -> dict | RuntimeError:
+    """The finished job itself if it completed, otherwise the error to report."""
+    status = job.get("status")
+    if status == "completed":
+        return job
+    if status == "cancelled":
+        return RuntimeError("Processing was cancelled")
+    error = job.get("error") or job.get("message") or "Unknown processing error"
+    return RuntimeError(f"Processing failed: {error}")
+
+
+async def _sse_events(client: httpx.AsyncClient, url: str) -> AsyncIterator[dict]:
+    """Yield the JSON ``data:`` payloads of a server-sent event stream."""
+    # The backend sends an event or a keepalive well within this read timeout
+    timeout = httpx.Timeout(connect=10, read=90, write=10, pool=10)
+    async with client.stream("GET", url, timeout=timeout) as resp:
+        resp.raise_for_status()
+        async for line in resp.aiter_lines():
+            if line.startswith("data:"):
+                yield json.loads(line[5:])
+
+
+async def _stream_job(client: httpx.AsyncClient, job_id: str) -> dict[str, dict]:
+    """Follow ``/jobs/{id}/progress`` until the job finishes."""
+    while True:
+        async for event in _sse_events(client, f"/jobs/{job_id}/progress"):
+            if event.get("status") in FINISHED_STATUSES:
+                resp = await client.get(f"/jobs/{job_id}")
+                resp.raise_for_status()
+                return {job_id: resp.json()}
+        # The stream ends after a minute without events (e.g. while queued)
+
+
+async def _stream_batch(client: httpx.AsyncClient, batch_id: str) -> dict[str, dict]:
+    """Follow ``/jobs/batch/{id}/progress`` until every job finished."""
+    finished: dict[str, dict] = {}
+    async for message in _sse_events(client, f"/jobs/batch/{batch_id}/progress"):
+        if message["type"] == "snapshot":
+            finished.update({j["id"]: j for j in message["jobs"] if j["status"] in FINISHED_STATUSES})
+        elif message["type"] == "job_finished":
+            finished[message["job"]["id"]] = message["job"]
+        elif message["type"] == "done":
+            return finished
+    raise httpx.RemoteProtocolError("Batch progress stream ended early")
+
+
+async def _poll_jobs(client: httpx.AsyncClient, job_ids: list[str]) -> dict[str, dict]:
+    """Poll the bulk status endpoint until every job finished.
 
     Retries on transient network errors to handle brief hiccups during
     long-running jobs (video processing can take minutes).
     """
-    elapsed = 0
+    pending = set(job_ids)
+    finished: dict[str, dict] = {}
     consecutive_errors = 0
-    last_status = "unknown"
 
-    while elapsed < POLL_TIMEOUT:
+    while pending:
         try:
-            resp = await client.get(f"/jobs/{job_id}")
-            resp.raise_for_status()
-            job = resp.json()
+            for job_id, job in (await _job_statuses(client, sorted(pending))).items():
+                if job is None:
+                    finished[job_id] = {"id": job_id, "status": "failed", "error": "Job not found"}
+                elif job["status"] in FINISHED_STATUSES:
+                    finished[job_id] = job
+            pending.difference_update(finished)
             consecutive_errors = 0  # reset on success
         except (httpx.TimeoutException, httpx.ConnectError, httpx.ReadError) as exc:
             consecutive_errors += 1
-            logger.warning("Poll error for job %s (attempt %d): %s", job_id, consecutive_errors, exc)
+            logger.warning("Poll error (attempt %d): %s", consecutive_errors, exc)
             if consecutive_errors >= MAX_POLL_RETRIES:
                 raise RuntimeError(
-                    f"Lost connection to Vimix backend while polling job {job_id}. "
-                    f"The job may still be running — check the Vimix app."
+                    "Lost connection to Vimix backend while waiting for jobs. "
+                    "They may still be running — check the Vimix app."
                 )
+        if pending:
             await asyncio.sleep(POLL_INTERVAL)
-            elapsed += POLL_INTERVAL
-            continue
 
-        last_status = job.get("status", "unknown")
-        if last_status == "completed":
-            return job
-        if last_status == "failed":
-            error = job.get("error") or job.get("message") or "Unknown processing error"
-            raise RuntimeError(f"Processing failed: {error}")
+    return finished
 
-        await asyncio.sleep(POLL_INTERVAL)
-        elapsed += POLL_INTERVAL
 
-    raise RuntimeError(
-        f"Processing timed out after {POLL_TIMEOUT}s (last status: {last_status}). "
-        f"The job may still be running — check the Vimix app."
-    )
+async def _wait_for_jobs(
+    client: httpx.AsyncClient, job_ids: list[str], batch_id: str | None = None
+) -> dict[str, dict | RuntimeError]:
+    """Wait until every job finished and return each one's outcome.
 
+    Completion is driven by the backend's progress streams (the batch
+    stream when ``batch_id`` is given, otherwise the job's own stream), so
+    results are picked up as soon as they are ready. If a stream cannot be
+    used, falls back to polling. Gives up after ``POLL_TIMEOUT`` seconds.
+    """
+    async def wait() -> dict[str, dict]:
+        try:
+            if batch_id:
+                return await _stream_batch(client, batch_id)
+            if len(job_ids) == 1:
+                return await _stream_job(client, job_ids[0])
+        except (httpx.HTTPError, ValueError, KeyError) as exc:
+            logger.warning("Progress stream failed, polling instead: %s", exc)
+        return await _poll_jobs(client, job_ids)
 
-async def _download_result(client: httpx.AsyncClient, job_id: str, output_path: Path) -> Path:
-    """Download the result file for a completed job."""
-    resp = await client.get(f"/jobs/{job_id}/result", timeout=120)
+    try:
+        finished = await asyncio.wait_for(wait(), POLL_TIMEOUT)
+    except asyncio.TimeoutError:
+        raise RuntimeError(
+            f"Processing timed out after {POLL_TIMEOUT}s. "
+            f"The job may still be running — check the Vimix app, "
+            f"or use submit_job for long jobs."
+        )
+    return {
+        job_id: _job_outcome(finished.get(job_id, {"status": "failed", "error": "Job not found"}))
+        for job_id in job_ids
+    }
+
+
+async def _wait_for_job(client: httpx.AsyncClient, job_id: str) -> dict:
+    """Wait for one job and return it once completed; raise if it did not."""
+    outcome = (await _wait_for_jobs(client, [job_id]))[job_id]
+    if isinstance(outcome, Exception):
+        raise outcome
+    return outcome
+
+
+async def _submit_local(client: httpx.AsyncClient, endpoint: str, data: dict) -> dict | None:
+    """Submit a job by local path. Returns None if the backend does not allow it."""
+    if not LOCAL_BACKEND:
+        return None
+    # Results replace earlier ones at the same path, like downloaded results do
+    resp = await client.post(endpoint, data={**data, "overwrite": "true"})
+    if resp.status_code == 403:
+        logger.info("Backend refused local paths, uploading instead: %s", resp.json().get("detail"))
+        return None
+    if resp.status_code == 400:
+        detail = resp.json().get("detail", resp.text)
+        raise RuntimeError(f"Bad request: {detail}")
     resp.raise_for_status()
+    return resp.json()
+
+
+def _upload_field(name: str, path: Path, stack: contextlib.ExitStack) -> tuple[str, tuple]:
+    """Multipart field for ``path``; httpx streams the open file in chunks."""
+    mime = mimetypes.guess_type(str(path))[0] or "application/octet-stream"
+    return name, (path.name, stack.enter_context(path.open("rb")), mime)
+
+
+async def _download_result(client: httpx.AsyncClient, job_id: str, output_path: Path) -> Path:
+    """Stream the result file of a completed job to disk.
+
+    The body is written in chunks to a temporary file next to the target,
+    which replaces the target only once the download is complete.
+    """
     output_path.parent.mkdir(parents=True, exist_ok=True)
-    output_path.write_bytes(resp.content)
+    partial = output_path.with_name(output_path.name + ".part")
+    try:
+        async with client.stream("GET", f"/jobs/{job_id}/result", timeout=120) as resp:
+            resp.raise_for_status()
+            with partial.open("wb") as f:
+                async for chunk in resp.aiter_bytes(CHUNK_SIZE):
+                    f.write(chunk)
+        os.replace(partial, output_path)
+    finally:
+        partial.unlink(missing_ok=True)
     return output_path
 
 
+def _input_files(file_paths: list[str]) -> list[Path]:
+    """Resolve input paths, raising if any of them is missing."""
+    if not file_paths:
+        raise RuntimeError("No file paths provided.")
+
+    input_files = []
+    for fp in file_paths:
+        p = Path(fp).expanduser().resolve()
+        if not p.is_file():
+            raise RuntimeError(f"File not found: {p}")
+        input_files.append(p)
+    return input_files
+
+
+def _output_dir(input_files: list[Path], output_dir: str | None) -> Path:
+    """The requested output directory, or the first input's directory."""
+    out_dir = Path(output_dir).expanduser().resolve() if output_dir else input_files[0].parent
+    out_dir.mkdir(parents=True, exist_ok=True)
+    return out_dir
+
+
+async def _submit_batch(
+    client: httpx.AsyncClient, processor_id: str, input_files: list[Path], opts: dict, out_dir: Path
+) -> dict:
+    """Create a batch by local paths, or by uploading the files if that is refused."""
+    data: dict[str, str] = {"processor_id": processor_id}
+    if opts:
+        data["options"] = json.dumps(opts)
+
+    local_data = {**data, "local_paths": [str(f) for f in input_files], "output_dir": str(out_dir)}
+    batch = await _submit_local(client, "/jobs/batch", local_data)
+
+    if batch is None:
+        # Multipart upload streamed from the open files
+        with contextlib.ExitStack() as stack:
+            upload_files = [_upload_field("files", f, stack) for f in input_files]
+            resp = await client.post("/jobs/batch", files=upload_files, data=data)
+        if resp.status_code == 400:
+            detail = resp.json().get("detail", resp.text)
+            raise RuntimeError(f"Bad request: {detail}")
+        resp.raise_for_status()
+        batch = resp.json()
+    return batch
+
+
+async def _job_statuses(client: httpx.AsyncClient, job_ids: list[str]) -> dict[str, dict | None]:
+    """Current state of each job from the bulk status endpoint; None if unknown."""
+    statuses: dict[str, dict | None] = {}
+    for i in range(0, len(job_ids), STATUS_CHUNK):
+        resp = await client.get("/jobs", params={"ids": ",".join(job_ids[i:i + STATUS_CHUNK])})
+        resp.raise_for_status()
+        body = resp.json()
+        statuses.update({job["id"]: job for job in body["jobs"]})
+        statuses.update({job_id: None for job_id in body["missing"]})
+    return statuses
+
+
 def _auto_output_path(input_path: Path, processor_id: str, result_ext: str) -> Path:
     """Generate an output path like photo_image-compress.webp next to the original."""
     ext = result_ext if result_ext.startswith(".") else f".{result_ext}"
@@ -153,11 +356,11 @@ async def list_processors() -> str:
     and configurable options so you can choose the right processor and parameters.
     """
     try:
-        async with _client() as client:
-            await _health_check(client)
-            resp = await client.get("/processors")
-            resp.raise_for_status()
-            processors = resp.json()
+        client = _client()
+        await _health_check(client)
+        resp = await client.get("/processors")
+        resp.raise_for_status()
+        processors = resp.json()
     except RuntimeError:
         raise
     except Exception as exc:
@@ -216,29 +419,39 @@ async def process_file(
         raise RuntimeError(f"File not found: {input_file}")
 
     opts = options or {}
-    mime_type = mimetypes.guess_type(str(input_file))[0] or "application/octet-stream"
 
     try:
-        async with _client() as client:
-            await _health_check(client)
-
-            # Submit job
-            files = {"file": (input_file.name, input_file.read_bytes(), mime_type)}
-            data: dict[str, str] = {"processor_id": processor_id}
-            if opts:
-                data["options"] = json.dumps(opts)
-
-            resp = await client.post("/jobs", files=files, data=data)
+        client = _client()
+        await _health_check(client)
+
+        data: dict[str, str] = {"processor_id": processor_id}
+        if opts:
+            data["options"] = json.dumps(opts)
+
+        # Let the backend read the file and write the result in place
+        local_data = {**data, "local_path": str(input_file)}
+        if output_path:
+            local_data["output_path"] = str(Path(output_path).expanduser().resolve())
+        else:
+            local_data["output_dir"] = str(input_file.parent)
+        job = await _submit_local(client, "/jobs", local_data)
+
+        if job is None:
+            with contextlib.ExitStack() as stack:
+                files = [_upload_field("file", input_file, stack)]
+                resp = await client.post("/jobs", files=files, data=data)
             if resp.status_code == 400:
                 detail = resp.json().get("detail", resp.text)
                 raise RuntimeError(f"Bad request: {detail}")
             resp.raise_for_status()
             job = resp.json()
-            job_id = job["id"]
+        job_id = job["id"]
 
-            # Poll until done
-            completed_job = await _poll_job(client, job_id)
+        completed_job = await _wait_for_job(client, job_id)
 
+        if completed_job.get("output_path"):
+            out = Path(completed_job["output_path"])
+        else:
             # Determine output path
             result_ext = completed_job.get("result_extension", "")
             if output_path:
@@ -284,73 +497,59 @@ async def batch_process(
         options: Processor-specific options as a dict.
         output_dir: Directory to save results. If omitted, saves next to the first input file.
     """
-    if not file_paths:
-        raise RuntimeError("No file paths provided.")
-
-    input_files = []
-    for fp in file_paths:
-        p = Path(fp).expanduser().resolve()
-        if not p.is_file():
-            raise RuntimeError(f"File not found: {p}")
-        input_files.append(p)
-
-    opts = options or {}
-    out_dir = Path(output_dir).expanduser().resolve() if output_dir else input_files[0].parent
-    out_dir.mkdir(parents=True, exist_ok=True)
+    input_files = _input_files(file_paths)
+    out_dir = _output_dir(input_files, output_dir)
 
     try:
-        async with _client() as client:
-            await _health_check(client)
+        client = _client()
+        await _health_check(client)
 
-            # Build multipart upload
-            upload_files = []
-            for f in input_files:
-                mime = mimetypes.guess_type(str(f))[0] or "application/octet-stream"
-                upload_files.append(("files", (f.name, f.read_bytes(), mime)))
+        batch = await _submit_batch(client, processor_id, input_files, options or {}, out_dir)
 
-            data: dict[str, str] = {"processor_id": processor_id}
-            if opts:
-                data["options"] = json.dumps(opts)
-
-            resp = await client.post("/jobs/batch", files=upload_files, data=data)
-            if resp.status_code == 400:
-                detail = resp.json().get("detail", resp.text)
-                raise RuntimeError(f"Bad request: {detail}")
-            resp.raise_for_status()
-            batch = resp.json()
+        results: list[str] = []
 
-            results: list[str] = []
-
-            if batch.get("type") == "job":
-                # Multi-file processor — single combined job
-                job_id = batch["id"]
-                completed = await _poll_job(client, job_id)
+        if batch.get("type") == "job":
+            # Multi-file processor — single combined job
+            job_id = batch["id"]
+            completed = await _wait_for_job(client, job_id)
+            if completed.get("output_path"):
+                results.append(completed["output_path"])
+            else:
                 result_ext = completed.get("result_extension", "")
                 out_name = f"batch_{processor_id}{result_ext if result_ext.startswith('.') else '.' + result_ext}"
                 out_path = out_dir / out_name
                 await _download_result(client, job_id, out_path)
                 results.append(str(out_path))
-            else:
-                # Single-file processor — one job per file
-                job_ids = batch.get("job_ids", [])
-
-                # Poll all jobs concurrently
-                completed_jobs = await asyncio.gather(
-                    *[_poll_job(client, jid) for jid in job_ids],
-                    return_exceptions=True,
-                )
-
-                for i, result in enumerate(completed_jobs):
-                    if isinstance(result, Exception):
-                        results.append(f"FAILED ({job_ids[i]}): {result}")
-                        continue
-                    result_ext = result.get("result_extension", "")
-                    orig_name = result.get("original_filename", f"file_{i}")
-                    stem = Path(orig_name).stem
-                    ext = result_ext if result_ext.startswith(".") else f".{result_ext}"
-                    out_path = out_dir / f"{stem}_{processor_id}{ext}"
-                    await _download_result(client, job_ids[i], out_path)
-                    results.append(str(out_path))
+        else:
+            # Single-file processor — one job per file
+            job_ids = batch.get("job_ids", [])
+
+            outcomes = await _wait_for_jobs(client, job_ids, batch.get("id"))
+            completed_jobs = [outcomes[jid] for jid in job_ids]
+
+            # Download finished results a few at a time
+            downloads = asyncio.Semaphore(DOWNLOAD_CONCURRENCY)
+
+            async def fetch(i: int, result: dict | BaseException) -> str:
+                if isinstance(result, BaseException):
+                    return f"FAILED ({job_ids[i]}): {result}"
+                if result.get("output_path"):
+                    return result["output_path"]
+                result_ext = result.get("result_extension", "")
+                orig_name = result.get("original_filename", f"file_{i}")
+                stem = Path(orig_name).stem
+                ext = result_ext if result_ext.startswith(".") else f".{result_ext}"
+                out_path = out_dir / f"{stem}_{processor_id}{ext}"
+                async with downloads:
+                    try:
+                        await _download_result(client, job_ids[i], out_path)
+                    except (httpx.HTTPError, OSError) as exc:
+                        return f"FAILED ({job_ids[i]}): download failed: {exc}"
+                return str(out_path)
+
+            results.extend(await asyncio.gather(
+                *[fetch(i, result) for i, result in enumerate(completed_jobs)]
+            ))
 
     except RuntimeError:
         raise
@@ -360,16 +559,150 @@ async def batch_process(
     return f"Batch complete! {len(results)} file(s) processed:\n" + "\n".join(f"  - {r}" for r in results)
 
 
+@mcp.tool()
+async def submit_job(
+    processor_id: str,
+    file_paths: list[str],
+    options: dict | None = None,
+    output_dir: str | None = None,
+) -> str:
+    """Start processing files and return immediately with the job IDs.
+
+    Use this instead of process_file / batch_process for long jobs or many
+    files, then check on them with get_job_status and collect results with
+    fetch_result. Single-file processors get one job per file; multi-file
+    processors (e.g. pdf-merge) get one job for all files.
+
+    Args:
+        processor_id: Processor to use. Use list_processors to see available IDs.
+        file_paths: List of absolute paths to input files.
+        options: Processor-specific options as a dict.
+        output_dir: Directory for the results. If omitted, next to the first input file.
+    """
+    input_files = _input_files(file_paths)
+    out_dir = _output_dir(input_files, output_dir)
+
+    try:
+        client = _client()
+        await _health_check(client)
+        batch = await _submit_batch(client, processor_id, input_files, options or {}, out_dir)
+    except RuntimeError:
+        raise
+    except Exception as exc:
+        raise RuntimeError(f"Submitting failed: {exc}") from exc
+
+    if batch.get("type") == "job":
+        job_ids = [batch["id"]]
+        lines = [f"  - {batch['id']}: {len(input_files)} files combined"]
+    else:
+        job_ids = batch.get("job_ids", [])
+        lines = [f"  - {jid}: {f.name}" for jid, f in zip(job_ids, input_files)]
+    for jid in job_ids:
+        _result_dirs[jid] = out_dir
+
+    return f"Submitted {len(job_ids)} job(s):\n" + "\n".join(lines)
+
+
+@mcp.tool()
+async def get_job_status(job_ids: list[str]) -> str:
+    """Check the status of any number of jobs in one call.
+
+    Args:
+        job_ids: Job IDs returned by submit_job.
+    """
+    if not job_ids:
+        raise RuntimeError("No job IDs provided.")
+
+    try:
+        client = _client()
+        await _health_check(client)
+        statuses = await _job_statuses(client, job_ids)
+    except RuntimeError:
+        raise
+    except Exception as exc:
+        raise RuntimeError(f"Failed to get job status: {exc}") from exc
+
+    counts: dict[str, int] = {}
+    lines: list[str] = []
+    for jid in job_ids:
+        job = statuses.get(jid)
+        if job is None:
+            counts["not found"] = counts.get("not found", 0) + 1
+            lines.append(f"  - {jid}: not found")
+            continue
+        status = job["status"]
+        counts[status] = counts.get(status, 0) + 1
+        line = f"  - {jid} ({job['original_filename']}): {status}"
+        if status in ("queued", "processing"):
+            line += f" {job['progress']:.0f}% {job['message']}".rstrip()
+        elif status == "failed":
+            line += f" — {job.get('error') or job.get('message')}"
+        elif status == "completed" and job.get("output_path"):
+            line += f" → {job['output_path']}"
+        lines.append(line)
+
+    summary = ", ".join(f"{n} {status}" for status, n in counts.items())
+    return f"{summary}\n" + "\n".join(lines)
+
+
+@mcp.tool()
+async def fetch_result(job_id: str, output_path: str | None = None) -> str:
+    """Save the result of a completed job to disk.
+
+    Returns the job's status instead if it has not completed yet.
+
+    Args:
+        job_id: Job ID returned by submit_job.
+        output_path: Where to save the result. If omitted, uses the output directory given to submit_job.
+    """
+    try:
+        client = _client()
+        await _health_check(client)
+        job = (await _job_statuses(client, [job_id]))[job_id]
+        if job is None:
+            raise RuntimeError(f"Job not found: {job_id}")
+        if job["status"] != "completed":
+            outcome = _job_outcome(job) if job["status"] in FINISHED_STATUSES else None
+            if outcome is not None:
+                raise outcome
+            return f"Not ready: {job['status']} {job['progress']:.0f}% {job['message']}".rstrip()
+
+        if output_path:
+            out = Path(output_path).expanduser().resolve()
+        elif job.get("output_path"):
+            # Already written to disk by the backend
+            out = Path(job["output_path"])
+        elif job_id in _result_dirs:
+            stem = Path(job["original_filename"]).stem
+            ext = job.get("result_extension", "")
+            ext = ext if ext.startswith(".") else f".{ext}"
+            out = _result_dirs[job_id] / f"{stem}_{job['processor_id']}{ext}"
+        else:
+            raise RuntimeError(f"No output directory known for job {job_id}; pass output_path.")
+
+        if str(out) != job.get("output_path"):
+            await _download_result(client, job_id, out)
+    except RuntimeError:
+        raise
+    except Exception as exc:
+        raise RuntimeError(f"Fetching result failed: {exc}") from exc
+
+    _result_dirs.pop(job_id, None)
+    return f"Saved to: {out} ({_format_size(out.stat().st_size)})"
+
+
 if __name__ == "__main__":
     logging.basicConfig(level=logging.INFO, format="%(asctime)s %(name)s %(levelname)s %(message)s")
 
-    # Auto-register in all detected agents before starting
-    from register import ensure_registered
+    # Auto-register in all detected agents before starting, unless the
+    # backend that launched us has already done it
+    if not os.environ.get("VIMIX_MCP_SKIP_REGISTER"):
+        from register import ensure_registered
 
-    results = ensure_registered(port=VIMIX_MCP_PORT)
-    for name, status in results.items():
-        if status == "registered":
-            print(f"  [+] Registered MCP in {name}")
+        results = ensure_registered(port=VIMIX_MCP_PORT)
+        for name, status in results.items():
+            if status == "registered":
+                print(f"  [+] Registered MCP in {name}")
 
     transport = sys.argv[1] if len(sys.argv) > 1 else "streamable-http"
     if transport == "stdio":
@@ -2,6 +2,11 @@ from __future__ import annotations
 
 import os
 import sys
+import time
+
+# Reference point for the time-to-first-healthy-response measurement. Taken
+# before the imports below, which are a large part of startup time.
+_STARTED = time.monotonic()
 
 # Limit numba's internal parallelism to 1 thread to avoid contention with
 # ONNX Runtime's own thread pool. Must be set before numba is imported
@@ -12,7 +17,7 @@ os.environ.setdefault("NUMBA_NUM_THREADS", "1")
 import asyncio
 import logging
 import subprocess
-from contextlib import asynccontextmanager
+from contextlib import asynccontextmanager, suppress
 
 from fastapi import FastAPI
 
@@ -24,27 +29,50 @@ if getattr(sys, "frozen", False):
         os.environ.setdefault("U2NET_HOME", _model_dir)
 from fastapi.middleware.cors import CORSMiddleware
 
-from app.routers import jobs, processors, oauth
-from app.services.job_manager import job_manager
-from app.services.file_manager import cleanup_job
+from app.routers import jobs, processors, oauth, uploads
+from app.services.job_manager import Job, job_manager
+from app.services.file_manager import BASE_DIR, cleanup_job, remove_orphaned_dirs
+from app.services.job_store import JobStore, open_store_from_env
+from app.services.model_sessions import session_cache, warm_models_from_env
+from app.services import executors, process_pool
+from app.services.upload_store import remove_dirs, upload_store
 
 logger = logging.getLogger("vimix")
 
+# Fingerprint of the agent config files at the last MCP registration
+MCP_REGISTRATION_STATE = BASE_DIR / "mcp-registration"
+
 CLEANUP_INTERVAL = 600  # check every 10 minutes
 CLEANUP_MAX_AGE = 3600  # remove jobs older than 1 hour
 
 
+def _cleanup_files(job_ids: list[str]) -> None:
+    for job_id in job_ids:
+        cleanup_job(job_id)
+
+
+async def _remove_expired() -> int:
+    """Drop expired jobs and idle uploads, deleting their files on the io executor."""
+    loop = asyncio.get_running_loop()
+    expired = job_manager.collect_expired(CLEANUP_MAX_AGE)
+    for job_id in expired:
+        job_manager.remove_job(job_id)
+    if expired:
+        await loop.run_in_executor(executors.get_executor("io"), _cleanup_files, expired)
+    idle_uploads = upload_store.collect_expired(CLEANUP_MAX_AGE)
+    if idle_uploads:
+        await loop.run_in_executor(executors.get_executor("io"), remove_dirs, idle_uploads)
+    return len(expired) + len(idle_uploads)
+
+
 async def _cleanup_loop() -> None:
-    """Periodically remove expired jobs and their files."""
+    """Periodically remove expired jobs, idle uploads and their files."""
     while True:
         await asyncio.sleep(CLEANUP_INTERVAL)
         try:
-            expired = job_manager.collect_expired(CLEANUP_MAX_AGE)
-            for job_id in expired:
-                cleanup_job(job_id)
-                job_manager.remove_job(job_id)
-            if expired:
-                logger.info("Cleaned up %d expired job(s)", len(expired))
+            removed = await _remove_expired()
+            if removed:
+                logger.info("Cleaned up %d expired job(s) and upload(s)", removed)
         except Exception:
             logger.exception("Error during cleanup")
 
@@ -76,6 +104,8 @@ def _start_mcp_server() -> None:
             cwd=mcp_dir,
             stdout=log_file,
             stderr=log_file,
+            # Registration is done by the backend (see _register_mcp)
+            env={**os.environ, "VIMIX_MCP_SKIP_REGISTER": "1"},
         )
         logger.info("MCP server started (pid=%d, port=8788, log=%s)", _mcp_process.pid, log_path)
     except OSError:
@@ -92,7 +122,11 @@ def _stop_mcp_server() -> None:
 
 
 def _register_mcp() -> None:
-    """Register Vimix MCP server in all detected AI agent configurations."""
+    """Register Vimix MCP server in all detected AI agent configurations.
+
+    Skipped when the config files are unchanged since the last run.
+    Blocking — runs on the io executor.
+    """
     try:
         mcp_dir = os.path.join(os.path.dirname(__file__), "..", "..", "mcp")
         if os.path.isfile(os.path.join(mcp_dir, "register.py")):
@@ -104,9 +138,12 @@ def _register_mcp() -> None:
             if os.path.isfile(os.path.join(mcp_bundle, "register.py")):
                 sys.path.insert(0, mcp_bundle)
 
-        from register import ensure_registered
+        from register import ensure_registered_cached
 
-        results = ensure_registered()
+        results = ensure_registered_cached(MCP_REGISTRATION_STATE)
+        if results is None:
+            logger.debug("MCP registration unchanged, skipped")
+            return
         registered = [n for n, s in results.items() if s == "registered"]
         if registered:
             logger.info("Registered MCP in: %s", ", ".join(registered))
@@ -114,13 +151,64 @@ def _register_mcp() -> None:
         logger.debug("MCP registration skipped (module not available)")
 
 
+async def _start_mcp() -> None:
+    """Register and launch the MCP server without holding up startup."""
+    loop = asyncio.get_running_loop()
+    io = executors.get_executor("io")
+    await asyncio.gather(
+        loop.run_in_executor(io, _register_mcp),
+        loop.run_in_executor(io, _start_mcp_server),
+    )
+
+
+def _restore_jobs() -> tuple[JobStore | None, list[Job]]:
+    """Reload persisted jobs (``VIMIX_JOB_STORE``); returns the interrupted ones."""
+    store = open_store_from_env()
+    if store is None:
+        return None, []
+    interrupted = job_manager.attach_store(store)
+    logger.info("Restored %d job(s) from %s", len(job_manager.job_ids()), store.path)
+    return store, interrupted
+
+
+async def _recover_jobs(interrupted: list[Job]) -> None:
+    """Re-queue interrupted jobs, then delete directories of unknown jobs.
+
+    Runs in the background after startup. Jobs created in the meantime are
+    registered before their directories exist, so the sweep keeps them.
+    """
+    await jobs.resume_jobs(interrupted)
+    loop = asyncio.get_running_loop()
+    removed = await loop.run_in_executor(
+        executors.get_executor("io"), remove_orphaned_dirs, lambda job_id: job_manager.get(job_id) is not None
+    )
+    if removed:
+        logger.info("Removed %d orphaned director(ies)", removed)
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    _register_mcp()
-    _start_mcp_server()
+    mcp_task = asyncio.create_task(_start_mcp())
+    store, interrupted = _restore_jobs()
+    recovery = asyncio.create_task(_recover_jobs(interrupted)) if store is not None else None
+    warm_models = warm_models_from_env()
+    if warm_models:
+        # Load models in the background so startup is not delayed
+        asyncio.get_running_loop().run_in_executor(executors.get_executor("onnx-serial"), session_cache.warm_up, warm_models)
+    # Spawn the CPU worker processes (VIMIX_CPU_BACKEND=process) off the loop
+    asyncio.get_running_loop().run_in_executor(executors.get_executor("io"), process_pool.start)
     task = asyncio.create_task(_cleanup_loop())
+    _startup_timings["lifespan_ms"] = _elapsed_ms()
     yield
     task.cancel()
+    await mcp_task
+    if recovery is not None:
+        recovery.cancel()
+        with suppress(asyncio.CancelledError):
+            await recovery
+    if store is not None:
+        store.close()
+    executors.shutdown()
     _stop_mcp_server()
 
 
@@ -140,25 +228,42 @@ app.add_middleware(
 app.include_router(processors.router)
 app.include_router(jobs.router)
 app.include_router(oauth.router)
+app.include_router(uploads.router)
+
+
+def _elapsed_ms() -> float:
+    return round((time.monotonic() - _STARTED) * 1000, 1)
+
+
+# Milliseconds since the process started, per startup phase
+_startup_timings: dict[str, float] = {"imports_ms": _elapsed_ms()}
 
 
 @app.get("/health")
 async def health():
-    return {"status": "ok"}
+    if "first_healthy_ms" not in _startup_timings:
+        _startup_timings["first_healthy_ms"] = _elapsed_ms()
+        logger.info(
+            "First healthy response %.0f ms after start (imports done at %.0f ms, lifespan at %.0f ms)",
+            _startup_timings["first_healthy_ms"],
+            _startup_timings["imports_ms"],
+            _startup_timings.get("lifespan_ms", 0.0),
+        )
+    return {"status": "ok", "startup": _startup_timings}
 
 
 @app.delete("/cleanup")
 async def manual_cleanup():
     """Manually trigger cleanup of expired jobs (older than 1 hour)."""
-    expired = job_manager.collect_expired(CLEANUP_MAX_AGE)
-    for job_id in expired:
-        cleanup_job(job_id)
-        job_manager.remove_job(job_id)
-    return {"removed": len(expired)}
+    return {"removed": await _remove_expired()}
 
 
 if __name__ == "__main__":
     import argparse
+    import multiprocessing
+
+    # Required for process-pool workers in the PyInstaller bundle
+    multiprocessing.freeze_support()
 
     import uvicorn
 
@@ -1,11 +1,11 @@
 from __future__ import annotations
 
-import asyncio
 from pathlib import Path
 from typing import Any
 
 from app.processors.base import BaseProcessor, ProgressCallback
 from app.services.binary_paths import get_ffmpeg
+from app.services.ffmpeg_runner import media_duration, run_ffmpeg
 
 _FORMAT_CONFIG: dict[str, dict[str, Any]] = {
     "mp3": {"ext": ".mp3", "codec": "libmp3lame"},
@@ -21,6 +21,7 @@ class AudioConvertProcessor(BaseProcessor):
     label = "Convert Audio"
     description = "Convert audio files between formats with bitrate and sample rate control."
     accepted_extensions = [".mp3", ".wav", ".aac", ".ogg", ".flac", ".m4a", ".wma"]
+    resource_class = "ffmpeg"
 
     @property
     def options_schema(self) -> list[dict]:
@@ -65,6 +66,9 @@ class AudioConvertProcessor(BaseProcessor):
             },
         ]
 
+    def output_extensions(self, input_extensions: set[str], options: dict[str, Any]) -> set[str] | None:
+        return {_FORMAT_CONFIG[str(options.get("format", "mp3"))]["ext"]}
+
     async def process(
         self,
         input_path: Path,
@@ -96,14 +100,14 @@ class AudioConvertProcessor(BaseProcessor):
 
         cmd += ["-y", str(output_file)]
 
-        proc = await asyncio.create_subprocess_exec(
-            *cmd,
-            stdout=asyncio.subprocess.PIPE,
-            stderr=asyncio.subprocess.PIPE,
+        duration = await media_duration(input_path)
+        await run_ffmpeg(
+            cmd,
+            on_progress=on_progress,
+            duration=duration,
+            message="Converting audio",
+            error="FFmpeg audio convert failed",
         )
-        _, stderr = await proc.communicate()
-        if proc.returncode != 0:
-            raise RuntimeError(f"FFmpeg audio convert failed: {stderr.decode()}")
 
         await on_progress(100, "Done!")
         return output_file
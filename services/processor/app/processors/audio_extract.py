@@ -1,11 +1,13 @@
 from __future__ import annotations
 
-import asyncio
 from pathlib import Path
 from typing import Any
 
 from app.processors.base import BaseProcessor, ProgressCallback
 from app.services.binary_paths import get_ffmpeg
+from app.services.ffmpeg_runner import media_duration, run_ffmpeg
+from app.services.media_info import MediaInfo
+from app.services.shared_decode import SharedOutput
 
 _FORMAT_CONFIG: dict[str, dict[str, Any]] = {
     "mp3": {"ext": ".mp3", "codec": "libmp3lame", "default_bitrate": "192k"},
@@ -21,6 +23,7 @@ class AudioExtractProcessor(BaseProcessor):
     label = "Extract Audio"
     description = "Extract the audio track from a video as MP3, AAC, WAV, FLAC, or OGG."
     accepted_extensions = [".mp4", ".mov", ".webm", ".avi", ".mkv"]
+    resource_class = "ffmpeg"
 
     @property
     def options_schema(self) -> list[dict]:
@@ -54,6 +57,9 @@ class AudioExtractProcessor(BaseProcessor):
             },
         ]
 
+    def output_extensions(self, input_extensions: set[str], options: dict[str, Any]) -> set[str] | None:
+        return {_FORMAT_CONFIG[str(options.get("format", "mp3"))]["ext"]}
+
     async def process(
         self,
         input_path: Path,
@@ -64,7 +70,6 @@ class AudioExtractProcessor(BaseProcessor):
     ) -> Path:
         opts = options or {}
         fmt: str = str(opts.get("format", "mp3"))
-        bitrate: str = str(opts.get("bitrate", "192k"))
 
         config = _FORMAT_CONFIG[fmt]
         output_file = output_dir / f"output{config['ext']}"
@@ -75,22 +80,40 @@ class AudioExtractProcessor(BaseProcessor):
             get_ffmpeg(), "-hide_banner", "-loglevel", "error",
             "-i", str(input_path),
             "-vn",
-            "-c:a", config["codec"],
+            *_codec_args(opts),
+            "-y", str(output_file),
         ]
 
-        if config["default_bitrate"] is not None:
-            cmd += ["-b:a", bitrate]
-
-        cmd += ["-y", str(output_file)]
-
-        proc = await asyncio.create_subprocess_exec(
-            *cmd,
-            stdout=asyncio.subprocess.PIPE,
-            stderr=asyncio.subprocess.PIPE,
+        duration = await media_duration(input_path)
+        await run_ffmpeg(
+            cmd,
+            on_progress=on_progress,
+            duration=duration,
+            message="Extracting audio",
+            error="FFmpeg audio extract failed",
         )
-        _, stderr = await proc.communicate()
-        if proc.returncode != 0:
-            raise RuntimeError(f"FFmpeg audio extract failed: {stderr.decode()}")
 
         await on_progress(100, "Done!")
         return output_file
+
+    def shared_output(self, options: dict[str, Any], info: MediaInfo) -> SharedOutput | None:
+        """This processor's output as part of a single-decode FFmpeg command.
+
+        None if the input has no audio track.
+        """
+        if not info.has_audio:
+            return None
+        config = _FORMAT_CONFIG[str(options.get("format", "mp3"))]
+        return SharedOutput(
+            filename=f"output{config['ext']}",
+            audio="",
+            args=["-vn", *_codec_args(options)],
+        )
+
+
+def _codec_args(opts: dict[str, Any]) -> list[str]:
+    config = _FORMAT_CONFIG[str(opts.get("format", "mp3"))]
+    args = ["-c:a", config["codec"]]
+    if config["default_bitrate"] is not None:
+        args += ["-b:a", str(opts.get("bitrate", "192k"))]
+    return args
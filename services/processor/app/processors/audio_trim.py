@@ -1,11 +1,11 @@
 from __future__ import annotations
 
-import asyncio
 from pathlib import Path
 from typing import Any
 
 from app.processors.base import BaseProcessor, ProgressCallback
 from app.services.binary_paths import get_ffmpeg
+from app.services.ffmpeg_runner import clip_duration, media_duration, parse_time, run_ffmpeg
 
 
 class AudioTrimProcessor(BaseProcessor):
@@ -13,6 +13,7 @@ class AudioTrimProcessor(BaseProcessor):
     label = "Trim Audio"
     description = "Cut a segment from an audio file by selecting start time and duration."
     accepted_extensions = [".mp3", ".wav", ".aac", ".ogg", ".flac", ".m4a", ".wma"]
+    resource_class = "ffmpeg"
 
     @property
     def options_schema(self) -> list[dict]:
@@ -45,6 +46,10 @@ class AudioTrimProcessor(BaseProcessor):
             },
         ]
 
+    def output_extensions(self, input_extensions: set[str], options: dict[str, Any]) -> set[str] | None:
+        fmt = str(options.get("format", "same"))
+        return set(input_extensions) if fmt == "same" else {f".{fmt}"}
+
     async def process(
         self,
         input_path: Path,
@@ -76,14 +81,14 @@ class AudioTrimProcessor(BaseProcessor):
             "-y", str(output_file),
         ]
 
-        proc = await asyncio.create_subprocess_exec(
-            *cmd,
-            stdout=asyncio.subprocess.PIPE,
-            stderr=asyncio.subprocess.PIPE,
+        total = await media_duration(input_path)
+        await run_ffmpeg(
+            cmd,
+            on_progress=on_progress,
+            duration=clip_duration(total, parse_time(start) or 0, parse_time(duration)),
+            message="Trimming audio",
+            error="FFmpeg audio trim failed",
         )
-        _, stderr = await proc.communicate()
-        if proc.returncode != 0:
-            raise RuntimeError(f"FFmpeg audio trim failed: {stderr.decode()}")
 
         await on_progress(100, "Done!")
         return output_file
@@ -35,6 +35,25 @@ class BaseProcessor(ABC):
         """Whether this processor accepts multiple files as input."""
         return False
 
+    @property
+    def resource_class(self) -> str | None:
+        """Scheduler queue this processor's jobs run in.
+
+        One of "ffmpeg", "cpu" (Pillow), "pdf" (PyMuPDF) or "onnx" (rembg).
+        Each class has its own concurrency limit. None means the processor
+        takes slots itself while it runs (see ``JobScheduler.slot``).
+        """
+        return "cpu"
+
+    def output_extensions(self, input_extensions: set[str], options: dict[str, Any]) -> set[str] | None:
+        """File extensions the result can have for inputs with ``input_extensions``.
+
+        ``options`` are validated and filled with defaults. Pipelines use this
+        to reject a step that cannot read the previous step's output before
+        any job is created. None means the extension is not known up front.
+        """
+        return None
+
     @property
     def options_schema(self) -> list[dict]:
         """Declare configurable options for this processor.
@@ -1,20 +1,18 @@
 from __future__ import annotations
 
 import asyncio
-from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Any
 
 from PIL import Image
-from rembg import new_session, remove
 
 from app.processors.base import BaseProcessor, ProgressCallback
+from app.services.executors import get_executor
+from app.services.model_sessions import session_cache
 
-# Single-thread pool: numba's workqueue threading layer is not threadsafe and
-# crashes when called from multiple Python threads. Routing all rembg/pymatting
-# calls through one thread avoids this. Performance is not affected because
-# ONNX Runtime manages its own internal thread pool for model inference.
-_pool = ThreadPoolExecutor(max_workers=1)
+# All rembg/pymatting calls go through the shared single-thread executor
+# (see app.services.model_sessions for why).
+_pool = get_executor("onnx-serial")
 
 
 class ImageBgRemoveProcessor(BaseProcessor):
@@ -22,6 +20,7 @@ class ImageBgRemoveProcessor(BaseProcessor):
     label = "Image Background Removal"
     description = "Remove the background from an image and export with transparency."
     accepted_extensions = [".png", ".jpg", ".jpeg", ".webp", ".bmp", ".tiff"]
+    resource_class = "onnx"
 
     @property
     def options_schema(self) -> list[dict]:
@@ -89,6 +88,9 @@ class ImageBgRemoveProcessor(BaseProcessor):
             },
         ]
 
+    def output_extensions(self, input_extensions: set[str], options: dict[str, Any]) -> set[str] | None:
+        return {f".{options.get('format', 'png')}"}
+
     async def process(
         self,
         input_path: Path,
@@ -109,11 +111,11 @@ class ImageBgRemoveProcessor(BaseProcessor):
 
         await on_progress(10, f"Loading model ({model_name})...")
         loop = asyncio.get_running_loop()
-        session = await loop.run_in_executor(_pool, new_session, model_name)
+        session = await loop.run_in_executor(_pool, session_cache.get, model_name)
 
         await on_progress(30, "Removing background...")
         await loop.run_in_executor(
-            _pool, _process_image, input_path, output_file, session,
+            _pool, _process_image, input_path, output_file, session, model_name,
             refine_edges, fg_threshold, bg_threshold, erode_size,
         )
 
@@ -122,22 +124,26 @@ class ImageBgRemoveProcessor(BaseProcessor):
 
 
 def _process_image(
-    src: Path, dest: Path, session: object,
+    src: Path, dest: Path, session: object, model_name: str,
     refine_edges: bool,
     fg_threshold: int = 240,
     bg_threshold: int = 10,
     erode_size: int = 10,
 ) -> None:
+    # rembg pulls in onnxruntime, numba and scipy; import it on first use
+    from rembg import remove
+
     with Image.open(src) as im:
         im = im.convert("RGBA")
-        result = remove(
-            im,
-            session=session,
-            alpha_matting=refine_edges,
-            alpha_matting_foreground_threshold=fg_threshold,
-            alpha_matting_background_threshold=bg_threshold,
-            alpha_matting_erode_size=erode_size,
-        )
+        with session_cache.time_inference(model_name):
+            result = remove(
+                im,
+                session=session,
+                alpha_matting=refine_edges,
+                alpha_matting_foreground_threshold=fg_threshold,
+                alpha_matting_background_threshold=bg_threshold,
+                alpha_matting_erode_size=erode_size,
+            )
         if isinstance(result, bytes):
             dest.write_bytes(result)
         else:
@@ -1,17 +1,14 @@
 from __future__ import annotations
 
 import asyncio
-import os
-from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Any
 
 from PIL import Image
 
 from app.processors.base import BaseProcessor, ProgressCallback
+from app.services.executors import get_executor
 
-_MAX_WORKERS = max(2, (os.cpu_count() or 4) // 2)
-_pool = ThreadPoolExecutor(max_workers=_MAX_WORKERS)
 
 # Map input extensions to Pillow save format + output extension
 _FORMAT_MAP: dict[str, tuple[str, str]] = {
@@ -76,6 +73,12 @@ class ImageCompressProcessor(BaseProcessor):
             },
         ]
 
+    def output_extensions(self, input_extensions: set[str], options: dict[str, Any]) -> set[str] | None:
+        out_format = str(options.get("format", "auto"))
+        if out_format == "auto":
+            return {_FORMAT_MAP.get(ext, ("WEBP", ".webp"))[1] for ext in input_extensions}
+        return {f".{out_format}"}
+
     async def process(
         self,
         input_path: Path,
@@ -105,7 +108,7 @@ class ImageCompressProcessor(BaseProcessor):
         await on_progress(20, "Compressing image...")
         loop = asyncio.get_running_loop()
         await loop.run_in_executor(
-            _pool,
+            get_executor("cpu"),
             _compress_image,
             input_path,
             output_file,
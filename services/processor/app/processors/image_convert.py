@@ -1,17 +1,13 @@
 from __future__ import annotations
 
 import asyncio
-import os
-from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Any
 
 from PIL import Image
 
 from app.processors.base import BaseProcessor, ProgressCallback
-
-_MAX_WORKERS = max(2, (os.cpu_count() or 4) // 2)
-_pool = ThreadPoolExecutor(max_workers=_MAX_WORKERS)
+from app.services.executors import get_executor
 
 
 class ImageConvertProcessor(BaseProcessor):
@@ -58,6 +54,9 @@ class ImageConvertProcessor(BaseProcessor):
             },
         ]
 
+    def output_extensions(self, input_extensions: set[str], options: dict[str, Any]) -> set[str] | None:
+        return {f".{options.get('format', 'png')}"}
+
     async def process(
         self,
         input_path: Path,
@@ -76,7 +75,7 @@ class ImageConvertProcessor(BaseProcessor):
         await on_progress(20, "Converting image...")
         loop = asyncio.get_running_loop()
         await loop.run_in_executor(
-            _pool, _convert_image, input_path, output_file, out_format, quality, resize
+            get_executor("cpu"), _convert_image, input_path, output_file, out_format, quality, resize
         )
 
         await on_progress(100, "Done!")
@@ -1,15 +1,12 @@
 from __future__ import annotations
 
 import asyncio
-import os
-from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Any
 
 from app.processors.base import BaseProcessor, ProgressCallback
+from app.services.executors import get_executor
 
-_MAX_WORKERS = max(2, (os.cpu_count() or 4) // 2)
-_pool = ThreadPoolExecutor(max_workers=_MAX_WORKERS)
 
 _PAGE_SIZES = {
     "a4": (595.276, 841.890),
@@ -22,6 +19,7 @@ class ImageToPdfProcessor(BaseProcessor):
     label = "Image to PDF"
     description = "Convert one or more images into a single PDF document."
     accepted_extensions = [".png", ".jpg", ".jpeg", ".webp", ".bmp", ".tiff"]
+    resource_class = "pdf"
 
     @property
     def accepts_multiple_files(self) -> bool:
@@ -63,6 +61,9 @@ class ImageToPdfProcessor(BaseProcessor):
             },
         ]
 
+    def output_extensions(self, input_extensions: set[str], options: dict[str, Any]) -> set[str] | None:
+        return {".pdf"}
+
     async def process(
         self,
         input_path: Path,
@@ -82,7 +83,7 @@ class ImageToPdfProcessor(BaseProcessor):
 
         loop = asyncio.get_running_loop()
         await loop.run_in_executor(
-            _pool, _images_to_pdf, paths, output_file, page_size, orientation, margin_mm
+            get_executor("cpu"), _images_to_pdf, paths, output_file, page_size, orientation, margin_mm
         )
 
         await on_progress(100, "Done!")
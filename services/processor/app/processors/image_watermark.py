@@ -1,17 +1,14 @@
 from __future__ import annotations
 
 import asyncio
-import os
-from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Any
 
 from PIL import Image, ImageDraw, ImageFont
 
 from app.processors.base import BaseProcessor, ProgressCallback
+from app.services.executors import get_executor
 
-_MAX_WORKERS = max(2, (os.cpu_count() or 4) // 2)
-_pool = ThreadPoolExecutor(max_workers=_MAX_WORKERS)
 
 _POSITIONS: dict[str, str] = {
     "bottom-right": "br",
@@ -93,6 +90,9 @@ class ImageWatermarkProcessor(BaseProcessor):
             },
         ]
 
+    def output_extensions(self, input_extensions: set[str], options: dict[str, Any]) -> set[str] | None:
+        return {f".{options.get('format', 'png')}"}
+
     async def process(
         self,
         input_path: Path,
@@ -114,7 +114,7 @@ class ImageWatermarkProcessor(BaseProcessor):
         await on_progress(20, "Adding watermark...")
         loop = asyncio.get_running_loop()
         await loop.run_in_executor(
-            _pool,
+            get_executor("cpu"),
             _apply_watermark,
             input_path,
             output_file,
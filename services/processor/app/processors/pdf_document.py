@@ -0,0 +1,101 @@
+"""Base class for PyMuPDF processors that edit a single document.
+
+These processors only say what they change: ``edit_document()`` edits the
+open ``fitz.Document`` and ``save_options()`` returns keyword arguments for
+``Document.save``. Opening and saving is shared, so a pipeline can run
+several of them on one open document and write the file once (see
+``app.processors.pipeline``).
+
+The work runs on the ``cpu`` executor, which may be a process pool
+(``VIMIX_CPU_BACKEND=process``). ``run_document_steps`` therefore takes
+processor IDs and plain options and looks the processors up in the worker.
+"""
+from __future__ import annotations
+
+import asyncio
+from pathlib import Path
+from typing import Any
+
+from app.processors.base import BaseProcessor, ProgressCallback
+from app.services.executors import get_executor
+
+
+class PdfDocumentProcessor(BaseProcessor):
+    """A processor that edits one PDF in place and saves it."""
+
+    accepted_extensions = [".pdf"]
+    resource_class = "pdf"
+    # Progress message while the document is processed
+    progress_message = "Processing PDF..."
+    # The saved file cannot be edited further in the same session (it is
+    # encrypted), so pipelines save after this step
+    seals_document = False
+
+    def check_options(self, options: dict[str, Any]) -> None:
+        """Raise ValueError for options that cannot work, before opening the file."""
+
+    def edit_document(self, doc: Any, options: dict[str, Any]) -> None:
+        """Change the open document. Runs on the ``cpu`` executor."""
+
+    def save_options(self, options: dict[str, Any]) -> dict[str, Any]:
+        """Keyword arguments this step needs for ``Document.save``."""
+        return {}
+
+    def output_extensions(self, input_extensions: set[str], options: dict[str, Any]) -> set[str] | None:
+        return {".pdf"}
+
+    async def process(
+        self,
+        input_path: Path,
+        output_dir: Path,
+        on_progress: ProgressCallback,
+        options: dict[str, Any] | None = None,
+        input_paths: list[Path] | None = None,
+    ) -> Path:
+        return await process_document(
+            input_path, output_dir, on_progress, [(self, options or {})], self.progress_message
+        )
+
+
+async def process_document(
+    input_path: Path,
+    output_dir: Path,
+    on_progress: ProgressCallback,
+    steps: list[tuple[PdfDocumentProcessor, dict[str, Any]]],
+    message: str,
+) -> Path:
+    """Apply ``steps`` to ``input_path`` with one open document and one save."""
+    for processor, options in steps:
+        processor.check_options(options)
+    output_file = output_dir / "output.pdf"
+
+    await on_progress(10, message)
+
+    loop = asyncio.get_running_loop()
+    await loop.run_in_executor(
+        get_executor("cpu"),
+        run_document_steps,
+        input_path,
+        output_file,
+        [(processor.id, options) for processor, options in steps],
+    )
+
+    await on_progress(100, "Done!")
+    return output_file
+
+
+def run_document_steps(src: Path, dest: Path, steps: list[tuple[str, dict[str, Any]]]) -> None:
+    import pymupdf as fitz
+
+    from app.processors.registry import get_processor
+
+    processors = [(get_processor(processor_id), options) for processor_id, options in steps]
+    save_kwargs: dict[str, Any] = {}
+    doc = fitz.open(str(src))
+    try:
+        for processor, options in processors:
+            processor.edit_document(doc, options)
+            save_kwargs.update(processor.save_options(options))
+        doc.save(str(dest), **save_kwargs)
+    finally:
+        doc.close()
@@ -2,15 +2,11 @@ from __future__ import annotations
 
 import asyncio
 import json
-import os
-from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Any
 
 from app.processors.base import BaseProcessor, ProgressCallback
-
-_MAX_WORKERS = max(2, (os.cpu_count() or 4) // 2)
-_pool = ThreadPoolExecutor(max_workers=_MAX_WORKERS)
+from app.services.executors import get_executor
 
 
 class PdfExtractTextProcessor(BaseProcessor):
@@ -18,6 +14,7 @@ class PdfExtractTextProcessor(BaseProcessor):
     label = "Extract Text from PDF"
     description = "Extract all text content from a PDF as plain text or JSON."
     accepted_extensions = [".pdf"]
+    resource_class = "pdf"
 
     @property
     def options_schema(self) -> list[dict]:
@@ -51,6 +48,9 @@ class PdfExtractTextProcessor(BaseProcessor):
             },
         ]
 
+    def output_extensions(self, input_extensions: set[str], options: dict[str, Any]) -> set[str] | None:
+        return {f".{options.get('format', 'txt')}"}
+
     async def process(
         self,
         input_path: Path,
@@ -69,7 +69,7 @@ class PdfExtractTextProcessor(BaseProcessor):
 
         loop = asyncio.get_running_loop()
         await loop.run_in_executor(
-            _pool, _extract_text, input_path, output_file, fmt, pages_mode, page_range
+            get_executor("cpu"), _extract_text, input_path, output_file, fmt, pages_mode, page_range
         )
 
         await on_progress(100, "Done!")
@@ -1,15 +1,11 @@
 from __future__ import annotations
 
 import asyncio
-import os
-from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Any
 
 from app.processors.base import BaseProcessor, ProgressCallback
-
-_MAX_WORKERS = max(2, (os.cpu_count() or 4) // 2)
-_pool = ThreadPoolExecutor(max_workers=_MAX_WORKERS)
+from app.services.executors import get_executor
 
 
 class PdfMergeProcessor(BaseProcessor):
@@ -17,6 +13,7 @@ class PdfMergeProcessor(BaseProcessor):
     label = "Merge PDFs"
     description = "Combine multiple PDF files into a single document."
     accepted_extensions = [".pdf"]
+    resource_class = "pdf"
 
     @property
     def accepts_multiple_files(self) -> bool:
@@ -26,6 +23,9 @@ class PdfMergeProcessor(BaseProcessor):
     def options_schema(self) -> list[dict]:
         return []
 
+    def output_extensions(self, input_extensions: set[str], options: dict[str, Any]) -> set[str] | None:
+        return {".pdf"}
+
     async def process(
         self,
         input_path: Path,
@@ -40,7 +40,7 @@ class PdfMergeProcessor(BaseProcessor):
         await on_progress(10, "Merging PDFs...")
 
         loop = asyncio.get_running_loop()
-        await loop.run_in_executor(_pool, _merge_pdfs, paths, output_file)
+        await loop.run_in_executor(get_executor("cpu"), _merge_pdfs, paths, output_file)
 
         await on_progress(100, "Done!")
         return output_file
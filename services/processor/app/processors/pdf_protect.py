@@ -1,22 +1,16 @@
 from __future__ import annotations
 
-import asyncio
-import os
-from concurrent.futures import ThreadPoolExecutor
-from pathlib import Path
 from typing import Any
 
-from app.processors.base import BaseProcessor, ProgressCallback
+from app.processors.pdf_document import PdfDocumentProcessor
 
-_MAX_WORKERS = max(2, (os.cpu_count() or 4) // 2)
-_pool = ThreadPoolExecutor(max_workers=_MAX_WORKERS)
 
-
-class PdfProtectProcessor(BaseProcessor):
+class PdfProtectProcessor(PdfDocumentProcessor):
     id = "pdf-protect"
     label = "Protect PDF"
     description = "Add password protection and permission restrictions to a PDF."
-    accepted_extensions = [".pdf"]
+    progress_message = "Protecting PDF..."
+    seals_document = True
 
     @property
     def options_schema(self) -> list[dict]:
@@ -41,60 +35,35 @@ class PdfProtectProcessor(BaseProcessor):
             },
         ]
 
-    async def process(
-        self,
-        input_path: Path,
-        output_dir: Path,
-        on_progress: ProgressCallback,
-        options: dict[str, Any] | None = None,
-        input_paths: list[Path] | None = None,
-    ) -> Path:
-        opts = options or {}
-        password = str(opts.get("password", ""))
-        permissions = str(opts.get("permissions", "all"))
-        output_file = output_dir / "output.pdf"
-
-        if not password:
+    def check_options(self, options: dict[str, Any]) -> None:
+        if not str(options.get("password", "")):
             raise ValueError("Password is required")
 
-        await on_progress(10, "Protecting PDF...")
-
-        loop = asyncio.get_running_loop()
-        await loop.run_in_executor(
-            _pool, _protect_pdf, input_path, output_file, password, permissions
-        )
-
-        await on_progress(100, "Done!")
-        return output_file
-
-
-def _protect_pdf(src: Path, dest: Path, password: str, permissions: str) -> None:
-    import pymupdf as fitz
-
-    perm_map = {
-        "all": int(
-            fitz.PDF_PERM_PRINT
-            | fitz.PDF_PERM_MODIFY
-            | fitz.PDF_PERM_COPY
-            | fitz.PDF_PERM_ANNOTATE
-        ),
-        "no_print": int(
-            fitz.PDF_PERM_MODIFY | fitz.PDF_PERM_COPY | fitz.PDF_PERM_ANNOTATE
-        ),
-        "no_copy": int(
-            fitz.PDF_PERM_PRINT | fitz.PDF_PERM_MODIFY | fitz.PDF_PERM_ANNOTATE
-        ),
-        "read_only": 0,
-    }
-
-    perm = perm_map.get(permissions, perm_map["all"])
-
-    doc = fitz.open(str(src))
-    doc.save(
-        str(dest),
-        encryption=fitz.PDF_ENCRYPT_AES_256,
-        user_pw=password,
-        owner_pw=password,
-        permissions=perm,
-    )
-    doc.close()
+    def save_options(self, options: dict[str, Any]) -> dict[str, Any]:
+        import pymupdf as fitz
+
+        password = str(options.get("password", ""))
+        perm_map = {
+            "all": int(
+                fitz.PDF_PERM_PRINT
+                | fitz.PDF_PERM_MODIFY
+                | fitz.PDF_PERM_COPY
+                | fitz.PDF_PERM_ANNOTATE
+            ),
+            "no_print": int(
+                fitz.PDF_PERM_MODIFY | fitz.PDF_PERM_COPY | fitz.PDF_PERM_ANNOTATE
+            ),
+            "no_copy": int(
+                fitz.PDF_PERM_PRINT | fitz.PDF_PERM_MODIFY | fitz.PDF_PERM_ANNOTATE
+            ),
+            "read_only": 0,
+        }
+
+        perm = perm_map.get(str(options.get("permissions", "all")), perm_map["all"])
+
+        return {
+            "encryption": fitz.PDF_ENCRYPT_AES_256,
+            "user_pw": password,
+            "owner_pw": password,
+            "permissions": perm,
+        }
@@ -1,22 +1,15 @@
 from __future__ import annotations
 
-import asyncio
-import os
-from concurrent.futures import ThreadPoolExecutor
-from pathlib import Path
 from typing import Any
 
-from app.processors.base import BaseProcessor, ProgressCallback
+from app.processors.pdf_document import PdfDocumentProcessor
 
-_MAX_WORKERS = max(2, (os.cpu_count() or 4) // 2)
-_pool = ThreadPoolExecutor(max_workers=_MAX_WORKERS)
 
-
-class PdfRotateProcessor(BaseProcessor):
+class PdfRotateProcessor(PdfDocumentProcessor):
     id = "pdf-rotate"
     label = "Rotate PDF"
     description = "Rotate all or specific pages of a PDF by 90, 180, or 270 degrees."
-    accepted_extensions = [".pdf"]
+    progress_message = "Rotating pages..."
 
     @property
     def options_schema(self) -> list[dict]:
@@ -51,29 +44,20 @@ class PdfRotateProcessor(BaseProcessor):
             },
         ]
 
-    async def process(
-        self,
-        input_path: Path,
-        output_dir: Path,
-        on_progress: ProgressCallback,
-        options: dict[str, Any] | None = None,
-        input_paths: list[Path] | None = None,
-    ) -> Path:
-        opts = options or {}
-        angle = int(opts.get("angle", 90))
-        pages_mode = str(opts.get("pages", "all"))
-        page_range = str(opts.get("range", "1-3"))
-        output_file = output_dir / "output.pdf"
-
-        await on_progress(10, "Rotating pages...")
+    def edit_document(self, doc: Any, options: dict[str, Any]) -> None:
+        angle = int(options.get("angle", 90))
+        pages_mode = str(options.get("pages", "all"))
+        page_range = str(options.get("range", "1-3"))
+        total = len(doc)
 
-        loop = asyncio.get_running_loop()
-        await loop.run_in_executor(
-            _pool, _rotate_pdf, input_path, output_file, angle, pages_mode, page_range
-        )
+        if pages_mode == "range":
+            indices = _parse_page_range(page_range, total)
+        else:
+            indices = list(range(total))
 
-        await on_progress(100, "Done!")
-        return output_file
+        for idx in indices:
+            page = doc[idx]
+            page.set_rotation((page.rotation + angle) % 360)
 
 
 def _parse_page_range(range_str: str, total_pages: int) -> list[int]:
@@ -91,21 +75,3 @@ def _parse_page_range(range_str: str, total_pages: int) -> list[int]:
                 pages.append(num - 1)
     return list(dict.fromkeys(pages))
 
-
-def _rotate_pdf(src: Path, dest: Path, angle: int, pages_mode: str, page_range: str) -> None:
-    import pymupdf as fitz
-
-    doc = fitz.open(str(src))
-    total = len(doc)
-
-    if pages_mode == "range":
-        indices = _parse_page_range(page_range, total)
-    else:
-        indices = list(range(total))
-
-    for idx in indices:
-        page = doc[idx]
-        page.set_rotation((page.rotation + angle) % 360)
-
-    doc.save(str(dest))
-    doc.close()
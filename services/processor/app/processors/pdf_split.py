@@ -1,16 +1,12 @@
 from __future__ import annotations
 
 import asyncio
-import os
 import zipfile
-from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Any
 
 from app.processors.base import BaseProcessor, ProgressCallback
-
-_MAX_WORKERS = max(2, (os.cpu_count() or 4) // 2)
-_pool = ThreadPoolExecutor(max_workers=_MAX_WORKERS)
+from app.services.executors import get_executor
 
 
 class PdfSplitProcessor(BaseProcessor):
@@ -18,6 +14,7 @@ class PdfSplitProcessor(BaseProcessor):
     label = "Split PDF"
     description = "Extract specific pages or split a PDF into separate files."
     accepted_extensions = [".pdf"]
+    resource_class = "pdf"
 
     @property
     def options_schema(self) -> list[dict]:
@@ -41,6 +38,10 @@ class PdfSplitProcessor(BaseProcessor):
             },
         ]
 
+    def output_extensions(self, input_extensions: set[str], options: dict[str, Any]) -> set[str] | None:
+        # Several pages are zipped
+        return {".pdf", ".zip"} if str(options.get("mode", "all_pages")) == "all_pages" else {".pdf"}
+
     async def process(
         self,
         input_path: Path,
@@ -57,7 +58,7 @@ class PdfSplitProcessor(BaseProcessor):
 
         loop = asyncio.get_running_loop()
         result = await loop.run_in_executor(
-            _pool, _split_pdf, input_path, output_dir, mode, page_range
+            get_executor("cpu"), _split_pdf, input_path, output_dir, mode, page_range
         )
 
         await on_progress(100, "Done!")
@@ -1,16 +1,12 @@
 from __future__ import annotations
 
 import asyncio
-import os
 import zipfile
-from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Any
 
 from app.processors.base import BaseProcessor, ProgressCallback
-
-_MAX_WORKERS = max(2, (os.cpu_count() or 4) // 2)
-_pool = ThreadPoolExecutor(max_workers=_MAX_WORKERS)
+from app.services.executors import get_executor
 
 
 class PdfToImageProcessor(BaseProcessor):
@@ -18,6 +14,7 @@ class PdfToImageProcessor(BaseProcessor):
     label = "PDF to Image"
     description = "Convert PDF pages to images (PNG, JPG, or WebP)."
     accepted_extensions = [".pdf"]
+    resource_class = "pdf"
 
     @property
     def options_schema(self) -> list[dict]:
@@ -66,6 +63,11 @@ class PdfToImageProcessor(BaseProcessor):
             },
         ]
 
+    def output_extensions(self, input_extensions: set[str], options: dict[str, Any]) -> set[str] | None:
+        ext = f".{options.get('format', 'png')}"
+        # Several pages are zipped
+        return {ext} if str(options.get("pages", "all")) == "first" else {ext, ".zip"}
+
     async def process(
         self,
         input_path: Path,
@@ -84,7 +86,7 @@ class PdfToImageProcessor(BaseProcessor):
 
         loop = asyncio.get_running_loop()
         result = await loop.run_in_executor(
-            _pool,
+            get_executor("cpu"),
             _convert_pdf,
             input_path,
             output_dir,
@@ -1,15 +1,11 @@
 from __future__ import annotations
 
 import asyncio
-import os
-from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Any
 
 from app.processors.base import BaseProcessor, ProgressCallback
-
-_MAX_WORKERS = max(2, (os.cpu_count() or 4) // 2)
-_pool = ThreadPoolExecutor(max_workers=_MAX_WORKERS)
+from app.services.executors import get_executor
 
 
 class PdfUnlockProcessor(BaseProcessor):
@@ -17,6 +13,7 @@ class PdfUnlockProcessor(BaseProcessor):
     label = "Unlock PDF"
     description = "Remove password protection from a PDF file."
     accepted_extensions = [".pdf"]
+    resource_class = "pdf"
 
     @property
     def options_schema(self) -> list[dict]:
@@ -29,6 +26,9 @@ class PdfUnlockProcessor(BaseProcessor):
             },
         ]
 
+    def output_extensions(self, input_extensions: set[str], options: dict[str, Any]) -> set[str] | None:
+        return {".pdf"}
+
     async def process(
         self,
         input_path: Path,
@@ -48,7 +48,7 @@ class PdfUnlockProcessor(BaseProcessor):
 
         loop = asyncio.get_running_loop()
         await loop.run_in_executor(
-            _pool, _unlock_pdf, input_path, output_file, password
+            get_executor("cpu"), _unlock_pdf, input_path, output_file, password
         )
 
         await on_progress(100, "Done!")
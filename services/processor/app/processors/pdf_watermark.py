@@ -1,23 +1,16 @@
 from __future__ import annotations
 
-import asyncio
 import math
-import os
-from concurrent.futures import ThreadPoolExecutor
-from pathlib import Path
 from typing import Any
 
-from app.processors.base import BaseProcessor, ProgressCallback
+from app.processors.pdf_document import PdfDocumentProcessor
 
-_MAX_WORKERS = max(2, (os.cpu_count() or 4) // 2)
-_pool = ThreadPoolExecutor(max_workers=_MAX_WORKERS)
 
-
-class PdfWatermarkProcessor(BaseProcessor):
+class PdfWatermarkProcessor(PdfDocumentProcessor):
     id = "pdf-watermark"
     label = "PDF Watermark"
     description = "Add a text watermark to every page of a PDF document."
-    accepted_extensions = [".pdf"]
+    progress_message = "Adding watermark..."
 
     @property
     def options_schema(self) -> list[dict]:
@@ -69,31 +62,31 @@ class PdfWatermarkProcessor(BaseProcessor):
             },
         ]
 
-    async def process(
-        self,
-        input_path: Path,
-        output_dir: Path,
-        on_progress: ProgressCallback,
-        options: dict[str, Any] | None = None,
-        input_paths: list[Path] | None = None,
-    ) -> Path:
-        opts = options or {}
-        text = str(opts.get("text", "CONFIDENTIAL"))
-        opacity = int(opts.get("opacity", 30)) / 100.0
-        angle = int(opts.get("angle", -45))
-        font_size = int(opts.get("font_size", 48))
-        color = str(opts.get("color", "gray"))
-        output_file = output_dir / "output.pdf"
+    def edit_document(self, doc: Any, options: dict[str, Any]) -> None:
+        import pymupdf as fitz
+
+        text = str(options.get("text", "CONFIDENTIAL"))
+        opacity = int(options.get("opacity", 30)) / 100.0
+        angle = int(options.get("angle", -45))
+        font_size = int(options.get("font_size", 48))
+        color = str(options.get("color", "gray"))
+        rgb = _COLORS.get(color, _COLORS["gray"])
 
-        await on_progress(10, "Adding watermark...")
+        for page in doc:
+            rect = page.rect
+            cx, cy = rect.width / 2, rect.height / 2
 
-        loop = asyncio.get_running_loop()
-        await loop.run_in_executor(
-            _pool, _add_watermark, input_path, output_file, text, opacity, angle, font_size, color
-        )
+            # Create text with rotation using a text writer
+            tw = fitz.TextWriter(page.rect, opacity=opacity)
+            tw.append(
+                fitz.Point(cx, cy),
+                text,
+                fontsize=font_size,
+            )
 
-        await on_progress(100, "Done!")
-        return output_file
+            # Calculate rotation matrix centered on page
+            morph = (fitz.Point(cx, cy), fitz.Matrix(angle))
+            tw.write_text(page, morph=morph, color=rgb)
 
 
 _COLORS: dict[str, tuple[float, float, float]] = {
@@ -102,37 +95,3 @@ _COLORS: dict[str, tuple[float, float, float]] = {
     "blue": (0.1, 0.1, 0.8),
     "black": (0, 0, 0),
 }
-
-
-def _add_watermark(
-    src: Path,
-    dest: Path,
-    text: str,
-    opacity: float,
-    angle: int,
-    font_size: int,
-    color: str,
-) -> None:
-    import pymupdf as fitz
-
-    doc = fitz.open(str(src))
-    rgb = _COLORS.get(color, _COLORS["gray"])
-
-    for page in doc:
-        rect = page.rect
-        cx, cy = rect.width / 2, rect.height / 2
-
-        # Create text with rotation using a text writer
-        tw = fitz.TextWriter(page.rect, opacity=opacity)
-        tw.append(
-            fitz.Point(cx, cy),
-            text,
-            fontsize=font_size,
-        )
-
-        # Calculate rotation matrix centered on page
-        morph = (fitz.Point(cx, cy), fitz.Matrix(angle))
-        tw.write_text(page, morph=morph, color=rgb)
-
-    doc.save(str(dest))
-    doc.close()
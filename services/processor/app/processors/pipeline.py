@@ -0,0 +1,212 @@
+"""Server-side processor pipelines.
+
+A pipeline job runs an ordered list of ``{"processor_id", "options"}`` steps
+on one input (or on several, if the first step accepts multiple files).
+Each step writes into its own ``step-N/`` directory inside the job
+directory and the next step reads that file directly, so nothing is
+downloaded or uploaded between steps. A step's directory is removed once
+the following step has finished with it. Progress covers the whole
+pipeline, each step taking an equal share.
+
+Where it is safe, steps are combined:
+
+- Consecutive PyMuPDF steps that edit a document (``PdfDocumentProcessor``)
+  share one open ``fitz.Document`` that is saved once, instead of each step
+  parsing and writing the whole file. A step that encrypts the file
+  (``pdf-protect``) ends the shared document.
+- A ``video-trim`` followed by ``video-trim``, ``video-to-gif`` or
+  ``video-thumbnail`` is folded into the second step's own time window, so
+  FFmpeg reads the source once instead of writing the clip and reading it
+  again. The folded step is frame-accurate, where a stream-copied trim
+  starts at a keyframe.
+
+``check_step_types`` rejects a chain whose step cannot read any file the
+previous step can produce (``BaseProcessor.output_extensions``) before a
+job is created.
+
+The pipeline holds no scheduler slot of its own: every step (or combined
+group of steps) waits for a slot in its processor's resource class, and
+the job shows as queued while it does.
+"""
+from __future__ import annotations
+
+import asyncio
+import shutil
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+from app.processors.base import BaseProcessor, ProgressCallback
+from app.processors.pdf_document import PdfDocumentProcessor, process_document
+from app.processors.registry import get_processor
+from app.services.executors import get_executor
+from app.services.scheduler import scheduler
+
+PIPELINE_ID = "pipeline"
+
+
+@dataclass
+class _Stage:
+    """Steps that run as one unit: a single processor call or a shared PDF document."""
+
+    steps: list[tuple[BaseProcessor, dict[str, Any]]] = field(default_factory=list)
+    # Pipeline steps this stage covers (more than len(steps) after folding)
+    size: int = 0
+
+    @property
+    def processor(self) -> BaseProcessor:
+        return self.steps[0][0]
+
+    @property
+    def label(self) -> str:
+        return " + ".join(processor.label for processor, _ in self.steps)
+
+    async def run(
+        self,
+        input_path: Path,
+        output_dir: Path,
+        on_progress: ProgressCallback,
+        input_paths: list[Path] | None,
+    ) -> Path:
+        if len(self.steps) > 1:
+            return await process_document(input_path, output_dir, on_progress, self.steps, "Processing PDF...")
+        processor, options = self.steps[0]
+        return Path(await processor.process(input_path, output_dir, on_progress, options, input_paths))
+
+
+def _fold_trim(trim: dict[str, Any], processor_id: str, options: dict[str, Any]) -> dict[str, Any] | None:
+    """Options for ``processor_id`` reading the source instead of ``video-trim``'s clip.
+
+    Returns None if the step cannot be folded (or its window lies outside
+    the clip).
+    """
+    start = int(trim.get("start", 0))
+    length = int(trim.get("duration", 10))
+    folded = dict(options)
+    if processor_id in ("video-trim", "video-to-gif"):
+        inner_start = int(options.get("start", 0))
+        if inner_start >= length:
+            return None
+        folded["start"] = start + inner_start
+        folded["duration"] = min(int(options.get("duration", length)), length - inner_start)
+        if processor_id == "video-trim" and str(options.get("codec", "copy")) == "copy":
+            # Keep the first trim's re-encode, if it had one
+            folded["codec"] = trim.get("codec", "copy")
+            if "quality" in trim:
+                folded["quality"] = trim["quality"]
+        return folded
+    if processor_id == "video-thumbnail":
+        time = int(options.get("time", 0))
+        if time >= length:
+            return None
+        folded["time"] = start + time
+        return folded
+    return None
+
+
+def plan_stages(steps: list[dict[str, Any]]) -> list[_Stage]:
+    """Turn pipeline steps into stages, folding and grouping where safe."""
+    stages: list[_Stage] = []
+    for step in steps:
+        processor = get_processor(step["processor_id"])
+        options = step.get("options") or {}
+        last = stages[-1] if stages else None
+
+        if last is not None and len(last.steps) == 1 and last.processor.id == "video-trim":
+            folded = _fold_trim(last.steps[0][1], processor.id, options)
+            if folded is not None:
+                last.steps = [(processor, folded)]
+                last.size += 1
+                continue
+
+        if (
+            last is not None
+            and isinstance(processor, PdfDocumentProcessor)
+            and all(isinstance(p, PdfDocumentProcessor) and not p.seals_document for p, _ in last.steps)
+        ):
+            last.steps.append((processor, options))
+            last.size += 1
+            continue
+
+        stages.append(_Stage(steps=[(processor, options)], size=1))
+    return stages
+
+
+def check_step_types(steps: list[dict[str, Any]]) -> None:
+    """Raise ValueError if a step accepts none of the files the step before can produce.
+
+    Starts from the first step's accepted extensions; the check ends at a
+    step whose output extension is not known up front.
+    """
+    extensions: set[str] = set()
+    for number, step in enumerate(steps, 1):
+        processor = get_processor(step["processor_id"])
+        if number == 1:
+            extensions = set(processor.accepted_extensions)
+        elif not extensions & set(processor.accepted_extensions):
+            raise ValueError(
+                f"Step {number} ({processor.label}) does not accept the "
+                f"{', '.join(sorted(extensions))} output of step {number - 1}"
+            )
+        produced = processor.output_extensions(extensions, step.get("options") or {})
+        if produced is None:
+            return
+        extensions = produced
+
+
+class PipelineProcessor(BaseProcessor):
+    id = PIPELINE_ID
+    label = "Pipeline"
+    description = "Run several processors in a row, each step reading the previous step's output."
+    accepted_extensions: list[str] = []
+    # The first step decides; see app.routers.jobs.create_pipeline
+    accepts_multiple_files = True
+    resource_class = None
+
+    async def process(
+        self,
+        input_path: Path,
+        output_dir: Path,
+        on_progress: ProgressCallback,
+        options: dict[str, Any] | None = None,
+        input_paths: list[Path] | None = None,
+    ) -> Path:
+        steps = (options or {}).get("steps") or []
+        if not steps:
+            raise ValueError("Pipeline has no steps")
+        total = len(steps)
+        loop = asyncio.get_running_loop()
+
+        current, current_paths = input_path, input_paths
+        done = 0
+        previous_dir: Path | None = None
+        for index, stage in enumerate(plan_stages(steps)):
+            ext = current.suffix.lower()
+            if index > 0 and ext not in stage.processor.accepted_extensions:
+                raise ValueError(f"{stage.processor.label} does not accept the {ext} file of step {done}")
+
+            first_step = done + 1
+            if stage.size == 1:
+                title = f"Step {first_step}/{total} ({stage.label})"
+            else:
+                title = f"Steps {first_step}-{done + stage.size}/{total} ({stage.label})"
+            start_pct = done * 100 / total
+            span = stage.size * 100 / total
+
+            async def stage_progress(pct: float, msg: str, title=title, start_pct=start_pct, span=span) -> None:
+                await on_progress(round(start_pct + pct * span / 100, 1), f"{title}: {msg}")
+
+            await on_progress(round(start_pct, 1), f"{title}: waiting for a free slot...")
+            stage_dir = output_dir / f"step-{first_step}"
+            stage_dir.mkdir(parents=True, exist_ok=True)
+            async with scheduler.slot(stage.processor.resource_class or "cpu"):
+                result = await stage.run(current, stage_dir, stage_progress, current_paths)
+
+            if previous_dir is not None:
+                await loop.run_in_executor(get_executor("io"), shutil.rmtree, previous_dir, True)
+            previous_dir = stage_dir
+            current, current_paths = result, None
+            done += stage.size
+
+        await on_progress(100, "Done!")
+        return current
@@ -1,67 +1,77 @@
+"""Processor registry.
+
+Processors are declared by ID, module and class name, and a module is only
+imported the first time its processor is needed. Starting the backend
+therefore does not import every processor's dependencies.
+
+The processor metadata (label, options, extensions) lives on the classes,
+so ``list_processors()`` imports every processor module. Those modules
+keep heavy dependencies out of their top level: rembg and the stack it
+pulls in (onnxruntime, pymatting, numba, scipy, scikit-image) are imported
+inside the functions that run a model. ``python -m benchmarks.startup``
+reports the import cost of each module.
+"""
+from __future__ import annotations
+
+import importlib
+
 from app.processors.base import BaseProcessor
-from app.processors.video_bg_remove import VideoBgRemoveProcessor
-from app.processors.image_bg_remove import ImageBgRemoveProcessor
-from app.processors.image_convert import ImageConvertProcessor
-from app.processors.video_convert import VideoConvertProcessor
-from app.processors.video_to_gif import VideoToGifProcessor
-from app.processors.image_compress import ImageCompressProcessor
-from app.processors.video_trim import VideoTrimProcessor
-from app.processors.audio_extract import AudioExtractProcessor
-from app.processors.video_compress import VideoCompressProcessor
-from app.processors.image_watermark import ImageWatermarkProcessor
-from app.processors.pdf_to_image import PdfToImageProcessor
-from app.processors.video_thumbnail import VideoThumbnailProcessor
-from app.processors.pdf_merge import PdfMergeProcessor
-from app.processors.pdf_split import PdfSplitProcessor
-from app.processors.pdf_compress import PdfCompressProcessor
-from app.processors.pdf_rotate import PdfRotateProcessor
-from app.processors.pdf_protect import PdfProtectProcessor
-from app.processors.pdf_unlock import PdfUnlockProcessor
-from app.processors.pdf_page_numbers import PdfPageNumbersProcessor
-from app.processors.pdf_watermark import PdfWatermarkProcessor
-from app.processors.pdf_extract_text import PdfExtractTextProcessor
-from app.processors.image_to_pdf import ImageToPdfProcessor
-from app.processors.audio_convert import AudioConvertProcessor
-from app.processors.audio_trim import AudioTrimProcessor
 
-_PROCESSORS: dict[str, BaseProcessor] = {}
+# Processor ID -> (module in app.processors, class name), in display order
+_SPECS: dict[str, tuple[str, str]] = {
+    "video-bg-remove": ("video_bg_remove", "VideoBgRemoveProcessor"),
+    "image-bg-remove": ("image_bg_remove", "ImageBgRemoveProcessor"),
+    "image-convert": ("image_convert", "ImageConvertProcessor"),
+    "video-convert": ("video_convert", "VideoConvertProcessor"),
+    "video-to-gif": ("video_to_gif", "VideoToGifProcessor"),
+    "image-compress": ("image_compress", "ImageCompressProcessor"),
+    "video-trim": ("video_trim", "VideoTrimProcessor"),
+    "audio-extract": ("audio_extract", "AudioExtractProcessor"),
+    "video-compress": ("video_compress", "VideoCompressProcessor"),
+    "image-watermark": ("image_watermark", "ImageWatermarkProcessor"),
+    "pdf-to-image": ("pdf_to_image", "PdfToImageProcessor"),
+    "video-thumbnail": ("video_thumbnail", "VideoThumbnailProcessor"),
+    "video-bundle": ("video_bundle", "VideoBundleProcessor"),
+    "pdf-merge": ("pdf_merge", "PdfMergeProcessor"),
+    "pdf-split": ("pdf_split", "PdfSplitProcessor"),
+    "pdf-compress": ("pdf_compress", "PdfCompressProcessor"),
+    "pdf-rotate": ("pdf_rotate", "PdfRotateProcessor"),
+    "pdf-protect": ("pdf_protect", "PdfProtectProcessor"),
+    "pdf-unlock": ("pdf_unlock", "PdfUnlockProcessor"),
+    "pdf-page-numbers": ("pdf_page_numbers", "PdfPageNumbersProcessor"),
+    "pdf-watermark": ("pdf_watermark", "PdfWatermarkProcessor"),
+    "pdf-extract-text": ("pdf_extract_text", "PdfExtractTextProcessor"),
+    "image-to-pdf": ("image_to_pdf", "ImageToPdfProcessor"),
+    "audio-convert": ("audio_convert", "AudioConvertProcessor"),
+    "audio-trim": ("audio_trim", "AudioTrimProcessor"),
+}
 
+# Processors that run other processors' steps; usable by ID but not listed
+_INTERNAL_SPECS: dict[str, tuple[str, str]] = {
+    "pipeline": ("pipeline", "PipelineProcessor"),
+}
 
-def _register(proc: BaseProcessor) -> None:
-    _PROCESSORS[proc.id] = proc
+_PROCESSORS: dict[str, BaseProcessor] = {}
 
 
-# Register all processors here.
-_register(VideoBgRemoveProcessor())
-_register(ImageBgRemoveProcessor())
-_register(ImageConvertProcessor())
-_register(VideoConvertProcessor())
-_register(VideoToGifProcessor())
-_register(ImageCompressProcessor())
-_register(VideoTrimProcessor())
-_register(AudioExtractProcessor())
-_register(VideoCompressProcessor())
-_register(ImageWatermarkProcessor())
-_register(PdfToImageProcessor())
-_register(VideoThumbnailProcessor())
-_register(PdfMergeProcessor())
-_register(PdfSplitProcessor())
-_register(PdfCompressProcessor())
-_register(PdfRotateProcessor())
-_register(PdfProtectProcessor())
-_register(PdfUnlockProcessor())
-_register(PdfPageNumbersProcessor())
-_register(PdfWatermarkProcessor())
-_register(PdfExtractTextProcessor())
-_register(ImageToPdfProcessor())
-_register(AudioConvertProcessor())
-_register(AudioTrimProcessor())
+def processor_modules() -> list[str]:
+    """Fully qualified module name of every registered processor."""
+    specs = [*_SPECS.values(), *_INTERNAL_SPECS.values()]
+    return [f"app.processors.{module}" for module, _ in specs]
 
 
 def get_processor(processor_id: str) -> BaseProcessor:
     proc = _PROCESSORS.get(processor_id)
     if proc is None:
-        raise KeyError(f"Unknown processor: {processor_id}")
+        spec = _SPECS.get(processor_id) or _INTERNAL_SPECS.get(processor_id)
+        if spec is None:
+            raise KeyError(f"Unknown processor: {processor_id}")
+        module_name, class_name = spec
+        module = importlib.import_module(f"app.processors.{module_name}")
+        proc = getattr(module, class_name)()
+        if proc.id != processor_id:
+            raise RuntimeError(f"{class_name} is registered as {processor_id!r} but has id {proc.id!r}")
+        _PROCESSORS[processor_id] = proc
     return proc
 
 
@@ -75,5 +85,5 @@ def list_processors() -> list[dict]:
             "options_schema": p.options_schema,
             "accepts_multiple_files": p.accepts_multiple_files,
         }
-        for p in _PROCESSORS.values()
+        for p in map(get_processor, _SPECS)
     ]
@@ -1,23 +1,27 @@
 from __future__ import annotations
 
 import asyncio
+import io
+import math
+import os
 import zipfile
-from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Any
 
+import numpy as np
 from PIL import Image
-from rembg import new_session, remove
 
 from app.processors.base import BaseProcessor, ProgressCallback
+from app.processors.video_to_gif import SINGLE_PASS_MAX_BYTES, buffered_frame_bytes
 from app.services.binary_paths import get_ffmpeg, get_img2webp
+from app.services.ffmpeg_runner import StderrBuffer, run_ffmpeg, run_process
+from app.services.media_info import MediaInfo, has_encoder, probe
+from app.services.executors import get_executor
+from app.services.model_sessions import batch_size_for, predict_masks, session_cache
 
-# Single-thread pool: numba's workqueue threading layer is not threadsafe and
-# crashes when called from multiple Python threads. Routing all rembg/pymatting
-# calls through one thread avoids this. Performance is not affected because
-# ONNX Runtime manages its own internal thread pool for model inference (the
-# bottleneck), so Python-level parallelism adds no benefit here.
-_pool = ThreadPoolExecutor(max_workers=1)
+# All rembg/pymatting calls go through the shared single-thread executor
+# (see app.services.model_sessions for why).
+_pool = get_executor("onnx-serial")
 
 
 class VideoBgRemoveProcessor(BaseProcessor):
@@ -25,6 +29,7 @@ class VideoBgRemoveProcessor(BaseProcessor):
     label = "Video Background Removal"
     description = "Remove the background from a video and export with transparency."
     accepted_extensions = [".mp4", ".mov", ".webm"]
+    resource_class = "onnx"
 
     @property
     def options_schema(self) -> list[dict]:
@@ -113,6 +118,9 @@ class VideoBgRemoveProcessor(BaseProcessor):
             },
         ]
 
+    def output_extensions(self, input_extensions: set[str], options: dict[str, Any]) -> set[str] | None:
+        return {"." + _EXTENSIONS[str(options.get("format", "webp"))]}
+
     async def process(
         self,
         input_path: Path,
@@ -131,6 +139,22 @@ class VideoBgRemoveProcessor(BaseProcessor):
         erode_size: int = int(opts.get("erode_size", 10))
         out_format: str = str(opts.get("format", "webp"))
 
+        # Streaming mode: decode → segment → encode through pipes, so only
+        # the final output file touches disk.
+        if await _can_stream(out_format):
+            info = await probe(input_path)
+            size = _output_size(info, resolution)
+            if size is not None:
+                # A clip-wide GIF palette holds every frame until the end;
+                # long clips get a palette per frame instead
+                palette = "global"
+                if buffered_frame_bytes(info, resolution, fps, info.duration) > SINGLE_PASS_MAX_BYTES:
+                    palette = "per-frame"
+                return await self._process_streaming(
+                    input_path, output_dir, on_progress, info, size, fps, model_name,
+                    refine_edges, fg_threshold, bg_threshold, erode_size, out_format, palette,
+                )
+
         frames_dir = output_dir / "frames"
         cut_dir = output_dir / "cut"
         frames_dir.mkdir(exist_ok=True)
@@ -149,24 +173,23 @@ class VideoBgRemoveProcessor(BaseProcessor):
         # --- Step 2: Load AI model once ---
         await on_progress(12, f"Loading model ({model_name})...")
         loop = asyncio.get_running_loop()
-        session = await loop.run_in_executor(_pool, new_session, model_name)
+        session = await loop.run_in_executor(_pool, session_cache.get, model_name)
 
-        # --- Step 3: Remove backgrounds in parallel ---
+        # --- Step 3: Remove backgrounds, N frames per ONNX run ---
         total = len(frames)
+        batch_size = batch_size_for(session, model_name)
         completed = 0
 
-        async def process_frame(fp: Path) -> None:
-            nonlocal completed
+        for i in range(0, total, batch_size):
+            chunk = frames[i:i + batch_size]
             await loop.run_in_executor(
-                _pool, _remove_bg_sync, fp, cut_dir / fp.name, session,
+                _pool, _remove_bg_batch, chunk, cut_dir, session, model_name,
                 refine_edges, fg_threshold, bg_threshold, erode_size,
             )
-            completed += 1
+            completed += len(chunk)
             pct = 15 + (completed / total) * 65
             await on_progress(pct, f"Removing background – frame {completed}/{total}")
 
-        await asyncio.gather(*(process_frame(fp) for fp in frames))
-
         await on_progress(82, "Background removal complete")
 
         # --- Step 4: Assemble output in chosen format ---
@@ -192,6 +215,105 @@ class VideoBgRemoveProcessor(BaseProcessor):
         await on_progress(100, "Done!")
         return output_file
 
+    # --- streaming pipeline -------------------------------------------------
+
+    async def _process_streaming(
+        self,
+        input_path: Path,
+        output_dir: Path,
+        on_progress: ProgressCallback,
+        info: MediaInfo,
+        size: tuple[int, int],
+        fps: int,
+        model_name: str,
+        refine_edges: bool,
+        fg_threshold: int,
+        bg_threshold: int,
+        erode_size: int,
+        out_format: str,
+        palette: str = "global",
+    ) -> Path:
+        width, height = size
+        output_file = output_dir / f"output.{_EXTENSIONS[out_format]}"
+        total = math.ceil(info.duration * fps) if info.duration else 0
+
+        await on_progress(5, f"Loading model ({model_name})...")
+        loop = asyncio.get_running_loop()
+        session = await loop.run_in_executor(_pool, session_cache.get, model_name)
+        batch_size = batch_size_for(session, model_name)
+
+        await on_progress(10, "Removing background...")
+        decoder = await asyncio.create_subprocess_exec(
+            get_ffmpeg(),
+            "-hide_banner",
+            "-loglevel", "error",
+            "-i", str(input_path),
+            "-an",
+            "-vf", f"fps={fps},scale={width}:{height}",
+            "-f", "rawvideo",
+            "-pix_fmt", "rgb24",
+            "pipe:1",
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+        )
+        decoder_stderr = StderrBuffer()
+        decoder_drain = asyncio.ensure_future(decoder_stderr.drain(decoder.stderr))
+        sink = await _open_sink(out_format, output_file, width, height, fps, palette)
+
+        frame_bytes = width * height * 3
+        completed = 0
+        pending: tuple[asyncio.Future, int] | None = None
+        try:
+            while True:
+                # Read the next chunk while the previous one is being segmented
+                chunk = await _read_frames(decoder.stdout, frame_bytes, batch_size)
+                if pending is not None:
+                    future, count = pending
+                    await sink.write(await future)
+                    completed += count
+                    pct = 10 + (completed / max(total, completed)) * 85
+                    label = f"{completed}/{total}" if total >= completed else str(completed)
+                    await on_progress(pct, f"Removing background – frame {label}")
+                    pending = None
+                if not chunk:
+                    break
+                pending = (
+                    loop.run_in_executor(
+                        _pool, _cut_raw_frames, chunk, width, height, session, model_name,
+                        refine_edges, fg_threshold, bg_threshold, erode_size,
+                        out_format == "png-zip",
+                    ),
+                    len(chunk),
+                )
+        except BaseException:
+            if decoder.returncode is None:
+                decoder.kill()
+            decoder_drain.cancel()
+            await asyncio.gather(decoder_drain, return_exceptions=True)
+            if pending is not None:
+                # Keep a batch that has not started off the shared ONNX pool,
+                # and retrieve the error of one that already failed
+                future, _ = pending
+                future.cancel()
+                await asyncio.gather(future, return_exceptions=True)
+            await sink.abort()
+            raise
+
+        await decoder.wait()
+        await decoder_drain
+        if decoder.returncode != 0:
+            await sink.abort()
+            raise RuntimeError(f"FFmpeg failed: {decoder_stderr.text()}")
+        if completed == 0:
+            await sink.abort()
+            raise RuntimeError("FFmpeg produced no frames.")
+
+        await on_progress(96, "Finalizing output...")
+        await sink.close()
+
+        await on_progress(100, "Done!")
+        return output_file
+
     # --- private helpers ---------------------------------------------------
 
     async def _extract_frames(
@@ -201,22 +323,20 @@ class VideoBgRemoveProcessor(BaseProcessor):
         if resolution != "original":
             vf += f",scale={resolution}:-2"
 
-        proc = await asyncio.create_subprocess_exec(
-            get_ffmpeg(),
-            "-hide_banner",
-            "-loglevel",
-            "error",
-            "-i",
-            str(video),
-            "-vf",
-            vf,
-            str(dest / "frame_%04d.png"),
-            stdout=asyncio.subprocess.PIPE,
-            stderr=asyncio.subprocess.PIPE,
+        await run_ffmpeg(
+            [
+                get_ffmpeg(),
+                "-hide_banner",
+                "-loglevel",
+                "error",
+                "-i",
+                str(video),
+                "-vf",
+                vf,
+                str(dest / "frame_%04d.png"),
+            ],
+            error="FFmpeg failed",
         )
-        _, stderr = await proc.communicate()
-        if proc.returncode != 0:
-            raise RuntimeError(f"FFmpeg failed: {stderr.decode()}")
 
     async def _create_webp(
         self, frames_dir: Path, output: Path, delay_ms: int
@@ -226,14 +346,7 @@ class VideoBgRemoveProcessor(BaseProcessor):
         args += [str(f) for f in frames]
         args += ["-o", str(output)]
 
-        proc = await asyncio.create_subprocess_exec(
-            *args,
-            stdout=asyncio.subprocess.PIPE,
-            stderr=asyncio.subprocess.PIPE,
-        )
-        _, stderr = await proc.communicate()
-        if proc.returncode != 0:
-            raise RuntimeError(f"img2webp failed: {stderr.decode()}")
+        await run_process(args, error="img2webp failed")
 
     async def _create_gif(
         self, frames_dir: Path, output: Path, delay_ms: int
@@ -246,23 +359,21 @@ class VideoBgRemoveProcessor(BaseProcessor):
         self, frames_dir: Path, output: Path, fps: int
     ) -> None:
         """Assemble a MOV with ProRes 4444 (alpha) via FFmpeg."""
-        proc = await asyncio.create_subprocess_exec(
-            get_ffmpeg(),
-            "-hide_banner",
-            "-loglevel", "error",
-            "-framerate", str(fps),
-            "-i", str(frames_dir / "frame_%04d.png"),
-            "-c:v", "prores_ks",
-            "-profile:v", "4444",
-            "-pix_fmt", "yuva444p10le",
-            "-y",
-            str(output),
-            stdout=asyncio.subprocess.PIPE,
-            stderr=asyncio.subprocess.PIPE,
+        await run_ffmpeg(
+            [
+                get_ffmpeg(),
+                "-hide_banner",
+                "-loglevel", "error",
+                "-framerate", str(fps),
+                "-i", str(frames_dir / "frame_%04d.png"),
+                "-c:v", "prores_ks",
+                "-profile:v", "4444",
+                "-pix_fmt", "yuva444p10le",
+                "-y",
+                str(output),
+            ],
+            error="FFmpeg MOV failed",
         )
-        _, stderr = await proc.communicate()
-        if proc.returncode != 0:
-            raise RuntimeError(f"FFmpeg MOV failed: {stderr.decode()}")
 
     @staticmethod
     def _create_png_zip(frames_dir: Path, output: Path) -> None:
@@ -273,28 +384,83 @@ class VideoBgRemoveProcessor(BaseProcessor):
                 zf.write(f, f.name)
 
 
-def _remove_bg_sync(
-    src: Path, dest: Path, session: object,
+def _remove_bg_batch(
+    srcs: list[Path], dest_dir: Path, session: object, model_name: str,
     refine_edges: bool = False,
     fg_threshold: int = 240,
     bg_threshold: int = 10,
     erode_size: int = 10,
 ) -> None:
-    """Standalone function (picklable) for thread pool execution."""
-    with Image.open(src) as im:
-        im = im.convert("RGBA")
-        result = remove(
-            im,
-            session=session,
-            alpha_matting=refine_edges,
-            alpha_matting_foreground_threshold=fg_threshold,
-            alpha_matting_background_threshold=bg_threshold,
-            alpha_matting_erode_size=erode_size,
-        )
-        if isinstance(result, bytes):
-            dest.write_bytes(result)
+    """Remove the background from a chunk of frame files with one ONNX run.
+
+    Only ``len(srcs)`` frames are held in memory at a time. Must run on the
+    single onnx-serial thread because alpha matting goes through numba.
+    """
+    images: list[Image.Image] = []
+    for src in srcs:
+        with Image.open(src) as im:
+            images.append(im.convert("RGBA"))
+
+    cutouts = _cutout(images, session, model_name, refine_edges, fg_threshold, bg_threshold, erode_size)
+    for src, cutout in zip(srcs, cutouts):
+        cutout.save(dest_dir / src.name)
+
+
+def _cut_raw_frames(
+    raw_frames: list[bytes], width: int, height: int, session: object, model_name: str,
+    refine_edges: bool,
+    fg_threshold: int,
+    bg_threshold: int,
+    erode_size: int,
+    as_png: bool,
+) -> list[bytes]:
+    """Remove the background from raw RGB24 frames.
+
+    Returns raw RGBA frames for the encoder pipe, or PNG-encoded frames when
+    ``as_png`` is set. Must run on the single onnx-serial thread.
+    """
+    images = [
+        Image.fromarray(np.frombuffer(raw, dtype=np.uint8).reshape(height, width, 3)).convert("RGBA")
+        for raw in raw_frames
+    ]
+    cutouts = _cutout(images, session, model_name, refine_edges, fg_threshold, bg_threshold, erode_size)
+
+    out: list[bytes] = []
+    for cutout in cutouts:
+        if as_png:
+            buf = io.BytesIO()
+            cutout.save(buf, "PNG")
+            out.append(buf.getvalue())
         else:
-            result.save(dest)
+            out.append(cutout.tobytes())
+    return out
+
+
+def _cutout(
+    images: list[Image.Image], session: object, model_name: str,
+    refine_edges: bool,
+    fg_threshold: int,
+    bg_threshold: int,
+    erode_size: int,
+) -> list[Image.Image]:
+    """Segment a batch of RGBA images and cut out their foreground."""
+    # rembg pulls in onnxruntime, numba and scipy; import it on first use
+    from rembg.bg import alpha_matting_cutout, naive_cutout
+
+    with session_cache.time_inference(model_name, count=len(images)):
+        masks = predict_masks(session, model_name, images)
+
+    cutouts: list[Image.Image] = []
+    for im, mask in zip(images, masks):
+        if refine_edges:
+            try:
+                cutout = alpha_matting_cutout(im, mask, fg_threshold, bg_threshold, erode_size)
+            except ValueError:
+                cutout = naive_cutout(im, mask)
+        else:
+            cutout = naive_cutout(im, mask)
+        cutouts.append(cutout if cutout.mode == "RGBA" else cutout.convert("RGBA"))
+    return cutouts
 
 
 def _assemble_gif(frames_dir: Path, output: Path, delay_ms: int) -> None:
@@ -317,3 +483,148 @@ def _assemble_gif(frames_dir: Path, output: Path, delay_ms: int) -> None:
         disposal=2,
         transparency=0,
     )
+
+
+# ---------------------------------------------------------------------------
+# Streaming helpers
+# ---------------------------------------------------------------------------
+
+_EXTENSIONS: dict[str, str] = {"webp": "webp", "gif": "gif", "mov": "mov", "png-zip": "zip"}
+
+
+async def _can_stream(out_format: str) -> bool:
+    """Whether the streaming pipeline is enabled and supports ``out_format``."""
+    if os.environ.get("VIMIX_VIDEO_BG_STREAMING", "1") == "0":
+        return False
+    if out_format == "webp":
+        return await has_encoder("libwebp_anim") or await has_encoder("libwebp")
+    if out_format == "mov":
+        return await has_encoder("prores_ks")
+    return out_format in _EXTENSIONS
+
+
+def _output_size(info: MediaInfo, resolution: str) -> tuple[int, int] | None:
+    """Frame size after scaling, mirroring FFmpeg's ``scale=<w>:-2``."""
+    size = info.display_size
+    if size is None:
+        return None
+    width, height = size
+    if resolution == "original":
+        return width, height
+    target_w = int(resolution)
+    target_h = max(2, round(height * target_w / width / 2) * 2)
+    return target_w, target_h
+
+
+async def _read_frames(stream: asyncio.StreamReader, frame_bytes: int, count: int) -> list[bytes]:
+    """Read up to ``count`` raw frames from the decoder pipe."""
+    frames: list[bytes] = []
+    for _ in range(count):
+        try:
+            frames.append(await stream.readexactly(frame_bytes))
+        except asyncio.IncompleteReadError:
+            break
+    return frames
+
+
+async def _open_sink(
+    out_format: str, output: Path, width: int, height: int, fps: int, palette: str = "global"
+) -> _FfmpegSink | _ZipSink:
+    """Open the writer that turns cut-out frames into the final file.
+
+    ``palette`` is ``"global"`` (one GIF palette for the clip, which buffers
+    every frame until the input ends) or ``"per-frame"``, which streams.
+    """
+    if out_format == "png-zip":
+        return _ZipSink(output)
+
+    cmd = [
+        get_ffmpeg(),
+        "-hide_banner",
+        "-loglevel", "error",
+        "-f", "rawvideo",
+        "-pix_fmt", "rgba",
+        "-s", f"{width}x{height}",
+        "-framerate", str(fps),
+        "-i", "pipe:0",
+    ]
+    if out_format == "mov":
+        cmd += ["-c:v", "prores_ks", "-profile:v", "4444", "-pix_fmt", "yuva444p10le"]
+    elif out_format == "gif" and palette == "per-frame":
+        cmd += [
+            "-filter_complex",
+            "split[a][b];[a]palettegen=reserve_transparent=1:stats_mode=single[p];"
+            "[b][p]paletteuse=new=1:alpha_threshold=128",
+            "-loop", "0",
+        ]
+    elif out_format == "gif":
+        cmd += [
+            "-filter_complex",
+            "split[a][b];[a]palettegen=reserve_transparent=1:stats_mode=diff[p];"
+            "[b][p]paletteuse=alpha_threshold=128",
+            "-loop", "0",
+        ]
+    else:
+        encoder = "libwebp_anim" if await has_encoder("libwebp_anim") else "libwebp"
+        cmd += ["-c:v", encoder, "-lossless", "1", "-loop", "0"]
+    cmd += ["-y", str(output)]
+
+    proc = await asyncio.create_subprocess_exec(
+        *cmd,
+        stdin=asyncio.subprocess.PIPE,
+        stdout=asyncio.subprocess.DEVNULL,
+        stderr=asyncio.subprocess.PIPE,
+    )
+    return _FfmpegSink(proc)
+
+
+class _FfmpegSink:
+    """Pipe raw RGBA frames into an FFmpeg encoder process."""
+
+    def __init__(self, proc: asyncio.subprocess.Process) -> None:
+        self._proc = proc
+        self._stderr = StderrBuffer()
+        self._drain = asyncio.ensure_future(self._stderr.drain(proc.stderr))
+
+    async def write(self, frames: list[bytes]) -> None:
+        try:
+            for frame in frames:
+                self._proc.stdin.write(frame)
+                await self._proc.stdin.drain()
+        except (BrokenPipeError, ConnectionResetError):
+            await self._proc.wait()
+            await self._drain
+            raise RuntimeError(f"FFmpeg encode failed: {self._stderr.text()}")
+
+    async def close(self) -> None:
+        self._proc.stdin.close()
+        await self._proc.wait()
+        await self._drain
+        if self._proc.returncode != 0:
+            raise RuntimeError(f"FFmpeg encode failed: {self._stderr.text()}")
+
+    async def abort(self) -> None:
+        if self._proc.returncode is None:
+            self._proc.kill()
+            await self._proc.wait()
+        self._drain.cancel()
+
+
+class _ZipSink:
+    """Write PNG-encoded frames straight into the output ZIP."""
+
+    def __init__(self, output: Path) -> None:
+        self._zip = zipfile.ZipFile(output, "w", zipfile.ZIP_STORED)
+        self._count = 0
+
+    async def write(self, frames: list[bytes]) -> None:
+        loop = asyncio.get_running_loop()
+        for data in frames:
+            self._count += 1
+            await loop.run_in_executor(get_executor("io"), self._zip.writestr, f"frame_{self._count:04d}.png", data)
+
+    async def close(self) -> None:
+        self._zip.close()
+
+    async def abort(self) -> None:
+        self._zip.close()
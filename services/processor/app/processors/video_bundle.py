@@ -0,0 +1,157 @@
+"""Several outputs from one video in a single FFmpeg run.
+
+``video-bundle`` makes any of a compressed MP4 (``video-compress``), a GIF
+preview (``video-to-gif``), a thumbnail (``video-thumbnail``) and the audio
+track (``audio-extract``) and returns them together as a ZIP. Its options
+are those processors' option sets, prefixed with the output name
+(``compress_quality``, ``gif_fps``, ...).
+
+Instead of one process per output, each decoding the source again, the
+source is decoded once and ``split`` / ``asplit`` feed every encoder in the
+same FFmpeg process (see ``app.services.shared_decode``). An output that
+cannot share the decode, a GIF too long to build in one pass, is made by
+its own processor afterwards. The audio output is left out if the video
+has no audio track.
+"""
+from __future__ import annotations
+
+import asyncio
+import zipfile
+from pathlib import Path
+from typing import Any
+
+from app.processors.base import BaseProcessor, ProgressCallback
+from app.processors.registry import get_processor
+from app.services.executors import get_executor
+from app.services.ffmpeg_runner import run_ffmpeg
+from app.services.media_info import MediaInfo, probe
+from app.services.shared_decode import SharedOutput, build_command
+
+# Output name (option prefix and file name in the ZIP), processor ID, toggle label
+_OUTPUTS: tuple[tuple[str, str, str], ...] = (
+    ("compress", "video-compress", "Compressed video"),
+    ("gif", "video-to-gif", "GIF preview"),
+    ("thumbnail", "video-thumbnail", "Thumbnail"),
+    ("audio", "audio-extract", "Audio track"),
+)
+
+
+class VideoBundleProcessor(BaseProcessor):
+    id = "video-bundle"
+    label = "Video Bundle"
+    description = "Make a compressed video, GIF preview, thumbnail and audio track in one pass."
+    accepted_extensions = [".mp4", ".mov", ".webm", ".avi", ".mkv"]
+    resource_class = "ffmpeg"
+
+    @property
+    def options_schema(self) -> list[dict]:
+        schema: list[dict] = []
+        for name, processor_id, label in _OUTPUTS:
+            schema.append({
+                "id": name,
+                "label": label,
+                "type": "select",
+                "default": "on",
+                "choices": [
+                    {"value": "on", "label": "Yes"},
+                    {"value": "off", "label": "No"},
+                ],
+            })
+            for opt in get_processor(processor_id).options_schema:
+                prefixed = {**opt, "id": f"{name}_{opt['id']}"}
+                show_when = {f"{name}_{key}": value for key, value in opt.get("showWhen", {}).items()}
+                prefixed["showWhen"] = {name: "on", **show_when}
+                schema.append(prefixed)
+        return schema
+
+    def output_extensions(self, input_extensions: set[str], options: dict[str, Any]) -> set[str] | None:
+        return {".zip"}
+
+    async def process(
+        self,
+        input_path: Path,
+        output_dir: Path,
+        on_progress: ProgressCallback,
+        options: dict[str, Any] | None = None,
+        input_paths: list[Path] | None = None,
+    ) -> Path:
+        opts = options or {}
+        selected = [
+            (name, get_processor(processor_id), _output_options(opts, name))
+            for name, processor_id, _ in _OUTPUTS
+            if str(opts.get(name, "on")) == "on"
+        ]
+        if not selected:
+            raise ValueError("Select at least one output")
+
+        try:
+            info = await probe(input_path)
+        except (OSError, RuntimeError, ValueError):
+            info = MediaInfo()
+
+        shared: list[SharedOutput] = []
+        separate: list[tuple[str, BaseProcessor, dict[str, Any]]] = []
+        for name, processor, part_options in selected:
+            if name == "audio" and not info.has_audio:
+                continue
+            output = processor.shared_output(part_options, info)
+            if output is None:
+                separate.append((name, processor, part_options))
+                continue
+            output.filename = name + Path(output.filename).suffix
+            shared.append(output)
+
+        files: list[Path] = []
+        shared_end = 90 if separate else 95
+        if shared:
+            await on_progress(5, "Encoding outputs...")
+            # FFmpeg reports the furthest point written to any output
+            lengths = [o.length for o in shared]
+            duration = info.duration if None in lengths else max(lengths)
+            await run_ffmpeg(
+                build_command(input_path, output_dir, shared),
+                on_progress=on_progress,
+                duration=duration,
+                start_pct=5,
+                end_pct=shared_end,
+                message="Encoding outputs",
+                error="FFmpeg bundle failed",
+            )
+            files += [output_dir / o.filename for o in shared]
+
+        for index, (name, processor, part_options) in enumerate(separate):
+            start_pct = shared_end if shared else 5
+            span = (95 - start_pct) / len(separate)
+            base_pct = start_pct + index * span
+
+            async def part_progress(pct: float, msg: str, base_pct=base_pct, span=span) -> None:
+                await on_progress(round(base_pct + pct * span / 100, 1), msg)
+
+            part_dir = output_dir / name
+            part_dir.mkdir(exist_ok=True)
+            result = Path(await processor.process(input_path, part_dir, part_progress, part_options))
+            files.append(result.rename(output_dir / (name + result.suffix)))
+
+        if not files:
+            raise ValueError("The video has no audio track")
+
+        await on_progress(96, "Packing results...")
+        zip_file = output_dir / "bundle.zip"
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(get_executor("io"), _write_zip, zip_file, files)
+
+        await on_progress(100, "Done!")
+        return zip_file
+
+
+def _output_options(options: dict[str, Any], name: str) -> dict[str, Any]:
+    """The options of one output, without their prefix."""
+    prefix = f"{name}_"
+    return {key[len(prefix):]: value for key, value in options.items() if key.startswith(prefix)}
+
+
+def _write_zip(zip_file: Path, files: list[Path]) -> None:
+    # The outputs are already compressed media
+    with zipfile.ZipFile(zip_file, "w", zipfile.ZIP_STORED) as zf:
+        for path in files:
+            zf.write(path, path.name)
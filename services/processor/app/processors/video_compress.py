@@ -1,11 +1,14 @@
 from __future__ import annotations
 
-import asyncio
 from pathlib import Path
 from typing import Any
 
 from app.processors.base import BaseProcessor, ProgressCallback
 from app.services.binary_paths import get_ffmpeg
+from app.services.ffmpeg_runner import media_duration, run_ffmpeg
+from app.services.media_info import MediaInfo
+from app.services.segment_encode import encode_segmented
+from app.services.shared_decode import SharedOutput
 
 
 class VideoCompressProcessor(BaseProcessor):
@@ -13,6 +16,7 @@ class VideoCompressProcessor(BaseProcessor):
     label = "Compress Video"
     description = "Reduce video file size with quality and resolution controls."
     accepted_extensions = [".mp4", ".mov", ".webm", ".avi", ".mkv"]
+    resource_class = "ffmpeg"
 
     @property
     def options_schema(self) -> list[dict]:
@@ -49,6 +53,9 @@ class VideoCompressProcessor(BaseProcessor):
             },
         ]
 
+    def output_extensions(self, input_extensions: set[str], options: dict[str, Any]) -> set[str] | None:
+        return {".mp4"}
+
     async def process(
         self,
         input_path: Path,
@@ -58,47 +65,77 @@ class VideoCompressProcessor(BaseProcessor):
         input_paths: list[Path] | None = None,
     ) -> Path:
         opts = options or {}
-        quality_pct: int = int(opts.get("quality", 65))
         resolution: str = str(opts.get("resolution", "original"))
-        audio: str = str(opts.get("audio", "keep"))
 
         output_file = output_dir / "output.mp4"
 
-        # Map quality 1-100 to CRF (lower CRF = better quality)
-        crf = round((100 - quality_pct) * 51 / 99)
-
         await on_progress(10, "Compressing video...")
 
-        cmd = [
-            get_ffmpeg(), "-hide_banner", "-loglevel", "error",
-            "-i", str(input_path),
-            "-c:v", "libx264",
-            "-crf", str(crf),
-            "-preset", "slow",
-        ]
+        video_args = _video_args(opts)
 
         # Resolution
         if resolution != "original":
-            cmd += ["-vf", f"scale={resolution}:-2"]
-
-        # Audio handling
-        if audio == "remove":
-            cmd += ["-an"]
-        elif audio == "compress":
-            cmd += ["-c:a", "aac", "-b:a", "96k"]
-        else:
-            cmd += ["-c:a", "aac", "-b:a", "192k"]
-
-        cmd += ["-movflags", "+faststart", "-y", str(output_file)]
-
-        proc = await asyncio.create_subprocess_exec(
-            *cmd,
-            stdout=asyncio.subprocess.PIPE,
-            stderr=asyncio.subprocess.PIPE,
-        )
-        _, stderr = await proc.communicate()
-        if proc.returncode != 0:
-            raise RuntimeError(f"FFmpeg compress failed: {stderr.decode()}")
+            video_args += ["-vf", f"scale={resolution}:-2"]
+
+        audio_args = _audio_args(opts)
+        output_args = ["-movflags", "+faststart"]
+
+        duration = await media_duration(input_path)
+        # Long inputs are split at keyframes and encoded in parallel
+        if not await encode_segmented(
+            input_path, output_file, video_args, audio_args, output_args, duration, on_progress,
+            message="Compressing video",
+            error="FFmpeg compress failed",
+        ):
+            cmd = [
+                get_ffmpeg(), "-hide_banner", "-loglevel", "error",
+                "-i", str(input_path),
+                *video_args,
+                *audio_args,
+                *output_args,
+                "-y", str(output_file),
+            ]
+            await run_ffmpeg(
+                cmd,
+                on_progress=on_progress,
+                duration=duration,
+                message="Compressing video",
+                error="FFmpeg compress failed",
+            )
 
         await on_progress(100, "Done!")
         return output_file
+
+    def shared_output(self, options: dict[str, Any], info: MediaInfo) -> SharedOutput:
+        """This processor's output as part of a single-decode FFmpeg command."""
+        resolution = str(options.get("resolution", "original"))
+        keep_audio = info.has_audio and str(options.get("audio", "keep")) != "remove"
+        return SharedOutput(
+            filename="output.mp4",
+            video=f"scale={resolution}:-2" if resolution != "original" else "",
+            audio="" if keep_audio else None,
+            args=[
+                *_video_args(options),
+                *(_audio_args(options) if keep_audio else ["-an"]),
+                "-movflags", "+faststart",
+            ],
+        )
+
+
+def _video_args(opts: dict[str, Any]) -> list[str]:
+    # Map quality 1-100 to CRF (lower CRF = better quality)
+    crf = round((100 - int(opts.get("quality", 65))) * 51 / 99)
+    return [
+        "-c:v", "libx264",
+        "-crf", str(crf),
+        "-preset", "slow",
+    ]
+
+
+def _audio_args(opts: dict[str, Any]) -> list[str]:
+    audio = str(opts.get("audio", "keep"))
+    if audio == "remove":
+        return ["-an"]
+    if audio == "compress":
+        return ["-c:a", "aac", "-b:a", "96k"]
+    return ["-c:a", "aac", "-b:a", "192k"]
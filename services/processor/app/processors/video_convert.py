@@ -1,12 +1,13 @@
 from __future__ import annotations
 
-import asyncio
 import os
 from pathlib import Path
 from typing import Any
 
 from app.processors.base import BaseProcessor, ProgressCallback
 from app.services.binary_paths import get_ffmpeg
+from app.services.ffmpeg_runner import media_duration, run_ffmpeg
+from app.services.segment_encode import encode_segmented
 
 # Codec → FFmpeg encoder + pixel format + file extension
 _CODECS: dict[str, dict[str, str]] = {
@@ -23,6 +24,7 @@ class VideoConvertProcessor(BaseProcessor):
     label = "Video Format Conversion"
     description = "Convert a video to a different format, codec, or resolution."
     accepted_extensions = [".mp4", ".mov", ".webm", ".avi", ".mkv"]
+    resource_class = "ffmpeg"
 
     @property
     def options_schema(self) -> list[dict]:
@@ -87,6 +89,12 @@ class VideoConvertProcessor(BaseProcessor):
             },
         ]
 
+    def output_extensions(self, input_extensions: set[str], options: dict[str, Any]) -> set[str] | None:
+        codec_id = str(options.get("codec", "h264"))
+        if codec_id == "copy":
+            return set(input_extensions)
+        return {"." + _CODECS.get(codec_id, _CODECS["h264"])["ext"]}
+
     async def process(
         self,
         input_path: Path,
@@ -115,60 +123,63 @@ class VideoConvertProcessor(BaseProcessor):
 
         await on_progress(5, "Preparing conversion...")
 
-        # Build FFmpeg command
-        cmd: list[str] = [
-            get_ffmpeg(), "-hide_banner", "-loglevel", "error",
-            "-i", str(input_path),
-        ]
-
-        # Video codec
-        cmd += ["-c:v", encoder]
+        # Video encoding options
+        video_args: list[str] = ["-c:v", encoder]
 
         if encoder != "copy":
             # Pixel format
             if pix_fmt:
-                cmd += ["-pix_fmt", pix_fmt]
+                video_args += ["-pix_fmt", pix_fmt]
 
             # Quality: convert 1-100 scale to CRF (lower CRF = better)
             if codec_id in ("h264", "h265"):
                 crf = round((100 - quality_pct) * 51 / 99)
-                cmd += ["-crf", str(crf)]
+                video_args += ["-crf", str(crf)]
             elif codec_id == "vp9":
                 crf = round((100 - quality_pct) * 63 / 99)
-                cmd += ["-crf", str(crf), "-b:v", "0"]
+                video_args += ["-crf", str(crf), "-b:v", "0"]
             elif codec_id == "prores":
-                cmd += ["-profile:v", "3"]  # HQ profile
+                video_args += ["-profile:v", "3"]  # HQ profile
 
             # Resolution
             if resolution != "original":
-                cmd += ["-vf", f"scale={resolution}:-2"]
+                video_args += ["-vf", f"scale={resolution}:-2"]
 
             # FPS
             if fps != "original":
-                cmd += ["-r", fps]
+                video_args += ["-r", fps]
 
         # Audio
         if audio == "remove":
-            cmd += ["-an"]
+            audio_args = ["-an"]
+        elif encoder == "copy":
+            audio_args = ["-c:a", "copy"]
         else:
-            if encoder == "copy":
-                cmd += ["-c:a", "copy"]
-            else:
-                cmd += ["-c:a", "aac", "-b:a", "128k"]
-
-        cmd += ["-y", str(output_file)]
+            audio_args = ["-c:a", "aac", "-b:a", "128k"]
 
         await on_progress(10, f"Converting with {encoder}...")
 
-        proc = await asyncio.create_subprocess_exec(
-            *cmd,
-            stdout=asyncio.subprocess.PIPE,
-            stderr=asyncio.subprocess.PIPE,
-        )
-
-        _, stderr = await proc.communicate()
-        if proc.returncode != 0:
-            raise RuntimeError(f"FFmpeg failed: {stderr.decode()}")
+        duration = await media_duration(input_path)
+        # Long re-encodes are split at keyframes and encoded in parallel
+        if encoder == "copy" or not await encode_segmented(
+            input_path, output_file, video_args, audio_args, [], duration, on_progress,
+            message=f"Converting with {encoder}",
+            error="FFmpeg failed",
+        ):
+            cmd = [
+                get_ffmpeg(), "-hide_banner", "-loglevel", "error",
+                "-i", str(input_path),
+                *video_args,
+                *audio_args,
+                "-y", str(output_file),
+            ]
+            await run_ffmpeg(
+                cmd,
+                on_progress=on_progress,
+                duration=duration,
+                message=f"Converting with {encoder}",
+                error="FFmpeg failed",
+            )
 
         await on_progress(100, "Done!")
         return output_file
@@ -1,11 +1,13 @@
 from __future__ import annotations
 
-import asyncio
 from pathlib import Path
 from typing import Any
 
 from app.processors.base import BaseProcessor, ProgressCallback
 from app.services.binary_paths import get_ffmpeg
+from app.services.ffmpeg_runner import run_ffmpeg
+from app.services.media_info import MediaInfo
+from app.services.shared_decode import SharedOutput
 
 
 class VideoThumbnailProcessor(BaseProcessor):
@@ -13,6 +15,7 @@ class VideoThumbnailProcessor(BaseProcessor):
     label = "Video Thumbnail"
     description = "Extract a frame from a video at a specific time as an image."
     accepted_extensions = [".mp4", ".mov", ".webm", ".avi", ".mkv"]
+    resource_class = "ffmpeg"
 
     @property
     def options_schema(self) -> list[dict]:
@@ -59,6 +62,9 @@ class VideoThumbnailProcessor(BaseProcessor):
             },
         ]
 
+    def output_extensions(self, input_extensions: set[str], options: dict[str, Any]) -> set[str] | None:
+        return {f".{options.get('format', 'png')}"}
+
     async def process(
         self,
         input_path: Path,
@@ -70,17 +76,13 @@ class VideoThumbnailProcessor(BaseProcessor):
         opts = options or {}
         time: int = int(opts.get("time", 0))
         fmt: str = str(opts.get("format", "png"))
-        resolution: str = str(opts.get("resolution", "original"))
-        quality: int = int(opts.get("quality", 95))
 
         output_file = output_dir / f"thumbnail.{fmt}"
 
         await on_progress(20, "Extracting frame...")
 
         # Build filter chain
-        filters: list[str] = []
-        if resolution != "original":
-            filters.append(f"scale={resolution}:-2")
+        filters = _filters(opts)
 
         cmd = [
             get_ffmpeg(), "-hide_banner", "-loglevel", "error",
@@ -92,22 +94,39 @@ class VideoThumbnailProcessor(BaseProcessor):
         if filters:
             cmd += ["-vf", ",".join(filters)]
 
-        # Format-specific options
-        if fmt == "jpg":
-            cmd += ["-q:v", str(max(1, 31 - (quality * 30 // 100)))]
-        elif fmt == "webp":
-            cmd += ["-quality", str(quality)]
-
-        cmd += ["-y", str(output_file)]
+        cmd += [*_format_args(opts), "-y", str(output_file)]
 
-        proc = await asyncio.create_subprocess_exec(
-            *cmd,
-            stdout=asyncio.subprocess.PIPE,
-            stderr=asyncio.subprocess.PIPE,
-        )
-        _, stderr = await proc.communicate()
-        if proc.returncode != 0:
-            raise RuntimeError(f"FFmpeg thumbnail failed: {stderr.decode()}")
+        await run_ffmpeg(cmd, error="FFmpeg thumbnail failed")
 
         await on_progress(100, "Done!")
         return output_file
+
+    def shared_output(self, options: dict[str, Any], info: MediaInfo) -> SharedOutput:
+        """This processor's output as part of a single-decode FFmpeg command."""
+        time = int(options.get("time", 0))
+        fmt = str(options.get("format", "png"))
+        chain = [f"trim=start={time}", "setpts=PTS-STARTPTS", *_filters(options)]
+        return SharedOutput(
+            filename=f"thumbnail.{fmt}",
+            video=",".join(chain),
+            args=["-frames:v", "1", *_format_args(options)],
+            length=0,
+        )
+
+
+def _filters(opts: dict[str, Any]) -> list[str]:
+    resolution = str(opts.get("resolution", "original"))
+    if resolution != "original":
+        return [f"scale={resolution}:-2"]
+    return []
+
+
+def _format_args(opts: dict[str, Any]) -> list[str]:
+    """Format-specific encoder options."""
+    fmt = str(opts.get("format", "png"))
+    quality = int(opts.get("quality", 95))
+    if fmt == "jpg":
+        return ["-q:v", str(max(1, 31 - (quality * 30 // 100)))]
+    if fmt == "webp":
+        return ["-quality", str(quality)]
+    return []
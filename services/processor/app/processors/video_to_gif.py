@@ -1,11 +1,17 @@
 from __future__ import annotations
 
-import asyncio
+import math
 from pathlib import Path
 from typing import Any
 
 from app.processors.base import BaseProcessor, ProgressCallback
 from app.services.binary_paths import get_ffmpeg
+from app.services.ffmpeg_runner import clip_duration, run_ffmpeg
+from app.services.media_info import MediaInfo, probe
+from app.services.shared_decode import SharedOutput
+
+# Frames a single-pass graph may buffer (1 GiB fits a typical container) before using two passes
+SINGLE_PASS_MAX_BYTES = 1024 * 1024 * 1024
 
 
 class VideoToGifProcessor(BaseProcessor):
@@ -13,6 +19,7 @@ class VideoToGifProcessor(BaseProcessor):
     label = "Video to GIF"
     description = "Convert a video clip to an animated GIF."
     accepted_extensions = [".mp4", ".mov", ".webm", ".avi", ".mkv"]
+    resource_class = "ffmpeg"
 
     @property
     def options_schema(self) -> list[dict]:
@@ -54,8 +61,21 @@ class VideoToGifProcessor(BaseProcessor):
                 "presets": [640, 480, 320, 240],
                 "allow_original": True,
             },
+            {
+                "id": "palette",
+                "label": "Color palette",
+                "type": "select",
+                "default": "global",
+                "choices": [
+                    {"value": "global", "label": "One palette for the clip"},
+                    {"value": "per-frame", "label": "New palette every frame"},
+                ],
+            },
         ]
 
+    def output_extensions(self, input_extensions: set[str], options: dict[str, Any]) -> set[str] | None:
+        return {".gif"}
+
     async def process(
         self,
         input_path: Path,
@@ -70,13 +90,64 @@ class VideoToGifProcessor(BaseProcessor):
         fps: int = int(opts.get("fps", 15))
         resolution: str = str(opts.get("resolution", "480"))
 
+        palette: str = str(opts.get("palette", "global"))
+
         output_file = output_dir / "output.gif"
-        palette_file = output_dir / "palette.png"
 
         # Build filter chain
-        filters = f"fps={fps}"
-        if resolution != "original":
-            filters += f",scale={resolution}:-1:flags=lanczos"
+        filters = _filters(fps, resolution)
+
+        try:
+            info = await probe(input_path)
+        except (OSError, RuntimeError, ValueError):
+            info = MediaInfo()
+        clip = clip_duration(info.duration, start, duration)
+
+        if palette == "per-frame" or buffered_frame_bytes(info, resolution, fps, clip) <= SINGLE_PASS_MAX_BYTES:
+            graph = _single_pass_graph(filters, palette)
+        else:
+            await self._two_pass(input_path, output_dir, output_file, on_progress, start, duration, filters, clip)
+            await on_progress(100, "Done!")
+            return output_file
+
+        await on_progress(10, "Creating GIF...")
+
+        cmd = [
+            get_ffmpeg(), "-hide_banner", "-loglevel", "error",
+            "-ss", str(start),
+            "-t", str(duration),
+            "-i", str(input_path),
+            "-lavfi", graph,
+            "-y", str(output_file),
+        ]
+
+        await run_ffmpeg(
+            cmd,
+            on_progress=on_progress,
+            duration=clip,
+            message="Creating GIF",
+            error="FFmpeg GIF failed",
+        )
+
+        await on_progress(100, "Done!")
+        return output_file
+
+    async def _two_pass(
+        self,
+        input_path: Path,
+        output_dir: Path,
+        output_file: Path,
+        on_progress: ProgressCallback,
+        start: int,
+        duration: int,
+        filters: str,
+        clip: float | None,
+    ) -> None:
+        """Build the palette in a first decode, then apply it in a second.
+
+        Used when the frames of a single-pass graph would not fit in memory.
+        """
+        palette_file = output_dir / "palette.png"
 
         # --- Step 1: Generate optimized palette ---
         await on_progress(10, "Generating color palette...")
@@ -90,14 +161,15 @@ class VideoToGifProcessor(BaseProcessor):
             "-y", str(palette_file),
         ]
 
-        proc = await asyncio.create_subprocess_exec(
-            *palette_cmd,
-            stdout=asyncio.subprocess.PIPE,
-            stderr=asyncio.subprocess.PIPE,
+        await run_ffmpeg(
+            palette_cmd,
+            on_progress=on_progress,
+            duration=clip,
+            start_pct=10,
+            end_pct=50,
+            message="Generating color palette",
+            error="FFmpeg palette failed",
         )
-        _, stderr = await proc.communicate()
-        if proc.returncode != 0:
-            raise RuntimeError(f"FFmpeg palette failed: {stderr.decode()}")
 
         # --- Step 2: Create GIF using palette ---
         await on_progress(50, "Creating GIF...")
@@ -112,14 +184,70 @@ class VideoToGifProcessor(BaseProcessor):
             "-y", str(output_file),
         ]
 
-        proc = await asyncio.create_subprocess_exec(
-            *gif_cmd,
-            stdout=asyncio.subprocess.PIPE,
-            stderr=asyncio.subprocess.PIPE,
+        await run_ffmpeg(
+            gif_cmd,
+            on_progress=on_progress,
+            duration=clip,
+            start_pct=50,
+            end_pct=99,
+            message="Creating GIF",
+            error="FFmpeg GIF failed",
         )
-        _, stderr = await proc.communicate()
-        if proc.returncode != 0:
-            raise RuntimeError(f"FFmpeg GIF failed: {stderr.decode()}")
 
-        await on_progress(100, "Done!")
-        return output_file
+    def shared_output(self, options: dict[str, Any], info: MediaInfo) -> SharedOutput | None:
+        """This processor's output as part of a single-decode FFmpeg command.
+
+        None if the GIF needs two passes (its frames would not fit in memory).
+        """
+        start = int(options.get("start", 0))
+        duration = int(options.get("duration", 5))
+        fps = int(options.get("fps", 15))
+        resolution = str(options.get("resolution", "480"))
+        palette = str(options.get("palette", "global"))
+        clip = clip_duration(info.duration, start, duration)
+        if palette != "per-frame" and buffered_frame_bytes(info, resolution, fps, clip) > SINGLE_PASS_MAX_BYTES:
+            return None
+        trim = f"trim=start={start}:duration={duration},setpts=PTS-STARTPTS"
+        return SharedOutput(
+            filename="output.gif",
+            video=_single_pass_graph(f"{trim},{_filters(fps, resolution)}", palette, label="gif"),
+            length=clip if clip is not None else duration,
+        )
+
+
+def _filters(fps: int, resolution: str) -> str:
+    filters = f"fps={fps}"
+    if resolution != "original":
+        filters += f",scale={resolution}:-1:flags=lanczos"
+    return filters
+
+
+def _single_pass_graph(filters: str, palette: str, label: str = "") -> str:
+    """Generate the palette and apply it in one filtergraph.
+
+    ``label`` prefixes the graph's internal link labels.
+    """
+    a, b, p = f"[{label}a]", f"[{label}b]", f"[{label}p]"
+    if palette == "per-frame":
+        # Each frame gets its own palette, nothing needs buffering
+        return (
+            f"{filters},split{a}{b};{a}palettegen=stats_mode=single{p};"
+            f"{b}{p}paletteuse=new=1:dither=bayer:bayer_scale=5"
+        )
+    # paletteuse holds the scaled frames until palettegen has seen them all
+    return (
+        f"{filters},split{a}{b};{a}palettegen=stats_mode=diff{p};"
+        f"{b}{p}paletteuse=dither=bayer:bayer_scale=5:diff_mode=rectangle"
+    )
+
+
+def buffered_frame_bytes(info: MediaInfo, resolution: str, fps: int, clip: float | None) -> float:
+    """Estimate the memory paletteuse needs to hold every scaled frame (RGBA)."""
+    size = info.display_size
+    if size is None or clip is None:
+        return float("inf")
+    width, height = size
+    if resolution != "original":
+        height = height * int(resolution) / width
+        width = int(resolution)
+    return math.ceil(clip * fps) * width * height * 4
@@ -1,11 +1,11 @@
 from __future__ import annotations
 
-import asyncio
 from pathlib import Path
 from typing import Any
 
 from app.processors.base import BaseProcessor, ProgressCallback
 from app.services.binary_paths import get_ffmpeg
+from app.services.ffmpeg_runner import clip_duration, media_duration, run_ffmpeg
 
 
 class VideoTrimProcessor(BaseProcessor):
@@ -13,6 +13,7 @@ class VideoTrimProcessor(BaseProcessor):
     label = "Trim Video"
     description = "Cut a segment from a video by selecting start time and duration."
     accepted_extensions = [".mp4", ".mov", ".webm", ".avi", ".mkv"]
+    resource_class = "ffmpeg"
 
     @property
     def options_schema(self) -> list[dict]:
@@ -58,6 +59,10 @@ class VideoTrimProcessor(BaseProcessor):
             },
         ]
 
+    def output_extensions(self, input_extensions: set[str], options: dict[str, Any]) -> set[str] | None:
+        # A re-encoded trim is written as MP4
+        return set(input_extensions) if str(options.get("codec", "copy")) == "copy" else {".mp4"}
+
     async def process(
         self,
         input_path: Path,
@@ -98,14 +103,14 @@ class VideoTrimProcessor(BaseProcessor):
 
         cmd += ["-y", str(output_file)]
 
-        proc = await asyncio.create_subprocess_exec(
-            *cmd,
-            stdout=asyncio.subprocess.PIPE,
-            stderr=asyncio.subprocess.PIPE,
+        total = await media_duration(input_path)
+        await run_ffmpeg(
+            cmd,
+            on_progress=on_progress,
+            duration=clip_duration(total, start, duration),
+            message="Trimming video",
+            error="FFmpeg trim failed",
         )
-        _, stderr = await proc.communicate()
-        if proc.returncode != 0:
-            raise RuntimeError(f"FFmpeg trim failed: {stderr.decode()}")
 
         await on_progress(100, "Done!")
         return output_file
@@ -2,15 +2,29 @@ from __future__ import annotations
 
 import asyncio
 import json
+import logging
+import shutil
 from pathlib import Path
-from typing import List, Optional
+from typing import Any, AsyncIterator, List, Optional
 
-from fastapi import APIRouter, UploadFile, Form, HTTPException
+from fastapi import APIRouter, UploadFile, File, Form, HTTPException, WebSocket, WebSocketDisconnect
 from fastapi.responses import FileResponse, StreamingResponse
 
+from app.processors.pipeline import PIPELINE_ID, check_step_types
 from app.processors.registry import get_processor
-from app.services.job_manager import job_manager, JobStatus
-from app.services.file_manager import save_upload, get_job_dir
+from app.services.job_manager import job_manager, Batch, Job, JobStatus, FINISHED_STATUSES
+from app.services.file_manager import JOBS_DIR, SavedUpload, save_upload, get_job_dir, combine_hashes, cleanup_job
+from app.services.local_paths import deliver_result, ingest_local, resolve_input, resolve_output
+from app.services.progress import TERMINAL_STATUSES, ProgressListener, min_interval
+from app.services.scheduler import scheduler
+from app.services.upload_store import Upload, remove_dirs, upload_store
+from app.services import executors
+from app.services.result_cache import result_cache, materialize
+
+logger = logging.getLogger("vimix.jobs")
+
+# Idle time after which multi-job streams send a keepalive
+KEEPALIVE_SECONDS = 15
 
 router = APIRouter(prefix="/jobs", tags=["jobs"])
 
@@ -43,18 +57,41 @@ def _validate_options(processor, options: dict) -> None:
             )
 
 
+def _normalize_options(processor, options: dict) -> dict:
+    """Fill in schema defaults for any option the client did not send.
+
+    The normalized dict is what the processor runs with and what the result
+    cache key is built from, so both always agree.
+    """
+    normalized = {opt["id"]: opt["default"] for opt in processor.options_schema if "default" in opt}
+    normalized.update(options)
+    return normalized
+
+
 @router.post("")
 async def create_job(
-    file: UploadFile,
+    file: Optional[UploadFile] = File(None),
     processor_id: str = Form(...),
     options: Optional[str] = Form(None),
+    local_path: Optional[str] = Form(None),
+    upload_id: Optional[str] = Form(None),
+    output_path: Optional[str] = Form(None),
+    output_dir: Optional[str] = Form(None),
+    overwrite: bool = Form(False),
 ):
     try:
         processor = get_processor(processor_id)
     except KeyError:
         raise HTTPException(status_code=400, detail=f"Unknown processor: {processor_id}")
 
-    ext = "." + (file.filename or "file").rsplit(".", 1)[-1].lower()
+    (source,) = _resolve_sources(
+        [file] if file else None,
+        [local_path] if local_path else None,
+        [upload_id] if upload_id else None,
+    )
+    result_path, result_dir = _resolve_outputs(output_path, output_dir, overwrite)
+    filename = _source_name(source)
+    ext = "." + filename.rsplit(".", 1)[-1].lower()
     if ext not in processor.accepted_extensions:
         raise HTTPException(
             status_code=400,
@@ -69,22 +106,21 @@ async def create_job(
             raise HTTPException(status_code=400, detail="Invalid options JSON")
 
     _validate_options(processor, parsed_options)
+    parsed_options = _normalize_options(processor, parsed_options)
 
-    data = await file.read()
-    job = job_manager.create(processor_id, file.filename or "upload")
-    input_path = save_upload(job.id, file.filename or "upload", data)
-    output_dir = get_job_dir(job.id)
-
-    asyncio.create_task(_run_job(job.id, processor_id, input_path, output_dir, parsed_options))
-
+    job = await _create_single_job(processor, parsed_options, source, result_path, result_dir, overwrite)
     return job.to_dict()
 
 
 @router.post("/batch")
 async def create_batch(
-    files: List[UploadFile],
+    files: Optional[List[UploadFile]] = File(None),
     processor_id: str = Form(...),
     options: Optional[str] = Form(None),
+    local_paths: Optional[List[str]] = Form(None),
+    upload_ids: Optional[List[str]] = Form(None),
+    output_dir: Optional[str] = Form(None),
+    overwrite: bool = Form(False),
 ):
     try:
         processor = get_processor(processor_id)
@@ -99,48 +135,93 @@ async def create_batch(
             raise HTTPException(status_code=400, detail="Invalid options JSON")
 
     _validate_options(processor, parsed_options)
+    parsed_options = _normalize_options(processor, parsed_options)
+
+    sources = _resolve_sources(files, local_paths, upload_ids)
+    _, result_dir = _resolve_outputs(None, output_dir, overwrite)
 
     # Validate all file extensions upfront
-    for f in files:
-        ext = "." + (f.filename or "file").rsplit(".", 1)[-1].lower()
-        if ext not in processor.accepted_extensions:
-            raise HTTPException(
-                status_code=400,
-                detail=f"File type {ext} not accepted for '{f.filename}'. Expected: {processor.accepted_extensions}",
-            )
+    _check_extensions(processor, sources)
 
     # Multi-file processor: create ONE job with all files
     if processor.accepts_multiple_files:
-        filenames = [f.filename or "upload" for f in files]
-        combined_name = f"{len(files)}_files"
-        job = job_manager.create(processor_id, combined_name)
-        output_dir = get_job_dir(job.id)
-
-        input_paths: list[Path] = []
-        for f in files:
-            data = await f.read()
-            path = save_upload(job.id, f.filename or "upload", data)
-            input_paths.append(path)
-
-        asyncio.create_task(
-            _run_job(job.id, processor_id, input_paths[0], output_dir, parsed_options, input_paths)
-        )
+        job = await _create_multi_file_job(processor, parsed_options, sources, None, result_dir, overwrite)
         return {"type": "job", **job.to_dict()}
 
     # Standard processors: create N independent jobs
-    job_ids: list[str] = []
-    for f in files:
-        data = await f.read()
-        job = job_manager.create(processor_id, f.filename or "upload")
-        input_path = save_upload(job.id, f.filename or "upload", data)
-        output_dir = get_job_dir(job.id)
-        asyncio.create_task(_run_job(job.id, processor_id, input_path, output_dir, parsed_options))
-        job_ids.append(job.id)
-
-    batch = job_manager.create_batch(processor_id, job_ids)
+    batch = await _create_batch_jobs(processor, parsed_options, sources, result_dir, overwrite)
     return {"type": "batch", **batch.to_dict()}
 
 
+@router.post("/pipeline")
+async def create_pipeline(
+    files: Optional[List[UploadFile]] = File(None),
+    steps: str = Form(...),
+    local_paths: Optional[List[str]] = Form(None),
+    upload_ids: Optional[List[str]] = Form(None),
+    output_path: Optional[str] = Form(None),
+    output_dir: Optional[str] = Form(None),
+    overwrite: bool = Form(False),
+):
+    """Run several processors in a row on the server.
+
+    Each step reads the previous step's output from the job directory; the
+    job's result is the output of the last step. With several inputs and a
+    single-file first step, every input gets its own pipeline job in a batch.
+    """
+    parsed_steps = _parse_steps(steps)
+    first = get_processor(parsed_steps[0]["processor_id"])
+    sources = _resolve_sources(files, local_paths, upload_ids)
+    result_path, result_dir = _resolve_outputs(output_path, output_dir, overwrite)
+    _check_extensions(first, sources)
+
+    pipeline = get_processor(PIPELINE_ID)
+    options = {"steps": parsed_steps}
+    if first.accepts_multiple_files:
+        job = await _create_multi_file_job(pipeline, options, sources, result_path, result_dir, overwrite)
+        return {"type": "job", **job.to_dict()}
+    if len(sources) == 1:
+        job = await _create_single_job(pipeline, options, sources[0], result_path, result_dir, overwrite)
+        return {"type": "job", **job.to_dict()}
+    if result_path:
+        raise HTTPException(status_code=400, detail="output_path needs a single input; use output_dir")
+
+    batch = await _create_batch_jobs(pipeline, options, sources, result_dir, overwrite)
+    return {"type": "batch", **batch.to_dict()}
+
+
+@router.get("/queue")
+async def get_queue():
+    """Concurrency limit, running and queued job counts per resource class."""
+    return scheduler.stats()
+
+
+@router.get("/executors")
+async def get_executors():
+    """Worker count, queue depth and utilization of each shared executor."""
+    return executors.stats()
+
+
+@router.get("/cache")
+async def get_cache_stats():
+    """Result cache size, entry count and hit/miss counters."""
+    return result_cache.stats()
+
+
+@router.get("")
+async def get_jobs(ids: str):
+    """Current state of several jobs (``?ids=a,b,c``) in one request."""
+    jobs = []
+    missing = []
+    for jid in filter(None, (part.strip() for part in ids.split(","))):
+        job = job_manager.get(jid)
+        if job is None:
+            missing.append(jid)
+        else:
+            jobs.append(job.to_dict())
+    return {"jobs": jobs, "missing": missing}
+
+
 @router.get("/batch/{batch_id}")
 async def get_batch(batch_id: str):
     batch = job_manager.get_batch(batch_id)
@@ -156,6 +237,60 @@ async def get_batch(batch_id: str):
     return {**batch.to_dict(), "jobs": jobs}
 
 
+@router.get("/batch/{batch_id}/progress")
+async def batch_progress_sse(batch_id: str):
+    """Progress of every job in a batch over one SSE connection."""
+    batch = job_manager.get_batch(batch_id)
+    if batch is None:
+        raise HTTPException(status_code=404, detail="Batch not found")
+
+    async def event_stream():
+        async for message in _watch_jobs(list(batch.job_ids)):
+            if message["type"] == "keepalive":
+                yield ": keepalive\n\n"
+            else:
+                yield f"data: {json.dumps(message)}\n\n"
+
+    return StreamingResponse(event_stream(), media_type="text/event-stream")
+
+
+@router.websocket("/ws")
+async def jobs_progress_ws(websocket: WebSocket, batch_id: Optional[str] = None, job_ids: Optional[str] = None):
+    """Progress of a batch (``?batch_id=``) or of any jobs (``?job_ids=a,b``).
+
+    Sends the same messages as the batch SSE stream, then closes.
+    """
+    ids: list[str] = []
+    if batch_id:
+        batch = job_manager.get_batch(batch_id)
+        if batch is None:
+            await websocket.close(code=4404, reason="Batch not found")
+            return
+        ids += batch.job_ids
+    if job_ids:
+        ids += [jid for jid in job_ids.split(",") if jid and jid not in ids]
+
+    await websocket.accept()
+    try:
+        async for message in _watch_jobs(ids):
+            await websocket.send_json(message)
+        await websocket.close()
+    except WebSocketDisconnect:
+        pass
+
+
+@router.delete("/batch/{batch_id}")
+async def cancel_batch(batch_id: str):
+    """Cancel every unfinished job of a batch."""
+    batch = job_manager.get_batch(batch_id)
+    if batch is None:
+        raise HTTPException(status_code=404, detail="Batch not found")
+
+    jobs = [job for jid in batch.job_ids if (job := job_manager.get(jid)) is not None]
+    await asyncio.gather(*(_cancel_job(job) for job in jobs))
+    return {**batch.to_dict(), "jobs": [job.to_dict() for job in jobs]}
+
+
 @router.get("/{job_id}")
 async def get_job(job_id: str):
     job = job_manager.get(job_id)
@@ -164,14 +299,26 @@ async def get_job(job_id: str):
     return job.to_dict()
 
 
+@router.delete("/{job_id}")
+async def cancel_job(job_id: str):
+    """Stop a pending, queued or running job and delete its files."""
+    job = job_manager.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    if job.status in (JobStatus.COMPLETED, JobStatus.FAILED):
+        raise HTTPException(status_code=409, detail=f"Job already {job.status.value}")
+    await _cancel_job(job)
+    return job.to_dict()
+
+
 @router.get("/{job_id}/progress")
 async def job_progress_sse(job_id: str):
     job = job_manager.get(job_id)
     if job is None:
         raise HTTPException(status_code=404, detail="Job not found")
 
-    queue = job_manager.subscribe(job_id)
-    if queue is None:
+    listener = job_manager.subscribe(job_id)
+    if listener is None:
         raise HTTPException(status_code=404, detail="Job not found")
 
     async def event_stream():
@@ -179,18 +326,23 @@ async def job_progress_sse(job_id: str):
             # Send current state immediately
             yield f"data: {json.dumps(job.to_dict())}\n\n"
 
-            if job.status in (JobStatus.COMPLETED, JobStatus.FAILED):
+            if job.status in FINISHED_STATUSES:
                 return
 
             while True:
-                event = await asyncio.wait_for(queue.get(), timeout=60)
+                # Only the latest event is kept while we wait, so a slow
+                # client skips intermediate progress instead of falling behind
+                events = await asyncio.wait_for(listener.get(), timeout=60)
+                event = events.get(job_id)
+                if event is None:
+                    continue
                 yield f"data: {json.dumps(event)}\n\n"
-                if event.get("status") in (JobStatus.COMPLETED.value, JobStatus.FAILED.value):
+                if event["status"] in TERMINAL_STATUSES:
                     break
         except asyncio.TimeoutError:
             yield f"data: {json.dumps({'status': 'timeout'})}\n\n"
         finally:
-            job_manager.unsubscribe(job_id, queue)
+            job_manager.unsubscribe(job_id, listener)
 
     return StreamingResponse(event_stream(), media_type="text/event-stream")
 
@@ -240,6 +392,405 @@ async def download_result(job_id: str):
     )
 
 
+def _parse_steps(raw: str) -> list[dict[str, Any]]:
+    """Validate pipeline steps and fill in each step's option defaults.
+
+    Steps are ``{"processor_id": ..., "options": {...}}`` objects or
+    ``[processor_id, options]`` pairs.
+    """
+    try:
+        steps = json.loads(raw)
+    except json.JSONDecodeError:
+        raise HTTPException(status_code=400, detail="Invalid steps JSON")
+    if not isinstance(steps, list) or not steps:
+        raise HTTPException(status_code=400, detail="steps must be a non-empty list")
+
+    parsed: list[dict[str, Any]] = []
+    for number, step in enumerate(steps, 1):
+        if isinstance(step, list) and len(step) == 2:
+            step = {"processor_id": step[0], "options": step[1]}
+        if not isinstance(step, dict) or not isinstance(step.get("processor_id"), str):
+            raise HTTPException(status_code=400, detail=f"Step {number} needs a processor_id")
+        processor_id = step["processor_id"]
+        if processor_id == PIPELINE_ID:
+            raise HTTPException(status_code=400, detail="Pipelines cannot be nested")
+        try:
+            processor = get_processor(processor_id)
+        except KeyError:
+            raise HTTPException(status_code=400, detail=f"Unknown processor in step {number}: {processor_id}")
+        options = step.get("options") or {}
+        if not isinstance(options, dict):
+            raise HTTPException(status_code=400, detail=f"Options of step {number} must be an object")
+        _validate_options(processor, options)
+        parsed.append({"processor_id": processor_id, "options": _normalize_options(processor, options)})
+    try:
+        check_step_types(parsed)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return parsed
+
+
+def _check_extensions(processor, sources: list[UploadFile | Path | Upload]) -> None:
+    for source in sources:
+        name = _source_name(source)
+        ext = "." + name.rsplit(".", 1)[-1].lower()
+        if ext not in processor.accepted_extensions:
+            raise HTTPException(
+                status_code=400,
+                detail=f"File type {ext} not accepted for '{name}'. Expected: {processor.accepted_extensions}",
+            )
+
+
+async def _create_single_job(
+    processor,
+    options: dict,
+    source: UploadFile | Path | Upload,
+    result_path: Path | None,
+    result_dir: Path | None,
+    overwrite: bool = False,
+) -> Job:
+    """Create a job for one input, save the input and submit it."""
+    job = job_manager.create(processor.id, _source_name(source))
+    try:
+        if result_path or result_dir:
+            job_manager.record_output(job.id, result_path, result_dir, overwrite)
+        saved = await _save_input(job.id, source)
+        job_manager.record_input(job.id, saved.sha256, saved.size)
+        await _submit(job.id, processor, saved.path, get_job_dir(job.id), options)
+    except BaseException:
+        await _discard_jobs([job])
+        raise
+    return job
+
+
+async def _create_multi_file_job(
+    processor,
+    options: dict,
+    sources: list[UploadFile | Path | Upload],
+    result_path: Path | None,
+    result_dir: Path | None,
+    overwrite: bool = False,
+) -> Job:
+    """Create one job that receives all inputs at once."""
+    job = job_manager.create(processor.id, f"{len(sources)}_files")
+    try:
+        if result_path or result_dir:
+            job_manager.record_output(job.id, result_path, result_dir, overwrite)
+
+        saved_files: list[SavedUpload] = []
+        for source in sources:
+            saved_files.append(await _save_input(job.id, source))
+        input_paths = [s.path for s in saved_files]
+        job_manager.record_input(
+            job.id,
+            combine_hashes([s.sha256 for s in saved_files]),
+            sum(s.size for s in saved_files),
+        )
+
+        await _submit(job.id, processor, input_paths[0], get_job_dir(job.id), options, input_paths)
+    except BaseException:
+        await _discard_jobs([job])
+        raise
+    return job
+
+
+async def _create_batch_jobs(
+    processor,
+    options: dict,
+    sources: list[UploadFile | Path | Upload],
+    result_dir: Path | None,
+    overwrite: bool = False,
+) -> Batch:
+    """Create one job per input and a batch that holds them.
+
+    If an input cannot be saved, the jobs already created are discarded
+    before the error is raised: without a batch nobody could see or
+    cancel them.
+    """
+    jobs: list[Job] = []
+    try:
+        for source in sources:
+            jobs.append(await _create_single_job(processor, options, source, None, result_dir, overwrite))
+    except BaseException:
+        await _discard_jobs(jobs)
+        raise
+    return job_manager.create_batch(processor.id, [job.id for job in jobs])
+
+
+async def _discard_jobs(jobs: list[Job]) -> None:
+    """Stop and forget jobs whose request failed, removing their files."""
+    loop = asyncio.get_running_loop()
+    for job in jobs:
+        if not await _cancel_job(job):
+            await loop.run_in_executor(executors.get_executor("io"), cleanup_job, job.id)
+        job_manager.remove_job(job.id)
+
+
+def _resolve_sources(
+    files: list[UploadFile] | None, local_paths: list[str] | None, upload_ids: list[str] | None
+) -> list[UploadFile | Path | Upload]:
+    """Return a request's inputs: uploaded files, validated local paths or stored uploads."""
+    if sum(1 for given in (files, local_paths, upload_ids) if given) > 1:
+        raise HTTPException(status_code=400, detail="Send only one of files, local paths or upload IDs")
+    if upload_ids:
+        uploads = []
+        for upload_id in upload_ids:
+            upload = upload_store.get(upload_id)
+            if upload is None:
+                raise HTTPException(status_code=404, detail=f"Upload not found: {upload_id}")
+            if upload.delete_requested:
+                raise HTTPException(status_code=410, detail=f"Upload is being deleted: {upload_id}")
+            uploads.append(upload)
+        return uploads
+    if local_paths:
+        try:
+            return [resolve_input(p) for p in local_paths]
+        except PermissionError as e:
+            raise HTTPException(status_code=403, detail=str(e))
+        except FileNotFoundError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+    if not files:
+        raise HTTPException(status_code=400, detail="No input file")
+    return list(files)
+
+
+def _resolve_outputs(
+    output_path: str | None, output_dir: str | None, overwrite: bool = False
+) -> tuple[Path | None, Path | None]:
+    if output_path and output_dir:
+        raise HTTPException(status_code=400, detail="Send either output_path or output_dir, not both")
+    try:
+        result_path = resolve_output(output_path) if output_path else None
+        result_dir = resolve_output(output_dir) if output_dir else None
+    except PermissionError as e:
+        raise HTTPException(status_code=403, detail=str(e))
+    if result_path is not None and result_path.exists() and not overwrite:
+        raise HTTPException(status_code=409, detail=f"Output file already exists: {result_path}")
+    return result_path, result_dir
+
+
+def _source_name(source: UploadFile | Path | Upload) -> str:
+    if isinstance(source, Path):
+        return source.name
+    return source.filename or "upload"
+
+
+async def _save_input(job_id: str, source: UploadFile | Path | Upload) -> SavedUpload:
+    if isinstance(source, Upload):
+        try:
+            return upload_store.acquire(source.id, job_id).as_input()
+        except KeyError:
+            raise HTTPException(status_code=410, detail=f"Upload is gone: {source.id}")
+    if isinstance(source, Path):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(executors.get_executor("io"), ingest_local, job_id, source)
+    return await _save_upload(job_id, source)
+
+
+async def _deliver(job: Job, result_path: Path) -> Path:
+    """Move the result to the job's requested local output, if any.
+
+    Fails with FileExistsError if a file is already there and the job was
+    not created with ``overwrite``.
+    """
+    if job.output_path:
+        dest = Path(job.output_path)
+    elif job.output_dir:
+        stem = job.original_filename.rsplit(".", 1)[0] if "." in job.original_filename else job.original_filename
+        dest = Path(job.output_dir) / f"{stem}_{job.processor_id}{result_path.suffix}"
+    else:
+        return result_path
+    loop = asyncio.get_running_loop()
+    dest = await loop.run_in_executor(
+        executors.get_executor("io"), deliver_result, result_path, dest, job.overwrite
+    )
+    job_manager.record_delivery(job.id, dest)
+    return dest
+
+
+async def _save_upload(job_id: str, file: UploadFile) -> SavedUpload:
+    """Stream an upload to disk off the event loop, hashing it on the way."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        executors.get_executor("io"), save_upload, job_id, file.filename or "upload", file.file
+    )
+
+
+async def _submit(
+    job_id: str,
+    processor,
+    input_path: Path,
+    output_dir: Path,
+    options: dict,
+    input_paths: list[Path] | None = None,
+) -> None:
+    """Complete a job from the result cache, or queue it with the scheduler."""
+    job = job_manager.get(job_id)
+    if job is not None and job.status == JobStatus.CANCELLED:
+        # Cancelled while its upload was still being saved
+        asyncio.get_running_loop().run_in_executor(executors.get_executor("io"), cleanup_job, job_id)
+        return
+    job_manager.record_submission(job_id, options, input_paths or [input_path])
+    cache_key: str | None = None
+    if result_cache.enabled and job is not None and job.input_hash:
+        cache_key = result_cache.key_for(job.input_hash, processor.id, options)
+        cached = result_cache.get(cache_key)
+        if cached is not None:
+            try:
+                result_path = await _deliver(job, materialize(cached, output_dir))
+            except OSError as e:
+                job_manager.mark_failed(job_id, str(e))
+                return
+            job_manager.mark_completed(job_id, result_path, "Done! (cached)")
+            return
+
+    job_manager.mark_queued(job_id)
+    scheduler.submit(
+        job_id, processor.resource_class,
+        _run_job, job_id, processor.id, input_path, output_dir, options, input_paths, cache_key,
+    )
+
+
+def _batch_summary(jobs: list[Job]) -> dict[str, Any]:
+    """Aggregate counts and overall progress; finished jobs count as 100%."""
+    counts = {status.value: 0 for status in JobStatus}
+    total_progress = 0.0
+    for job in jobs:
+        counts[job.status.value] += 1
+        total_progress += 100 if job.status in FINISHED_STATUSES else job.progress
+    return {
+        "total": len(jobs),
+        **counts,
+        "progress": round(total_progress / len(jobs), 1) if jobs else 100.0,
+    }
+
+
+async def _watch_jobs(job_ids: list[str]) -> AsyncIterator[dict[str, Any]]:
+    """Yield progress messages for several jobs until all of them finish.
+
+    Messages are a ``snapshot`` of every job, then ``progress`` with the
+    changed jobs only, ``job_finished`` with the full job once it
+    completes, fails or is cancelled, and a final ``done``. Every message
+    carries the aggregate ``batch`` summary. Events from all jobs go to
+    one listener and are sent at most once per progress interval, so a
+    large batch produces a few messages per second, not one per job
+    update. ``keepalive`` is yielded when nothing happened for a while.
+    Jobs that are removed while watched are dropped from the stream.
+    """
+    listener = ProgressListener()
+    jobs = [job for jid in job_ids if (job := job_manager.get(jid)) is not None]
+    for job in jobs:
+        job_manager.subscribe(job.id, listener)
+    interval = min_interval()
+    try:
+        yield {"type": "snapshot", "batch": _batch_summary(jobs), "jobs": [job.to_dict() for job in jobs]}
+        remaining = {job.id for job in jobs if job.status not in FINISHED_STATUSES}
+        while remaining:
+            try:
+                events = await asyncio.wait_for(listener.get(), timeout=KEEPALIVE_SECONDS)
+            except asyncio.TimeoutError:
+                events = {}
+            # A job removed by expiry, cleanup or a batch rollback sends no final event
+            removed = {jid for jid in remaining if job_manager.get(jid) is None}
+            if removed:
+                remaining.difference_update(removed)
+                jobs = [job for job in jobs if job.id not in removed]
+            events = {jid: event for jid, event in events.items() if jid not in removed}
+            if not events:
+                if remaining:
+                    yield {"type": "keepalive"}
+                continue
+            deltas = {jid: event for jid, event in events.items() if event["status"] not in TERMINAL_STATUSES}
+            finished = [jid for jid in events if jid not in deltas and jid in remaining]
+            remaining.difference_update(finished)
+            if deltas:
+                yield {"type": "progress", "batch": _batch_summary(jobs), "jobs": deltas}
+            for jid in finished:
+                job = job_manager.get(jid)
+                if job is not None:
+                    yield {"type": "job_finished", "batch": _batch_summary(jobs), "job": job.to_dict()}
+            # Let events from other jobs accumulate before the next message
+            await asyncio.sleep(interval)
+        yield {"type": "done", "batch": _batch_summary(jobs)}
+    finally:
+        for job in jobs:
+            job_manager.unsubscribe(job.id, listener)
+
+
+async def resume_jobs(jobs: list[Job]) -> None:
+    """Re-queue jobs that were interrupted by a restart.
+
+    Their working directories are emptied first, since a job that was
+    processing may have left partial output behind.
+    """
+    loop = asyncio.get_running_loop()
+    for job in jobs:
+        try:
+            processor = get_processor(job.processor_id)
+        except KeyError:
+            job_manager.mark_failed(job.id, f"Unknown processor: {job.processor_id}")
+            continue
+        job_dir = JOBS_DIR / job.id
+        await loop.run_in_executor(executors.get_executor("io"), shutil.rmtree, job_dir, True)
+        input_paths = [Path(p) for p in job.input_paths]
+        for path in input_paths:
+            upload_id = upload_store.id_for_path(path)
+            if upload_id is not None:
+                upload_store.acquire(upload_id, job.id)
+        await _submit(
+            job.id, processor, input_paths[0], get_job_dir(job.id), job.options,
+            input_paths if processor.accepts_multiple_files else None,
+        )
+    if jobs:
+        logger.info("Re-queued %d interrupted job(s)", len(jobs))
+
+
+def _release_uploads(job: Job) -> None:
+    """Drop a finished job's upload references, deleting uploads nobody needs."""
+    freed = upload_store.release(job.id)
+    if not freed:
+        return
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        remove_dirs(freed)
+        return
+    loop.run_in_executor(executors.get_executor("io"), remove_dirs, freed)
+
+
+job_manager.add_finish_hook(_release_uploads)
+
+
+def _track_slot_wait(job_id: str, waiting: bool) -> None:
+    """Show a job as queued while one of its steps waits for a scheduler slot."""
+    job = job_manager.get(job_id)
+    if job is None or job.status in FINISHED_STATUSES:
+        return
+    if waiting:
+        job_manager.mark_queued(job_id, job.message)
+    else:
+        job_manager.mark_processing(job_id)
+
+
+scheduler.add_wait_hook(_track_slot_wait)
+
+
+async def _cancel_job(job: Job) -> bool:
+    """Stop a job's work, mark it cancelled and free its files.
+
+    Returns False if the job had already finished.
+    """
+    if job.status in FINISHED_STATUSES:
+        return False
+    job_manager.mark_cancelled(job.id)
+    await scheduler.cancel(job.id)
+
+    loop = asyncio.get_running_loop()
+    await loop.run_in_executor(executors.get_executor("io"), cleanup_job, job.id)
+    logger.info("Cancelled job %s", job.id)
+    return True
+
+
 async def _run_job(
     job_id: str,
     processor_id: str,
@@ -247,27 +798,33 @@ async def _run_job(
     output_dir,
     options: dict | None = None,
     input_paths: list[Path] | None = None,
+    cache_key: str | None = None,
 ):
     job = job_manager.get(job_id)
     if job is None:
         return
 
-    job.status = JobStatus.PROCESSING
+    job_manager.mark_processing(job_id)
     processor = get_processor(processor_id)
 
     async def on_progress(pct: float, msg: str):
         await job_manager.update_progress(job_id, pct, msg)
 
     try:
-        result_path = await processor.process(
+        result_path = Path(await processor.process(
             input_path, output_dir, on_progress, options, input_paths
-        )
-        job_manager.mark_completed(job_id, result_path)
-        await job_manager.update_progress(job_id, 100, "Done!")
-        # Notify completion
-        for q in job._listeners:
-            await q.put({"status": "completed", "progress": 100, "message": "Done!"})
+        ))
+        # Deliver first so a local output gets the file itself, not a copy
+        delivered = await _deliver(job, result_path)
+        if cache_key is not None:
+            loop = asyncio.get_running_loop()
+            try:
+                # A delivered file belongs to the caller, so the cache keeps a copy
+                await loop.run_in_executor(
+                    executors.get_executor("io"), result_cache.put, cache_key, delivered, delivered == result_path
+                )
+            except OSError:
+                logger.warning("Could not cache result of job %s", job_id, exc_info=True)
+        job_manager.mark_completed(job_id, delivered)
     except Exception as e:
         job_manager.mark_failed(job_id, str(e))
-        for q in job._listeners:
-            await q.put({"status": "failed", "progress": job.progress, "message": str(e)})
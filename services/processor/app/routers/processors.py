@@ -1,6 +1,7 @@
 from fastapi import APIRouter
 
 from app.processors.registry import list_processors
+from app.services.model_sessions import session_cache
 
 router = APIRouter(prefix="/processors", tags=["processors"])
 
@@ -8,3 +9,9 @@ router = APIRouter(prefix="/processors", tags=["processors"])
 @router.get("")
 async def get_processors():
     return list_processors()
+
+
+@router.get("/models")
+async def get_models():
+    """Loaded rembg models with load time vs. inference time per model."""
+    return session_cache.stats()
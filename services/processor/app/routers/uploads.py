@@ -0,0 +1,48 @@
+from __future__ import annotations
+
+import asyncio
+
+from fastapi import APIRouter, HTTPException, UploadFile
+
+from app.services import executors
+from app.services.upload_store import remove_dirs, upload_store
+
+router = APIRouter(prefix="/uploads", tags=["uploads"])
+
+
+@router.post("")
+async def create_upload(file: UploadFile):
+    """Store a file once so several jobs can use it through ``upload_id``."""
+    loop = asyncio.get_running_loop()
+    upload = await loop.run_in_executor(
+        executors.get_executor("io"), upload_store.save, file.filename or "upload", file.file
+    )
+    return upload.to_dict()
+
+
+@router.get("/stats")
+async def get_upload_stats():
+    """Number and total size of stored uploads."""
+    return upload_store.stats()
+
+
+@router.get("/{upload_id}")
+async def get_upload(upload_id: str):
+    upload = upload_store.get(upload_id)
+    if upload is None:
+        raise HTTPException(status_code=404, detail="Upload not found")
+    return upload.to_dict()
+
+
+@router.delete("/{upload_id}")
+async def delete_upload(upload_id: str):
+    """Delete an upload, or mark it for deletion once its running jobs finish."""
+    try:
+        path = upload_store.delete(upload_id)
+    except KeyError:
+        raise HTTPException(status_code=404, detail="Upload not found")
+    if path is None:
+        return {"id": upload_id, "status": "pending"}
+    loop = asyncio.get_running_loop()
+    await loop.run_in_executor(executors.get_executor("io"), remove_dirs, [path])
+    return {"id": upload_id, "status": "deleted"}
@@ -0,0 +1,158 @@
+"""Process-wide registry of named executors.
+
+Blocking work goes to one of three shared pools, sized from the CPU budget
+the container actually grants (see ``app.services.resources``) instead of a
+private pool per processor module:
+
+- ``io``: file copies, hashing, cleanup and other blocking I/O
+  (``VIMIX_IO_WORKERS``, default ``min(32, cpus + 4)``)
+- ``cpu``: Pillow / PyMuPDF work (``VIMIX_CPU_WORKERS``, default ``cpus``).
+  With ``VIMIX_CPU_BACKEND=process`` this is the warm process pool from
+  ``app.services.process_pool`` instead of threads
+- ``onnx-serial``: a single thread for every rembg / pymatting call, because
+  numba's workqueue threading layer crashes when entered from several
+  threads. ONNX Runtime still uses all cores inside that one call
+
+Each pool counts submitted and finished work, so ``stats()`` can report
+queue depth and utilization per pool (``GET /jobs/executors``).
+"""
+from __future__ import annotations
+
+import os
+import threading
+import time
+from concurrent.futures import Executor, Future, ThreadPoolExecutor
+from typing import Any, Callable
+
+from app.services import process_pool
+from app.services.resources import available_cpus
+
+EXECUTOR_NAMES = ("io", "cpu", "onnx-serial")
+
+
+def _env_workers(name: str, default: int) -> int:
+    try:
+        return max(1, int(os.environ.get(name, default)))
+    except ValueError:
+        return default
+
+
+class ManagedExecutor(Executor):
+    """Wrap an executor and keep queue depth and busy-time counters.
+
+    Work is tracked through its future, so the wrapped function never
+    changes and stays picklable for process pools. Running work is taken
+    to be ``min(in_flight, workers)``; the rest is waiting for a worker.
+    """
+
+    def __init__(self, name: str, inner: Executor, workers: int, backend: str) -> None:
+        self.name = name
+        self.workers = workers
+        self.backend = backend
+        self._inner = inner
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self._submitted = 0
+        self._completed = 0
+        self._failed = 0
+        self._busy_seconds = 0.0
+        self._created = self._last_change = time.monotonic()
+
+    def submit(self, fn: Callable[..., Any], /, *args: Any, **kwargs: Any) -> Future:
+        with self._lock:
+            self._advance()
+            self._in_flight += 1
+            self._submitted += 1
+        try:
+            future = self._inner.submit(fn, *args, **kwargs)
+        except BaseException:
+            with self._lock:
+                self._advance()
+                self._in_flight -= 1
+                self._submitted -= 1
+            raise
+        future.add_done_callback(self._finished)
+        return future
+
+    def shutdown(self, wait: bool = True, *, cancel_futures: bool = False) -> None:
+        self._inner.shutdown(wait=wait, cancel_futures=cancel_futures)
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            self._advance()
+            running = min(self._in_flight, self.workers)
+            elapsed = max(self._last_change - self._created, 1e-9)
+            return {
+                "backend": self.backend,
+                "workers": self.workers,
+                "running": running,
+                "queued": self._in_flight - running,
+                "submitted": self._submitted,
+                "completed": self._completed,
+                "failed": self._failed,
+                # Share of worker time spent busy since the pool was created
+                "utilization": round(self._busy_seconds / (self.workers * elapsed), 4),
+            }
+
+    def _advance(self) -> None:
+        """Accumulate busy worker-seconds up to now. Caller holds the lock."""
+        now = time.monotonic()
+        self._busy_seconds += min(self._in_flight, self.workers) * (now - self._last_change)
+        self._last_change = now
+
+    def _finished(self, future: Future) -> None:
+        with self._lock:
+            self._advance()
+            self._in_flight -= 1
+            if future.cancelled() or future.exception() is not None:
+                self._failed += 1
+            else:
+                self._completed += 1
+
+
+_executors: dict[str, ManagedExecutor] = {}
+_lock = threading.Lock()
+
+
+def _create(name: str) -> ManagedExecutor:
+    cpus = available_cpus()
+    if name == "io":
+        workers = _env_workers("VIMIX_IO_WORKERS", min(32, cpus + 4))
+        inner = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="io")
+        return ManagedExecutor(name, inner, workers, "thread")
+    if name == "cpu":
+        if process_pool.enabled():
+            return ManagedExecutor(name, process_pool.get_pool(), process_pool.pool_size(), "process")
+        workers = _env_workers("VIMIX_CPU_WORKERS", cpus)
+        inner = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="cpu")
+        return ManagedExecutor(name, inner, workers, "thread")
+    if name == "onnx-serial":
+        inner = ThreadPoolExecutor(max_workers=1, thread_name_prefix="onnx")
+        return ManagedExecutor(name, inner, 1, "thread")
+    raise KeyError(f"Unknown executor: {name}")
+
+
+def get_executor(name: str) -> ManagedExecutor:
+    """Return the shared executor ``name`` ("io", "cpu" or "onnx-serial")."""
+    executor = _executors.get(name)
+    if executor is None:
+        with _lock:
+            executor = _executors.get(name)
+            if executor is None:
+                executor = _executors[name] = _create(name)
+    return executor
+
+
+def stats() -> dict[str, dict[str, Any]]:
+    """Return worker count, queue depth and utilization for every pool."""
+    return {name: get_executor(name).stats() for name in EXECUTOR_NAMES}
+
+
+def shutdown() -> None:
+    """Stop all pools without waiting; pending work is cancelled."""
+    with _lock:
+        executors = list(_executors.values())
+        _executors.clear()
+    for executor in executors:
+        executor.shutdown(wait=False, cancel_futures=True)
+    process_pool.shutdown()
@@ -0,0 +1,215 @@
+"""Run FFmpeg (and other encoder binaries) with live progress reporting.
+
+``run_ffmpeg`` adds ``-progress pipe:1`` to an FFmpeg command, parses the
+``key=value`` blocks it writes to stdout and turns ``out_time`` into a
+percentage of the expected output duration (see ``media_duration``).
+Updates are throttled to one every ``PROGRESS_INTERVAL`` seconds and carry
+the encode speed and an ETA.
+
+stderr is drained concurrently into a bounded buffer: only the last
+``STDERR_LIMIT`` bytes are kept for the error message, so a chatty
+multi-hour encode cannot grow memory without limit.
+
+If the awaiting task is cancelled the child process is killed.
+"""
+from __future__ import annotations
+
+import asyncio
+import time
+from pathlib import Path
+from typing import Awaitable, Callable
+
+from app.processors.base import ProgressCallback
+from app.services.media_info import probe
+
+PROGRESS_INTERVAL = 0.5
+STDERR_LIMIT = 64 * 1024
+
+
+class StderrBuffer:
+    """Keep only the tail of a process's stderr."""
+
+    def __init__(self, limit: int = STDERR_LIMIT) -> None:
+        self._limit = limit
+        self._data = bytearray()
+        self.truncated = False
+
+    def feed(self, chunk: bytes) -> None:
+        self._data += chunk
+        if len(self._data) > self._limit:
+            del self._data[: len(self._data) - self._limit]
+            self.truncated = True
+
+    async def drain(self, stream: asyncio.StreamReader) -> None:
+        """Read ``stream`` to EOF, keeping only the tail."""
+        while chunk := await stream.read(4096):
+            self.feed(chunk)
+
+    def text(self) -> str:
+        text = self._data.decode(errors="replace").strip()
+        return f"...{text}" if self.truncated else text
+
+
+async def media_duration(path: Path) -> float | None:
+    """Return the duration of ``path`` in seconds, or None if unknown."""
+    try:
+        return (await probe(path)).duration
+    except (OSError, RuntimeError, ValueError):
+        return None
+
+
+def clip_duration(total: float | None, start: float = 0, length: float | None = None) -> float | None:
+    """Duration of the output when ``length`` seconds are cut from ``start``."""
+    if total is None:
+        return length
+    remaining = max(0.0, total - start)
+    return remaining if length is None else min(length, remaining)
+
+
+def parse_time(value: str) -> float | None:
+    """Parse an FFmpeg time value ("90", "1:30", "00:01:30.5") into seconds."""
+    try:
+        seconds = 0.0
+        for part in value.strip().split(":"):
+            seconds = seconds * 60 + float(part)
+        return seconds
+    except ValueError:
+        return None
+
+
+def _format_eta(seconds: float) -> str:
+    seconds = int(seconds)
+    if seconds >= 3600:
+        return f"{seconds // 3600}h{seconds % 3600 // 60:02d}m"
+    if seconds >= 60:
+        return f"{seconds // 60}m{seconds % 60:02d}s"
+    return f"{seconds}s"
+
+
+class _ProgressParser:
+    """Turn ``-progress`` blocks into throttled ``on_progress`` calls."""
+
+    def __init__(
+        self,
+        on_progress: ProgressCallback,
+        duration: float,
+        start_pct: float,
+        end_pct: float,
+        message: str,
+    ) -> None:
+        self._on_progress = on_progress
+        self._duration = duration
+        self._start_pct = start_pct
+        self._end_pct = end_pct
+        self._message = message
+        self._fields: dict[str, str] = {}
+        self._last_emit = 0.0
+        self._last_pct = -1.0
+
+    async def feed(self, line: str) -> None:
+        key, sep, value = line.partition("=")
+        if not sep:
+            return
+        key, value = key.strip(), value.strip()
+        self._fields[key] = value
+        if key == "progress":
+            await self._emit(final=value == "end")
+
+    async def _emit(self, final: bool) -> None:
+        now = time.monotonic()
+        if not final and now - self._last_emit < PROGRESS_INTERVAL:
+            return
+
+        # out_time_us and out_time_ms are both microseconds ("ms" is a misnomer)
+        raw = self._fields.get("out_time_us") or self._fields.get("out_time_ms")
+        try:
+            out_time = max(0.0, int(raw) / 1_000_000) if raw else 0.0
+        except ValueError:
+            return
+        frac = 1.0 if final else min(1.0, out_time / self._duration)
+        pct = self._start_pct + frac * (self._end_pct - self._start_pct)
+        if pct <= self._last_pct:
+            return
+
+        message = f"{self._message} – {frac * 100:.0f}%"
+        speed = self._fields.get("speed", "").rstrip("x")
+        try:
+            speed_value = float(speed)
+        except ValueError:
+            speed_value = 0.0
+        if speed_value > 0:
+            message += f" ({speed_value:.1f}x"
+            if not final:
+                message += f", ETA {_format_eta((self._duration - out_time) / speed_value)}"
+            message += ")"
+
+        self._last_emit = now
+        self._last_pct = pct
+        await self._on_progress(round(pct, 1), message)
+
+
+async def run_ffmpeg(
+    cmd: list[str],
+    *,
+    on_progress: ProgressCallback | None = None,
+    duration: float | None = None,
+    start_pct: float = 10,
+    end_pct: float = 99,
+    message: str = "Processing",
+    error: str = "FFmpeg failed",
+) -> None:
+    """Run an FFmpeg command, reporting progress between ``start_pct`` and ``end_pct``.
+
+    ``cmd`` is a full command line starting with the ffmpeg binary.
+    ``duration`` is the expected output duration in seconds; without it
+    (or without ``on_progress``) the command runs without progress updates.
+    Raises RuntimeError with the tail of stderr, prefixed by ``error``, if
+    FFmpeg exits with a non-zero status.
+    """
+    full_cmd = [cmd[0], "-progress", "pipe:1", "-nostats", *cmd[1:]]
+    parser = (
+        _ProgressParser(on_progress, duration, start_pct, end_pct, message)
+        if on_progress is not None and duration
+        else None
+    )
+
+    async def read_progress(stream: asyncio.StreamReader) -> None:
+        async for raw in stream:
+            if parser is not None:
+                await parser.feed(raw.decode(errors="replace"))
+
+    await _run(full_cmd, error, read_progress)
+
+
+async def run_process(cmd: list[str], *, error: str = "Command failed") -> None:
+    """Run any encoder binary with bounded stderr capture and kill-on-cancel."""
+    await _run(cmd, error, None)
+
+
+async def _run(
+    cmd: list[str],
+    error: str,
+    read_stdout: Callable[[asyncio.StreamReader], Awaitable[None]] | None,
+) -> None:
+    proc = await asyncio.create_subprocess_exec(
+        *cmd,
+        stdin=asyncio.subprocess.DEVNULL,
+        stdout=asyncio.subprocess.PIPE if read_stdout else asyncio.subprocess.DEVNULL,
+        stderr=asyncio.subprocess.PIPE,
+    )
+    stderr = StderrBuffer()
+    readers = [stderr.drain(proc.stderr)]
+    if read_stdout:
+        readers.append(read_stdout(proc.stdout))
+
+    try:
+        await asyncio.gather(*readers)
+        await proc.wait()
+    except BaseException:
+        if proc.returncode is None:
+            proc.kill()
+            await proc.wait()
+        raise
+
+    if proc.returncode != 0:
+        raise RuntimeError(f"{error}: {stderr.text()}")
@@ -1,21 +1,67 @@
+from __future__ import annotations
+
+import hashlib
 import shutil
+from dataclasses import dataclass
 from pathlib import Path
+from typing import BinaryIO, Callable
 
 BASE_DIR = Path(__file__).resolve().parent.parent.parent
 UPLOADS_DIR = BASE_DIR / "uploads"
 JOBS_DIR = BASE_DIR / "jobs"
+CACHE_DIR = BASE_DIR / "cache"
+SHARED_UPLOADS_DIR = BASE_DIR / "shared_uploads"
 
 UPLOADS_DIR.mkdir(exist_ok=True)
 JOBS_DIR.mkdir(exist_ok=True)
+CACHE_DIR.mkdir(exist_ok=True)
+SHARED_UPLOADS_DIR.mkdir(exist_ok=True)
+
+# Uploads are copied in fixed-size chunks so memory use stays bounded
+# regardless of file size.
+CHUNK_SIZE = 1024 * 1024
+
+
+@dataclass
+class SavedUpload:
+    """An upload written to disk, with its size and content hash."""
 
+    path: Path
+    size: int
+    sha256: str
 
-def save_upload(job_id: str, filename: str, data: bytes) -> Path:
-    """Save an uploaded file and return its path."""
+
+def save_upload(job_id: str, filename: str, src: BinaryIO) -> SavedUpload:
+    """Copy an uploaded file object to disk in chunks.
+
+    The SHA-256 hash and byte size are computed in the same pass so later
+    stages never need to read the file again. Blocking — call it from an
+    executor when running on the event loop.
+    """
     job_upload_dir = UPLOADS_DIR / job_id
     job_upload_dir.mkdir(exist_ok=True)
     dest = job_upload_dir / filename
-    dest.write_bytes(data)
-    return dest
+
+    digest = hashlib.sha256()
+    size = 0
+    with open(dest, "wb") as out:
+        while True:
+            chunk = src.read(CHUNK_SIZE)
+            if not chunk:
+                break
+            digest.update(chunk)
+            out.write(chunk)
+            size += len(chunk)
+
+    return SavedUpload(path=dest, size=size, sha256=digest.hexdigest())
+
+
+def combine_hashes(hashes: list[str]) -> str:
+    """Derive a single content hash for an ordered list of input files."""
+    digest = hashlib.sha256()
+    for h in hashes:
+        digest.update(h.encode())
+    return digest.hexdigest()
 
 
 def get_job_dir(job_id: str) -> Path:
@@ -26,7 +72,28 @@ def get_job_dir(job_id: str) -> Path:
 
 
 def cleanup_job(job_id: str) -> None:
-    """Remove all temporary files for a job."""
+    """Remove all temporary files for a job.
+
+    Blocking — call it from an executor when running on the event loop.
+    """
     for d in (UPLOADS_DIR / job_id, JOBS_DIR / job_id):
         if d.exists():
-            shutil.rmtree(d)
+            # A cancelled job's executor work may still be writing here
+            shutil.rmtree(d, ignore_errors=True)
+
+
+def remove_orphaned_dirs(is_known: Callable[[str], bool]) -> int:
+    """Delete upload and working directories for which ``is_known(job_id)`` is false.
+
+    Used after jobs are restored from the job store, to reclaim space left
+    by jobs that were never persisted or have since been removed. Each
+    directory is checked when it is reached, so jobs created while the
+    sweep runs are kept. Blocking.
+    """
+    removed = 0
+    for root in (UPLOADS_DIR, JOBS_DIR):
+        for d in root.iterdir():
+            if d.is_dir() and not is_known(d.name):
+                shutil.rmtree(d, ignore_errors=True)
+                removed += 1
+    return removed
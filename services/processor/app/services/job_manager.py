@@ -1,18 +1,36 @@
 from __future__ import annotations
 
 import asyncio
+import heapq
+import time
 import uuid
 from datetime import datetime, timezone
 from enum import Enum
 from pathlib import Path
 from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, Callable
+
+from app.services.progress import ProgressListener, min_delta, min_interval
+
+if TYPE_CHECKING:
+    from app.services.job_store import JobStore
 
 
 class JobStatus(str, Enum):
     PENDING = "pending"
+    QUEUED = "queued"
     PROCESSING = "processing"
     COMPLETED = "completed"
     FAILED = "failed"
+    CANCELLED = "cancelled"
+
+
+# States from which a job can no longer change
+FINISHED_STATUSES = (JobStatus.COMPLETED, JobStatus.FAILED, JobStatus.CANCELLED)
+
+
+def _isoformat(timestamp: float) -> str:
+    return datetime.fromtimestamp(timestamp, timezone.utc).isoformat()
 
 
 @dataclass
@@ -25,8 +43,27 @@ class Job:
     message: str = ""
     result_path: str | None = None
     error: str | None = None
-    created_at: str = field(default_factory=lambda: datetime.now(timezone.utc).isoformat())
-    _listeners: list[asyncio.Queue] = field(default_factory=list, repr=False)
+    input_hash: str | None = None
+    input_size: int = 0
+    # Unix timestamp; kept as a number so expiry never parses strings
+    created: float = field(default_factory=time.time)
+    # What the job was submitted with, so it can be re-queued after a restart
+    options: dict[str, Any] = field(default_factory=dict)
+    input_paths: list[str] = field(default_factory=list)
+    # Where to write the result on the local disk (see app.services.local_paths)
+    output_path: str | None = None
+    output_dir: str | None = None
+    # Whether the result may replace an existing file at its local output
+    overwrite: bool = False
+    _listeners: list[ProgressListener] = field(default_factory=list, repr=False)
+    # Throttling state of published progress events
+    _published_at: float = field(default=0.0, repr=False)
+    _published_progress: float = field(default=0.0, repr=False)
+    _pending_publish: asyncio.TimerHandle | None = field(default=None, repr=False)
+
+    @property
+    def created_at(self) -> str:
+        return _isoformat(self.created)
 
     def to_dict(self) -> dict:
         result_ext = ""
@@ -41,16 +78,46 @@ class Job:
             "message": self.message,
             "result_extension": result_ext,
             "error": self.error,
+            "output_path": self.output_path,
             "created_at": self.created_at,
         }
 
+    def to_record(self) -> dict[str, Any]:
+        """All persistent fields, for the job store."""
+        return {
+            "id": self.id,
+            "processor_id": self.processor_id,
+            "original_filename": self.original_filename,
+            "status": self.status.value,
+            "progress": self.progress,
+            "message": self.message,
+            "result_path": self.result_path,
+            "error": self.error,
+            "input_hash": self.input_hash,
+            "input_size": self.input_size,
+            "created": self.created,
+            "options": self.options,
+            "input_paths": self.input_paths,
+            "output_path": self.output_path,
+            "output_dir": self.output_dir,
+            "overwrite": self.overwrite,
+        }
+
+    @classmethod
+    def from_record(cls, record: dict[str, Any]) -> Job:
+        return cls(**{**record, "status": JobStatus(record["status"]), "overwrite": bool(record["overwrite"])})
+
 
 @dataclass
 class Batch:
     id: str
     job_ids: list[str]
     processor_id: str
-    created_at: str = field(default_factory=lambda: datetime.now(timezone.utc).isoformat())
+    created: float = field(default_factory=time.time)
+
+    @property
+    def created_at(self) -> str:
+        return _isoformat(self.created)
 
     def to_dict(self) -> dict:
         return {
@@ -60,11 +127,136 @@ class Batch:
             "created_at": self.created_at,
         }
 
+    def to_record(self) -> dict[str, Any]:
+        """All persistent fields, for the job store."""
+        return {
+            "id": self.id,
+            "job_ids": self.job_ids,
+            "processor_id": self.processor_id,
+            "created": self.created,
+        }
+
 
 class JobManager:
     def __init__(self) -> None:
         self._jobs: dict[str, Job] = {}
         self._batches: dict[str, Batch] = {}
+        self._store: JobStore | None = None
+        self._min_interval = min_interval()
+        self._min_delta = min_delta()
+        # Min-heap of (created, job_id) for finished jobs, so expiry only
+        # looks at jobs that are actually old enough
+        self._expiry: list[tuple[float, str]] = []
+        # Reverse index from job ID to the batch that contains it
+        self._batch_of: dict[str, str] = {}
+        self._finish_hooks: list[Callable[[Job], None]] = []
+
+    def attach_store(self, store: JobStore) -> list[Job]:
+        """Load persisted jobs and batches, then persist every later change.
+
+        Finished jobs are restored as they were, except that completed jobs
+        whose result file is gone are marked failed. Jobs that were pending,
+        queued or processing when the backend stopped are returned for the
+        caller to re-queue if their input files still exist, and marked
+        failed otherwise.
+        """
+        jobs, batches = store.load()
+        self._store = store
+        interrupted: list[Job] = []
+        for record in jobs:
+            job = Job.from_record(record)
+            self._jobs[job.id] = job
+            if job.status == JobStatus.COMPLETED:
+                if not job.result_path or not Path(job.result_path).is_file():
+                    self.mark_failed(job.id, "Result file is missing after a restart")
+            elif job.status not in FINISHED_STATUSES:
+                if job.input_paths and all(Path(p).is_file() for p in job.input_paths):
+                    interrupted.append(job)
+                else:
+                    self.mark_failed(job.id, "Interrupted by a restart")
+        for record in batches:
+            batch = Batch(**record)
+            batch.job_ids = [jid for jid in batch.job_ids if jid in self._jobs]
+            self._batches[batch.id] = batch
+            self._batch_of.update(dict.fromkeys(batch.job_ids, batch.id))
+            self._save_batch(batch)
+        self._expiry = [
+            (job.created, job.id) for job in self._jobs.values() if job.status in FINISHED_STATUSES
+        ]
+        heapq.heapify(self._expiry)
+        store.start()
+        return interrupted
+
+    def job_ids(self) -> set[str]:
+        return set(self._jobs)
+
+    def add_finish_hook(self, hook: Callable[[Job], None]) -> None:
+        """Call ``hook(job)`` once whenever a job completes, fails or is cancelled."""
+        self._finish_hooks.append(hook)
+
+    def _finish(self, job: Job, status: JobStatus) -> None:
+        """Move ``job`` to a finished status, index it for expiry and tell listeners."""
+        first = job.status not in FINISHED_STATUSES
+        if first:
+            heapq.heappush(self._expiry, (job.created, job.id))
+        job.status = status
+        self._save(job)
+        if job._pending_publish is not None:
+            job._pending_publish.cancel()
+            job._pending_publish = None
+        event = {
+            "status": status.value,
+            "progress": round(job.progress, 1),
+            "message": job.error if status == JobStatus.FAILED else job.message,
+        }
+        for listener in job._listeners:
+            listener.push(job.id, event)
+        if first:
+            for hook in self._finish_hooks:
+                hook(job)
+
+    def _publish_progress(self, job: Job) -> None:
+        """Send the job's current progress to its listeners, throttled.
+
+        An update inside the minimum interval is held back and sent when the
+        interval runs out, unless a newer one replaces it first.
+        """
+        if not job._listeners or job.status in FINISHED_STATUSES:
+            return
+        now = time.monotonic()
+        wait = job._published_at + self._min_interval - now
+        moved = abs(job.progress - job._published_progress)
+        if wait > 0 and not (self._min_delta and moved >= self._min_delta):
+            if job._pending_publish is None:
+                job._pending_publish = asyncio.get_running_loop().call_later(
+                    wait, self._flush_progress, job.id
+                )
+            return
+        if job._pending_publish is not None:
+            job._pending_publish.cancel()
+            job._pending_publish = None
+        job._published_at = now
+        job._published_progress = job.progress
+        event = {"progress": round(job.progress, 1), "message": job.message, "status": job.status.value}
+        for listener in job._listeners:
+            listener.push(job.id, event)
+
+    def _flush_progress(self, job_id: str) -> None:
+        job = self._jobs.get(job_id)
+        if job is not None:
+            job._pending_publish = None
+            self._publish_progress(job)
+
+    def _save(self, job: Job) -> None:
+        if self._store is not None:
+            self._store.save_job(job.to_record())
+
+    def _save_batch(self, batch: Batch) -> None:
+        if self._store is not None:
+            if batch.job_ids:
+                self._store.save_batch(batch.to_record())
+            else:
+                self._store.delete_batch(batch.id)
 
     def create(self, processor_id: str, original_filename: str) -> Job:
         job = Job(
@@ -73,6 +265,7 @@ class JobManager:
             original_filename=original_filename,
         )
         self._jobs[job.id] = job
+        self._save(job)
         return job
 
     def get(self, job_id: str) -> Job | None:
@@ -84,35 +277,82 @@ class JobManager:
             return
         job.progress = progress
         job.message = message
-        event = {"progress": round(progress, 1), "message": message, "status": job.status.value}
-        for q in job._listeners:
-            await q.put(event)
+        self._save(job)
+        self._publish_progress(job)
+
+    def record_input(self, job_id: str, input_hash: str, input_size: int) -> None:
+        job = self._jobs[job_id]
+        job.input_hash = input_hash
+        job.input_size = input_size
+        self._save(job)
+
+    def record_submission(self, job_id: str, options: dict[str, Any], input_paths: list[Path]) -> None:
+        job = self._jobs[job_id]
+        job.options = dict(options)
+        job.input_paths = [str(p) for p in input_paths]
+        self._save(job)
+
+    def record_output(
+        self, job_id: str, output_path: Path | None, output_dir: Path | None, overwrite: bool = False
+    ) -> None:
+        """Have the result written to ``output_path``, or into ``output_dir``."""
+        job = self._jobs[job_id]
+        job.output_path = str(output_path) if output_path else None
+        job.output_dir = str(output_dir) if output_dir else None
+        job.overwrite = overwrite
+        self._save(job)
+
+    def record_delivery(self, job_id: str, path: Path) -> None:
+        """Record where the result was written on the local disk."""
+        job = self._jobs[job_id]
+        job.output_path = str(path)
+        self._save(job)
+
+    def mark_queued(self, job_id: str, message: str = "Waiting for a free slot...") -> None:
+        job = self._jobs[job_id]
+        job.status = JobStatus.QUEUED
+        job.message = message
+        self._save(job)
+        self._publish_progress(job)
 
-    def mark_completed(self, job_id: str, result_path: Path) -> None:
+    def mark_processing(self, job_id: str) -> None:
+        job = self._jobs[job_id]
+        job.status = JobStatus.PROCESSING
+        self._save(job)
+        self._publish_progress(job)
+
+    def mark_completed(self, job_id: str, result_path: Path, message: str = "Done!") -> None:
         job = self._jobs[job_id]
-        job.status = JobStatus.COMPLETED
         job.progress = 100
-        job.message = "Done!"
+        job.message = message
         job.result_path = str(result_path)
+        self._finish(job, JobStatus.COMPLETED)
 
     def mark_failed(self, job_id: str, error: str) -> None:
         job = self._jobs[job_id]
-        job.status = JobStatus.FAILED
         job.error = error
         job.message = f"Error: {error}"
+        self._finish(job, JobStatus.FAILED)
 
-    def subscribe(self, job_id: str) -> asyncio.Queue | None:
+    def mark_cancelled(self, job_id: str) -> None:
+        job = self._jobs[job_id]
+        job.message = "Cancelled"
+        self._finish(job, JobStatus.CANCELLED)
+
+    def subscribe(self, job_id: str, listener: ProgressListener | None = None) -> ProgressListener | None:
+        """Register ``listener`` (a new one by default) for the job's events."""
         job = self._jobs.get(job_id)
         if job is None:
             return None
-        q: asyncio.Queue = asyncio.Queue()
-        job._listeners.append(q)
-        return q
+        if listener is None:
+            listener = ProgressListener()
+        job._listeners.append(listener)
+        return listener
 
-    def unsubscribe(self, job_id: str, q: asyncio.Queue) -> None:
+    def unsubscribe(self, job_id: str, listener: ProgressListener) -> None:
         job = self._jobs.get(job_id)
-        if job and q in job._listeners:
-            job._listeners.remove(q)
+        if job and listener in job._listeners:
+            job._listeners.remove(listener)
 
     def create_batch(self, processor_id: str, job_ids: list[str]) -> Batch:
         batch = Batch(
@@ -121,33 +361,42 @@ class JobManager:
             processor_id=processor_id,
         )
         self._batches[batch.id] = batch
+        self._batch_of.update(dict.fromkeys(job_ids, batch.id))
+        self._save_batch(batch)
         return batch
 
     def get_batch(self, batch_id: str) -> Batch | None:
         return self._batches.get(batch_id)
 
     def collect_expired(self, max_age_seconds: float = 3600) -> list[str]:
-        """Return job IDs that are finished and older than max_age_seconds."""
-        now = datetime.now(timezone.utc)
+        """Return job IDs that are finished and older than max_age_seconds.
+
+        Only pops the expired end of the expiry heap, so the cost depends on
+        the number of expired jobs, not on how many are retained. Returned
+        jobs leave the index; callers are expected to remove them.
+        """
+        cutoff = time.time() - max_age_seconds
         expired: list[str] = []
-        for job in self._jobs.values():
-            if job.status not in (JobStatus.COMPLETED, JobStatus.FAILED):
-                continue
-            created = datetime.fromisoformat(job.created_at)
-            if (now - created).total_seconds() > max_age_seconds:
-                expired.append(job.id)
+        while self._expiry and self._expiry[0][0] < cutoff:
+            _, job_id = heapq.heappop(self._expiry)
+            job = self._jobs.get(job_id)
+            if job is not None and job.status in FINISHED_STATUSES:
+                expired.append(job_id)
         return expired
 
     def remove_job(self, job_id: str) -> None:
-        """Remove a job and its reference from any batch."""
+        """Remove a job and its reference from its batch, dropping empty batches."""
         self._jobs.pop(job_id, None)
-        for batch in self._batches.values():
-            if job_id in batch.job_ids:
-                batch.job_ids.remove(job_id)
-        # Remove empty batches
-        empty = [bid for bid, b in self._batches.items() if not b.job_ids]
-        for bid in empty:
-            del self._batches[bid]
+        if self._store is not None:
+            self._store.delete_job(job_id)
+        batch_id = self._batch_of.pop(job_id, None)
+        batch = self._batches.get(batch_id) if batch_id else None
+        if batch is None:
+            return
+        batch.job_ids.remove(job_id)
+        if not batch.job_ids:
+            del self._batches[batch.id]
+        self._save_batch(batch)
 
 
 job_manager = JobManager()
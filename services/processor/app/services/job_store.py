@@ -0,0 +1,190 @@
+"""Optional SQLite persistence for jobs and batches.
+
+By default job records only live in memory and are lost on restart. Set
+``VIMIX_JOB_STORE=1`` (database next to the uploads, ``vimix.db``) or
+``VIMIX_JOB_STORE=/path/to/jobs.db`` to keep them in SQLite instead.
+
+The database runs in WAL mode. Writes are not issued per update: the job
+manager hands over rows, later rows for the same job replace earlier ones,
+and a background thread commits whatever accumulated every
+``FLUSH_INTERVAL`` seconds in one transaction. A burst of progress updates
+therefore costs one row write per job, and a crash loses at most the last
+interval of progress.
+
+On startup ``JobManager.attach_store`` loads the records back; see there
+for how interrupted jobs are handled.
+"""
+from __future__ import annotations
+
+import json
+import logging
+import os
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Any
+
+from app.services.file_manager import BASE_DIR
+
+logger = logging.getLogger("vimix.job_store")
+
+FLUSH_INTERVAL = 0.5
+
+_JOB_COLUMNS = (
+    "id", "processor_id", "original_filename", "status", "progress", "message",
+    "result_path", "error", "input_hash", "input_size", "created",
+    "options", "input_paths", "output_path", "output_dir", "overwrite",
+)
+_BATCH_COLUMNS = ("id", "processor_id", "created", "job_ids")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    processor_id TEXT NOT NULL,
+    original_filename TEXT NOT NULL,
+    status TEXT NOT NULL,
+    progress REAL NOT NULL,
+    message TEXT NOT NULL,
+    result_path TEXT,
+    error TEXT,
+    input_hash TEXT,
+    input_size INTEGER NOT NULL,
+    created REAL NOT NULL,
+    options TEXT NOT NULL,
+    input_paths TEXT NOT NULL,
+    output_path TEXT,
+    output_dir TEXT,
+    overwrite INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS batches (
+    id TEXT PRIMARY KEY,
+    processor_id TEXT NOT NULL,
+    created REAL NOT NULL,
+    job_ids TEXT NOT NULL
+);
+"""
+
+
+def _upsert(table: str, columns: tuple[str, ...]) -> str:
+    names = ", ".join(columns)
+    marks = ", ".join("?" for _ in columns)
+    return f"INSERT OR REPLACE INTO {table} ({names}) VALUES ({marks})"
+
+
+class JobStore:
+    """Write-behind SQLite store of job and batch rows."""
+
+    def __init__(self, path: Path, flush_interval: float = FLUSH_INTERVAL) -> None:
+        self.path = path
+        self._flush_interval = flush_interval
+        self._conn = sqlite3.connect(str(path), check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        # WAL + NORMAL only syncs at checkpoints; a power loss can drop the
+        # last transactions but never corrupts the database
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+        self._db_lock = threading.Lock()
+        self._lock = threading.Lock()
+        # Rows waiting to be written, keyed by id; None marks a deletion
+        self._jobs: dict[str, tuple | None] = {}
+        self._batches: dict[str, tuple | None] = {}
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def start(self) -> None:
+        """Start the background writer."""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._writer, name="job-store", daemon=True)
+            self._thread.start()
+
+    def close(self) -> None:
+        """Write everything still pending and close the database."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self.flush()
+        with self._db_lock:
+            self._conn.close()
+
+    def save_job(self, values: dict[str, Any]) -> None:
+        row = tuple(
+            json.dumps(values[c]) if c in ("options", "input_paths") else values[c]
+            for c in _JOB_COLUMNS
+        )
+        with self._lock:
+            self._jobs[values["id"]] = row
+
+    def delete_job(self, job_id: str) -> None:
+        with self._lock:
+            self._jobs[job_id] = None
+
+    def save_batch(self, values: dict[str, Any]) -> None:
+        row = (values["id"], values["processor_id"], values["created"], json.dumps(values["job_ids"]))
+        with self._lock:
+            self._batches[values["id"]] = row
+
+    def delete_batch(self, batch_id: str) -> None:
+        with self._lock:
+            self._batches[batch_id] = None
+
+    def load(self) -> tuple[list[dict[str, Any]], list[dict[str, Any]]]:
+        """Return every stored job and batch as plain dicts."""
+        with self._db_lock:
+            job_rows = self._conn.execute(f"SELECT {', '.join(_JOB_COLUMNS)} FROM jobs").fetchall()
+            batch_rows = self._conn.execute(f"SELECT {', '.join(_BATCH_COLUMNS)} FROM batches").fetchall()
+        jobs = []
+        for row in job_rows:
+            values = dict(zip(_JOB_COLUMNS, row))
+            values["options"] = json.loads(values["options"])
+            values["input_paths"] = json.loads(values["input_paths"])
+            jobs.append(values)
+        batches = []
+        for row in batch_rows:
+            values = dict(zip(_BATCH_COLUMNS, row))
+            values["job_ids"] = json.loads(values["job_ids"])
+            batches.append(values)
+        return jobs, batches
+
+    def flush(self) -> None:
+        """Write all pending rows in one transaction."""
+        with self._lock:
+            jobs, self._jobs = self._jobs, {}
+            batches, self._batches = self._batches, {}
+        if not jobs and not batches:
+            return
+        with self._db_lock:
+            try:
+                self._conn.execute("BEGIN")
+                self._write("jobs", _JOB_COLUMNS, jobs)
+                self._write("batches", _BATCH_COLUMNS, batches)
+                self._conn.execute("COMMIT")
+            except sqlite3.Error:
+                self._conn.execute("ROLLBACK")
+                logger.exception("Could not write %d job record(s)", len(jobs) + len(batches))
+
+    def _write(self, table: str, columns: tuple[str, ...], rows: dict[str, tuple | None]) -> None:
+        upserts = [row for row in rows.values() if row is not None]
+        deletes = [(key,) for key, row in rows.items() if row is None]
+        if upserts:
+            self._conn.executemany(_upsert(table, columns), upserts)
+        if deletes:
+            self._conn.executemany(f"DELETE FROM {table} WHERE id = ?", deletes)
+
+    def _writer(self) -> None:
+        while not self._stop.wait(self._flush_interval):
+            self.flush()
+
+
+def open_store_from_env() -> JobStore | None:
+    """Open the store configured by ``VIMIX_JOB_STORE``, or None if disabled."""
+    env = os.environ.get("VIMIX_JOB_STORE", "").strip()
+    if env.lower() in ("", "0", "false", "off"):
+        return None
+    path = BASE_DIR / "vimix.db" if env.lower() in ("1", "true", "on") else Path(env)
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        return JobStore(path)
+    except (OSError, sqlite3.Error):
+        logger.exception("Could not open job store at %s; jobs stay in memory only", path)
+        return None
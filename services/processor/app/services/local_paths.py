@@ -0,0 +1,145 @@
+"""Job inputs and outputs given as paths on the backend's own machine.
+
+Same-host clients such as the MCP server can submit ``local_path`` instead
+of uploading the file. The input is hardlinked into ``UPLOADS_DIR`` (or
+reflinked on filesystems that support it) and, when neither is possible,
+read in place, so it is never copied. Results can be written straight to
+a caller-chosen ``output_path`` or ``output_dir``; an existing file there is
+only replaced when the request says ``overwrite``.
+
+Only paths under the roots listed in ``VIMIX_LOCAL_PATH_ROOTS``
+(``os.pathsep``-separated) are accepted, after resolving symlinks. The list
+is empty by default, which disables local paths: the API accepts requests
+from any origin, so the roots bound what a web page could make it read or
+write.
+
+The input hash recorded for local files identifies the file (device,
+inode, size, mtime) rather than its content, so that submitting a large
+file does not require reading it just to fill in the result cache key.
+"""
+from __future__ import annotations
+
+import hashlib
+import os
+import shutil
+import sys
+from pathlib import Path
+
+from app.services.file_manager import UPLOADS_DIR, SavedUpload
+
+# Linux ioctl that makes ``dest`` share the extents of ``src`` (btrfs, XFS)
+_FICLONE = 0x40049409
+
+
+def allowed_roots() -> list[Path]:
+    """Directories under which local paths are accepted."""
+    roots = []
+    for entry in os.environ.get("VIMIX_LOCAL_PATH_ROOTS", "").split(os.pathsep):
+        entry = entry.strip()
+        if entry and os.path.isabs(os.path.expanduser(entry)):
+            roots.append(Path(entry).expanduser().resolve())
+    return roots
+
+
+def _check_allowed(path: Path) -> None:
+    roots = allowed_roots()
+    if not roots:
+        raise PermissionError("Local paths are disabled (set VIMIX_LOCAL_PATH_ROOTS)")
+    if not any(path == root or root in path.parents for root in roots):
+        raise PermissionError(f"Path is outside the allowed roots: {path}")
+
+
+def resolve_input(path: str) -> Path:
+    """Validate a local input path and return it resolved.
+
+    Raises PermissionError outside the allowed roots and FileNotFoundError
+    if it is not an existing file.
+    """
+    if not os.path.isabs(path):
+        raise PermissionError(f"Local paths must be absolute: {path}")
+    resolved = Path(path).resolve()
+    _check_allowed(resolved)
+    if not resolved.is_file():
+        raise FileNotFoundError(f"File not found: {path}")
+    return resolved
+
+
+def resolve_output(path: str) -> Path:
+    """Validate a local output file or directory path and return it resolved."""
+    if not os.path.isabs(path):
+        raise PermissionError(f"Local paths must be absolute: {path}")
+    resolved = Path(path).resolve()
+    _check_allowed(resolved)
+    return resolved
+
+
+def copy_file(src: Path, dest: Path) -> None:
+    """Copy ``src`` to ``dest``, sharing its extents where the filesystem can."""
+    if not _reflink(src, dest):
+        shutil.copyfile(src, dest)
+
+
+def _reflink(src: Path, dest: Path) -> bool:
+    if not sys.platform.startswith("linux"):
+        return False
+    import fcntl
+
+    try:
+        with open(src, "rb") as s, open(dest, "wb") as d:
+            fcntl.ioctl(d.fileno(), _FICLONE, s.fileno())
+        return True
+    except OSError:
+        dest.unlink(missing_ok=True)
+        return False
+
+
+def ingest_local(job_id: str, src: Path) -> SavedUpload:
+    """Make ``src`` available as a job input without copying its data.
+
+    Blocking, but only touches metadata.
+    """
+    stat = src.stat()
+    identity = f"{src}:{stat.st_dev}:{stat.st_ino}:{stat.st_size}:{stat.st_mtime_ns}"
+    job_upload_dir = UPLOADS_DIR / job_id
+    job_upload_dir.mkdir(exist_ok=True)
+    dest = job_upload_dir / src.name
+    try:
+        os.link(src, dest)
+    except OSError:
+        if not _reflink(src, dest):
+            # Different filesystem: processors only read their inputs, so
+            # the original can be used directly
+            dest = src
+    return SavedUpload(
+        path=dest,
+        size=stat.st_size,
+        sha256=hashlib.sha256(identity.encode()).hexdigest(),
+    )
+
+
+def deliver_result(result: Path, dest: Path, overwrite: bool = False) -> Path:
+    """Move a finished result to ``dest``; copies only across filesystems.
+
+    A result that is also linked from the result cache is reflinked or
+    copied instead, so that editing the delivered file cannot change the
+    cache entry. Raises FileExistsError if ``dest`` exists, unless
+    ``overwrite``. Blocking — call it from an executor when running on the
+    event loop.
+    """
+    if not overwrite and dest.exists():
+        raise FileExistsError(f"Output file already exists: {dest}")
+    dest.parent.mkdir(parents=True, exist_ok=True)
+    if result.stat().st_nlink == 1:
+        try:
+            os.replace(result, dest)
+            return dest
+        except OSError:
+            pass
+    partial = dest.with_name(dest.name + ".part")
+    try:
+        copy_file(result, partial)
+        os.replace(partial, dest)
+    finally:
+        partial.unlink(missing_ok=True)
+    result.unlink(missing_ok=True)
+    return dest
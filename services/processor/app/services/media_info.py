@@ -0,0 +1,111 @@
+"""Inspect media files and FFmpeg capabilities.
+
+``probe`` wraps ffprobe to read duration, video geometry (taking rotation
+metadata into account) and whether there is an audio stream;
+``has_encoder`` checks whether the FFmpeg build in use ships a given
+encoder.
+"""
+from __future__ import annotations
+
+import asyncio
+import json
+from dataclasses import dataclass
+from pathlib import Path
+
+from app.services.binary_paths import get_ffmpeg, get_ffprobe
+
+_encoders: set[str] | None = None
+
+
+@dataclass
+class MediaInfo:
+    duration: float | None = None
+    width: int | None = None
+    height: int | None = None
+    rotation: int = 0
+    has_audio: bool = False
+
+    @property
+    def display_size(self) -> tuple[int, int] | None:
+        """Frame size as FFmpeg outputs it (after auto-rotation)."""
+        if not self.width or not self.height:
+            return None
+        if self.rotation % 180 == 90:
+            return self.height, self.width
+        return self.width, self.height
+
+
+async def probe(path: Path) -> MediaInfo:
+    """Return duration, first-video-stream geometry and audio presence of ``path``."""
+    proc = await asyncio.create_subprocess_exec(
+        get_ffprobe(),
+        "-v", "error",
+        "-print_format", "json",
+        "-show_format",
+        "-show_streams",
+        str(path),
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE,
+    )
+    try:
+        stdout, stderr = await proc.communicate()
+    except BaseException:
+        # A cancelled job must not leave ffprobe running
+        if proc.returncode is None:
+            proc.kill()
+            await proc.wait()
+        raise
+    if proc.returncode != 0:
+        raise RuntimeError(f"ffprobe failed: {stderr.decode(errors='replace')}")
+
+    data = json.loads(stdout or b"{}")
+    info = MediaInfo()
+
+    duration = data.get("format", {}).get("duration")
+    if duration is not None:
+        try:
+            info.duration = float(duration)
+        except ValueError:
+            pass
+
+    seen_video = False
+    for stream in data.get("streams", []):
+        if stream.get("codec_type") == "audio":
+            info.has_audio = True
+        if stream.get("codec_type") != "video" or seen_video:
+            continue
+        seen_video = True
+        info.width = stream.get("width")
+        info.height = stream.get("height")
+        rotation = stream.get("tags", {}).get("rotate")
+        for side_data in stream.get("side_data_list", []):
+            if "rotation" in side_data:
+                rotation = side_data["rotation"]
+        try:
+            info.rotation = abs(int(float(rotation or 0)))
+        except ValueError:
+            pass
+        if info.duration is None and stream.get("duration") is not None:
+            info.duration = float(stream["duration"])
+
+    return info
+
+
+async def has_encoder(name: str) -> bool:
+    """Return True if the FFmpeg binary in use provides encoder ``name``."""
+    global _encoders
+    if _encoders is None:
+        proc = await asyncio.create_subprocess_exec(
+            get_ffmpeg(), "-hide_banner", "-encoders",
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+        )
+        stdout, _ = await proc.communicate()
+        found: set[str] = set()
+        for line in stdout.decode(errors="replace").splitlines():
+            parts = line.split()
+            # Encoder lines look like " V....D libx264   libx264 H.264 ..."
+            if len(parts) >= 2 and len(parts[0]) == 6 and parts[0][0] in "VAS":
+                found.add(parts[1])
+        _encoders = found
+    return name in _encoders
@@ -0,0 +1,222 @@
+"""Process-wide cache of loaded rembg/ONNX sessions.
+
+``rembg.new_session`` reloads and re-optimizes the model graph on every call
+(~170 MB for u2net), which costs seconds per job. Sessions are kept here
+keyed by model name, with an LRU cap on how many stay resident
+(``VIMIX_MAX_LOADED_MODELS``, default 2).
+
+Set ``VIMIX_WARM_MODELS`` (comma-separated, e.g. ``u2net,u2netp``) to load
+models in the background at startup.
+
+``predict_masks`` runs several images through one ONNX session call
+(``VIMIX_ONNX_BATCH_SIZE`` frames per run, default 4) instead of one
+``remove()`` call per image.
+
+All rembg/pymatting work must run on the ``onnx-serial`` executor
+(``app.services.executors``): numba's workqueue
+threading layer is not threadsafe and crashes when called from multiple
+Python threads. Performance is not affected because ONNX Runtime manages
+its own internal thread pool for model inference.
+"""
+from __future__ import annotations
+
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any, Iterator
+
+import numpy as np
+from PIL import Image
+
+logger = logging.getLogger("vimix.models")
+
+# Preprocessing (mean, std, input size) of the models offered in the UI;
+# mirrors the corresponding rembg session classes.
+_MODEL_INPUTS: dict[str, tuple[tuple[float, ...], tuple[float, ...], tuple[int, int]]] = {
+    "u2net": ((0.485, 0.456, 0.406), (0.229, 0.224, 0.225), (320, 320)),
+    "u2netp": ((0.485, 0.456, 0.406), (0.229, 0.224, 0.225), (320, 320)),
+    "isnet-general-use": ((0.5, 0.5, 0.5), (1.0, 1.0, 1.0), (1024, 1024)),
+}
+
+# Upper bound on the float32 input + output tensors of one batched run, so
+# large-input models get smaller batches and peak memory stays bounded.
+_BATCH_MAX_BYTES = 512 * 1024 * 1024
+
+
+@dataclass
+class ModelMetrics:
+    loads: int = 0
+    load_seconds: float = 0.0
+    inferences: int = 0
+    inference_seconds: float = 0.0
+
+    def to_dict(self) -> dict:
+        return {
+            "loads": self.loads,
+            "load_seconds": round(self.load_seconds, 3),
+            "inferences": self.inferences,
+            "inference_seconds": round(self.inference_seconds, 3),
+            "avg_inference_ms": round(self.inference_seconds * 1000 / self.inferences, 1)
+            if self.inferences else 0,
+        }
+
+
+class SessionCache:
+    """LRU cache of rembg sessions with load/inference timing."""
+
+    def __init__(self, max_models: int) -> None:
+        self._max_models = max(1, max_models)
+        self._sessions: OrderedDict[str, Any] = OrderedDict()
+        self._metrics: dict[str, ModelMetrics] = {}
+        self._lock = threading.Lock()
+
+    def get(self, model_name: str) -> Any:
+        """Return a session for ``model_name``, loading it on first use.
+
+        Blocking — call it on the ``onnx-serial`` executor.
+        """
+        with self._lock:
+            session = self._sessions.get(model_name)
+            if session is not None:
+                self._sessions.move_to_end(model_name)
+                return session
+
+        from rembg import new_session
+
+        started = time.perf_counter()
+        session = new_session(model_name)
+        elapsed = time.perf_counter() - started
+        logger.info("Loaded model %s in %.2fs", model_name, elapsed)
+
+        with self._lock:
+            metrics = self._metrics.setdefault(model_name, ModelMetrics())
+            metrics.loads += 1
+            metrics.load_seconds += elapsed
+            self._sessions[model_name] = session
+            self._sessions.move_to_end(model_name)
+            while len(self._sessions) > self._max_models:
+                evicted, _ = self._sessions.popitem(last=False)
+                logger.info("Evicted model %s from session cache", evicted)
+        return session
+
+    @contextmanager
+    def time_inference(self, model_name: str, count: int = 1) -> Iterator[None]:
+        """Record the wall time of ``count`` inferences run inside the block."""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - started
+            with self._lock:
+                metrics = self._metrics.setdefault(model_name, ModelMetrics())
+                metrics.inferences += count
+                metrics.inference_seconds += elapsed
+
+    def warm_up(self, model_names: list[str]) -> None:
+        """Load the given models ahead of the first job. Blocking."""
+        for name in model_names:
+            try:
+                self.get(name)
+            except Exception:
+                logger.warning("Failed to warm up model %s", name, exc_info=True)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "max_models": self._max_models,
+                "loaded": list(self._sessions),
+                "models": {name: m.to_dict() for name, m in self._metrics.items()},
+            }
+
+
+# ---------------------------------------------------------------------------
+# Batched inference
+# ---------------------------------------------------------------------------
+
+
+def batch_size_for(session: Any, model_name: str) -> int:
+    """Return how many images to send per ONNX run for this session.
+
+    Falls back to 1 for models whose preprocessing is not known here or
+    whose graph has a fixed batch dimension.
+    """
+    if model_name not in _MODEL_INPUTS:
+        return 1
+    try:
+        batch_dim = session.inner_session.get_inputs()[0].shape[0]
+    except (AttributeError, IndexError):
+        return 1
+    if isinstance(batch_dim, int):
+        return 1
+
+    width, height = _MODEL_INPUTS[model_name][2]
+    per_image = 2 * 3 * width * height * 4
+    return max(1, min(_batch_size_from_env(), _BATCH_MAX_BYTES // per_image))
+
+
+def predict_masks(session: Any, model_name: str, images: list[Image.Image]) -> list[Image.Image]:
+    """Predict a foreground mask for every image, batching the ONNX run.
+
+    Produces the same masks as ``session.predict`` called once per image.
+    Blocking — call it on the ``onnx-serial`` executor.
+    """
+    if len(images) == 1 or model_name not in _MODEL_INPUTS:
+        return [session.predict(im)[0] for im in images]
+
+    mean, std, size = _MODEL_INPUTS[model_name]
+    batch = np.stack([_preprocess(im, mean, std, size) for im in images])
+    input_name = session.inner_session.get_inputs()[0].name
+    try:
+        outputs = session.inner_session.run(None, {input_name: batch})
+    except Exception:
+        logger.warning("Batched inference failed for %s, falling back to one image per run",
+                       model_name, exc_info=True)
+        return [session.predict(im)[0] for im in images]
+
+    masks: list[Image.Image] = []
+    for im, pred in zip(images, outputs[0][:, 0, :, :]):
+        lo, hi = float(pred.min()), float(pred.max())
+        pred = (pred - lo) / max(hi - lo, 1e-6)
+        mask = Image.fromarray((pred.clip(0, 1) * 255).astype("uint8"), mode="L")
+        masks.append(mask.resize(im.size, Image.Resampling.LANCZOS))
+    return masks
+
+
+def _preprocess(
+    im: Image.Image,
+    mean: tuple[float, ...],
+    std: tuple[float, ...],
+    size: tuple[int, int],
+) -> np.ndarray:
+    """Normalize one image into a CHW float32 tensor (same as rembg's normalize)."""
+    arr = np.asarray(im.convert("RGB").resize(size, Image.Resampling.LANCZOS), dtype=np.float32)
+    arr = arr / max(float(arr.max()), 1e-6)
+    arr = (arr - np.asarray(mean, dtype=np.float32)) / np.asarray(std, dtype=np.float32)
+    return arr.transpose((2, 0, 1))
+
+
+def _batch_size_from_env() -> int:
+    try:
+        return max(1, int(os.environ.get("VIMIX_ONNX_BATCH_SIZE", "4")))
+    except ValueError:
+        return 4
+
+
+def warm_models_from_env() -> list[str]:
+    """Return the model names listed in ``VIMIX_WARM_MODELS``."""
+    raw = os.environ.get("VIMIX_WARM_MODELS", "")
+    return [name.strip() for name in raw.split(",") if name.strip()]
+
+
+def _max_models_from_env() -> int:
+    try:
+        return int(os.environ.get("VIMIX_MAX_LOADED_MODELS", "2"))
+    except ValueError:
+        return 2
+
+
+session_cache = SessionCache(_max_models_from_env())
@@ -0,0 +1,82 @@
+"""Opt-in process pool for CPU-bound Pillow / PyMuPDF work.
+
+Much of the image and PDF work runs Python-level loops that hold the GIL
+(per-page and per-xref loops), so thread pools stop scaling long before the
+core count. With ``VIMIX_CPU_BACKEND=process`` the ``cpu`` executor in
+``app.services.executors`` is this pool of worker processes instead of
+threads.
+
+Workers are started up front by ``start()`` and import Pillow and PyMuPDF
+once, so the first job does not pay for process start-up or imports. Work
+functions receive file paths and plain options, never file contents, so
+only a few bytes are pickled per call.
+
+The pool uses the ``spawn`` start method: forking the server would copy its
+event loop, thread pools and ONNX sessions into every worker.
+"""
+from __future__ import annotations
+
+import logging
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from app.services.resources import available_cpus
+
+logger = logging.getLogger("vimix.process_pool")
+
+_pool: ProcessPoolExecutor | None = None
+
+
+def enabled() -> bool:
+    """Whether CPU-bound processors should run in worker processes."""
+    return os.environ.get("VIMIX_CPU_BACKEND", "thread").lower() == "process"
+
+
+def pool_size() -> int:
+    try:
+        return max(1, int(os.environ.get("VIMIX_PROCESS_WORKERS", available_cpus())))
+    except ValueError:
+        return available_cpus()
+
+
+def _warm_worker() -> None:
+    """Import the heavy libraries once per worker process."""
+    from PIL import Image
+    import pymupdf  # noqa: F401
+
+    Image.init()
+
+
+def _ready(_index: int) -> int:
+    return os.getpid()
+
+
+def get_pool() -> ProcessPoolExecutor:
+    """Return the shared process pool, creating it on first use."""
+    global _pool
+    if _pool is None:
+        _pool = ProcessPoolExecutor(
+            max_workers=pool_size(),
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_warm_worker,
+        )
+    return _pool
+
+
+def start() -> None:
+    """Spawn every worker now so they are warm before the first job. Blocking."""
+    if not enabled():
+        return
+    pool = get_pool()
+    size = pool_size()
+    # Workers are only spawned on demand; enough concurrent no-ops start all of them
+    pids = set(pool.map(_ready, range(size * 4)))
+    logger.info("Started %d warm worker process(es)", len(pids))
+
+
+def shutdown() -> None:
+    global _pool
+    if _pool is not None:
+        _pool.shutdown(wait=False, cancel_futures=True)
+        _pool = None
@@ -0,0 +1,70 @@
+"""Coalescing delivery of job progress events to SSE listeners.
+
+Processors may report progress far more often than any client can use it
+(``video-bg-remove`` reports every frame). Instead of queueing every event
+for every listener, each listener holds only the latest event per job: a
+slow consumer skips intermediate values and never builds a backlog, and
+publishing never blocks the event loop.
+
+``JobManager`` also throttles what it publishes per job: an update goes out
+once ``VIMIX_PROGRESS_INTERVAL`` seconds (default 0.25) have passed since
+the previous one, or when progress moved by at least
+``VIMIX_PROGRESS_DELTA`` percentage points (default 0, i.e. interval only).
+A skipped update is sent when the interval runs out, so listeners never
+stay on a stale value. Terminal events (completed, failed, cancelled) are
+always delivered and are never replaced by a later event.
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+from typing import Any
+
+logger = logging.getLogger("vimix.progress")
+
+TERMINAL_STATUSES = frozenset({"completed", "failed", "cancelled"})
+
+
+def _env_float(name: str, default: float) -> float:
+    env = os.environ.get(name)
+    if not env:
+        return default
+    try:
+        return max(0.0, float(env))
+    except ValueError:
+        logger.warning("Ignoring invalid %s=%r", name, env)
+        return default
+
+
+def min_interval() -> float:
+    """Minimum seconds between two published progress events of one job."""
+    return _env_float("VIMIX_PROGRESS_INTERVAL", 0.25)
+
+
+def min_delta() -> float:
+    """Progress change (in points) that is published regardless of the interval."""
+    return _env_float("VIMIX_PROGRESS_DELTA", 0.0)
+
+
+class ProgressListener:
+    """Mailbox holding the latest undelivered event of each subscribed job."""
+
+    def __init__(self) -> None:
+        self._pending: dict[str, dict[str, Any]] = {}
+        self._ready = asyncio.Event()
+
+    def push(self, job_id: str, event: dict[str, Any]) -> None:
+        """Replace the job's pending event with ``event``. Never blocks."""
+        current = self._pending.get(job_id)
+        if current is not None and current.get("status") in TERMINAL_STATUSES:
+            return
+        self._pending[job_id] = event
+        self._ready.set()
+
+    async def get(self) -> dict[str, dict[str, Any]]:
+        """Wait for events and return them keyed by job ID."""
+        await self._ready.wait()
+        self._ready.clear()
+        pending, self._pending = self._pending, {}
+        return pending
@@ -0,0 +1,62 @@
+"""Detect the CPU budget actually available to the backend.
+
+``os.cpu_count()`` reports every core on the host, which over-counts badly
+inside containers. This module takes the CPU affinity mask and any cgroup
+CPU quota into account so pool sizes and concurrency limits match what the
+process is really allowed to use.
+
+Set ``VIMIX_CPUS`` to override the detected value.
+"""
+from __future__ import annotations
+
+import math
+import os
+from pathlib import Path
+
+_CGROUP_V2_CPU_MAX = Path("/sys/fs/cgroup/cpu.max")
+_CGROUP_V1_QUOTA = Path("/sys/fs/cgroup/cpu/cpu.cfs_quota_us")
+_CGROUP_V1_PERIOD = Path("/sys/fs/cgroup/cpu/cpu.cfs_period_us")
+
+
+def _affinity_cpus() -> int:
+    """Return the number of CPUs in this process's affinity mask."""
+    if hasattr(os, "sched_getaffinity"):
+        try:
+            return len(os.sched_getaffinity(0))
+        except OSError:
+            pass
+    return os.cpu_count() or 1
+
+
+def _cgroup_quota_cpus() -> float | None:
+    """Return the cgroup CPU quota in CPUs, or None when unlimited/unknown."""
+    try:
+        if _CGROUP_V2_CPU_MAX.is_file():
+            quota, _, period = _CGROUP_V2_CPU_MAX.read_text().strip().partition(" ")
+            if quota != "max" and period:
+                return int(quota) / int(period)
+            return None
+        if _CGROUP_V1_QUOTA.is_file() and _CGROUP_V1_PERIOD.is_file():
+            quota_us = int(_CGROUP_V1_QUOTA.read_text().strip())
+            period_us = int(_CGROUP_V1_PERIOD.read_text().strip())
+            if quota_us > 0 and period_us > 0:
+                return quota_us / period_us
+    except (OSError, ValueError):
+        pass
+    return None
+
+
+def available_cpus() -> int:
+    """Return the number of CPUs this process can actually use (at least 1)."""
+    env = os.environ.get("VIMIX_CPUS")
+    if env:
+        try:
+            return max(1, int(env))
+        except ValueError:
+            pass
+
+    cpus = _affinity_cpus()
+    quota = _cgroup_quota_cpus()
+    if quota is not None:
+        cpus = min(cpus, math.ceil(quota))
+    return max(1, cpus)
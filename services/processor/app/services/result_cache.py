@@ -0,0 +1,200 @@
+"""Content-addressed cache of processor results.
+
+Entries are keyed on the input content hash, the processor id and the
+normalized options, and live in ``CACHE_DIR/<key>/``. The directory layout
+is the index, so the cache survives restarts: on startup existing entries
+are picked up with their mtime as the last-used time.
+
+The total size is capped (``VIMIX_CACHE_MAX_BYTES``, default 2 GB; ``0``
+disables the cache) and the least recently used entries are evicted first.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import shutil
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from app.services.file_manager import CACHE_DIR
+from app.services.local_paths import copy_file
+
+logger = logging.getLogger("vimix.cache")
+
+DEFAULT_MAX_BYTES = 2 * 1024 ** 3
+
+
+@dataclass
+class CacheEntry:
+    key: str
+    path: Path
+    size: int
+
+
+def _link_or_copy(src: Path, dest: Path) -> None:
+    """Hardlink ``src`` to ``dest``, copying when linking is not possible."""
+    try:
+        os.link(src, dest)
+    except OSError:
+        shutil.copy2(src, dest)
+
+
+class ResultCache:
+    """Size-capped LRU cache of result files on disk."""
+
+    def __init__(self, root: Path, max_bytes: int) -> None:
+        self._root = root
+        self._max_bytes = max_bytes
+        self._entries: OrderedDict[str, CacheEntry] = OrderedDict()
+        self._total = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        if self.enabled:
+            self._load()
+
+    @property
+    def enabled(self) -> bool:
+        return self._max_bytes > 0
+
+    @staticmethod
+    def key_for(input_hash: str, processor_id: str, options: dict[str, Any]) -> str:
+        """Build the cache key for an input, processor and normalized options."""
+        payload = json.dumps(
+            {
+                "input": input_hash,
+                "processor": processor_id,
+                "options": {k: str(v) for k, v in options.items()},
+            },
+            sort_keys=True,
+        )
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    def get(self, key: str) -> Path | None:
+        """Return the cached result path for ``key`` and mark it recently used."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or not entry.path.is_file():
+                if entry is not None:
+                    self._drop(key)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+        try:
+            os.utime(entry.path.parent)
+        except OSError:
+            pass
+        return entry.path
+
+    def put(self, key: str, result: Path, link: bool = True) -> None:
+        """Store ``result`` under ``key`` and evict old entries.
+
+        The entry is a hardlink to ``result`` where possible. Pass
+        ``link=False`` for a file the caller may change later (a result
+        delivered to a local output): the entry is then a copy, reflinked
+        where the filesystem allows. Blocking — call it from an executor
+        when running on the event loop.
+        """
+        if not self.enabled or not result.is_file():
+            return
+        size = result.stat().st_size
+        if size > self._max_bytes:
+            return
+
+        entry_dir = self._root / key
+        tmp_dir = self._root / f".{key}.tmp"
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        tmp_dir.mkdir(parents=True)
+        if link:
+            _link_or_copy(result, tmp_dir / result.name)
+        else:
+            copy_file(result, tmp_dir / result.name)
+
+        with self._lock:
+            if key in self._entries:
+                shutil.rmtree(tmp_dir, ignore_errors=True)
+                return
+            shutil.rmtree(entry_dir, ignore_errors=True)
+            tmp_dir.rename(entry_dir)
+            self._entries[key] = CacheEntry(key, entry_dir / result.name, size)
+            self._total += size
+            self._evict()
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "enabled": self.enabled,
+                "entries": len(self._entries),
+                "size_bytes": self._total,
+                "max_bytes": self._max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+    def _load(self) -> None:
+        """Rebuild the in-memory index from the cache directory."""
+        self._root.mkdir(exist_ok=True)
+        found: list[tuple[float, CacheEntry]] = []
+        for entry_dir in self._root.iterdir():
+            if entry_dir.name.startswith("."):
+                shutil.rmtree(entry_dir, ignore_errors=True)
+                continue
+            files = [f for f in entry_dir.iterdir() if f.is_file()] if entry_dir.is_dir() else []
+            if len(files) != 1:
+                shutil.rmtree(entry_dir, ignore_errors=True)
+                continue
+            stat = files[0].stat()
+            found.append((entry_dir.stat().st_mtime, CacheEntry(entry_dir.name, files[0], stat.st_size)))
+
+        for _, entry in sorted(found, key=lambda item: item[0]):
+            self._entries[entry.key] = entry
+            self._total += entry.size
+        self._evict()
+
+    def _evict(self) -> None:
+        while self._total > self._max_bytes and self._entries:
+            key = next(iter(self._entries))
+            self._drop(key)
+            self.evictions += 1
+
+    def _drop(self, key: str) -> None:
+        entry = self._entries.pop(key)
+        self._total -= entry.size
+        shutil.rmtree(entry.path.parent, ignore_errors=True)
+
+
+def materialize(cached: Path, output_dir: Path) -> Path:
+    """Expose a cached result inside a job's output directory.
+
+    Hardlinks the artifact so the job keeps its result even if the entry is
+    evicted later; falls back to pointing at the cached file directly.
+    """
+    dest = output_dir / cached.name
+    try:
+        if not dest.exists():
+            os.link(cached, dest)
+        return dest
+    except OSError:
+        return cached
+
+
+def _max_bytes_from_env() -> int:
+    env = os.environ.get("VIMIX_CACHE_MAX_BYTES")
+    if not env:
+        return DEFAULT_MAX_BYTES
+    try:
+        return max(0, int(env))
+    except ValueError:
+        logger.warning("Ignoring invalid VIMIX_CACHE_MAX_BYTES=%r", env)
+        return DEFAULT_MAX_BYTES
+
+
+result_cache = ResultCache(CACHE_DIR, _max_bytes_from_env())
@@ -0,0 +1,225 @@
+"""Bounded job scheduler with one queue per resource class.
+
+Every processor declares a ``resource_class`` ("ffmpeg", "cpu", "pdf" or
+"onnx"). Each class has its own concurrency limit; jobs beyond the limit
+wait in FIFO order until a slot frees up instead of all starting at once.
+
+Jobs whose steps use different classes (pipelines) are submitted without
+a class and hold a ``slot()`` per step instead. Wait hooks tell the job
+manager when such a job is back in a queue, so it shows as queued rather
+than processing while a step waits.
+
+Default limits are derived from the CPU budget of the container (see
+``app.services.resources``) and can be overridden per class with
+``VIMIX_LIMIT_FFMPEG``, ``VIMIX_LIMIT_CPU``, ``VIMIX_LIMIT_PDF`` and
+``VIMIX_LIMIT_ONNX``.
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+from collections import deque
+from contextlib import asynccontextmanager, contextmanager
+from contextvars import ContextVar
+from typing import Any, AsyncIterator, Awaitable, Callable, Iterator
+
+from app.services.resources import available_cpus
+
+logger = logging.getLogger("vimix.scheduler")
+
+RESOURCE_CLASSES = ("ffmpeg", "cpu", "pdf", "onnx")
+
+# ID of the submitted job the current task runs, for slot() wait hooks
+_current_job: ContextVar[str | None] = ContextVar("vimix_current_job", default=None)
+
+
+def default_limits(cpus: int) -> dict[str, int]:
+    """Compute per-class concurrency limits for a given CPU budget."""
+    return {
+        # FFmpeg encoders are multi-threaded, a few at a time saturate the box
+        "ffmpeg": max(1, cpus // 4),
+        # Pillow / PyMuPDF work is mostly single-threaded per job
+        "cpu": max(2, cpus // 2),
+        "pdf": max(2, cpus // 2),
+        # rembg runs through a single thread and ONNX Runtime uses every core
+        "onnx": 1,
+    }
+
+
+def load_limits() -> dict[str, int]:
+    """Return the default limits with any ``VIMIX_LIMIT_<CLASS>`` overrides applied."""
+    limits = default_limits(available_cpus())
+    for cls in RESOURCE_CLASSES:
+        env = os.environ.get(f"VIMIX_LIMIT_{cls.upper()}")
+        if not env:
+            continue
+        try:
+            limits[cls] = max(1, int(env))
+        except ValueError:
+            logger.warning("Ignoring invalid VIMIX_LIMIT_%s=%r", cls.upper(), env)
+    return limits
+
+
+class JobScheduler:
+    """Run job coroutines with a per-resource-class concurrency limit."""
+
+    def __init__(self, limits: dict[str, int] | None = None) -> None:
+        self._limits = limits or load_limits()
+        self._running: dict[str, int] = {cls: 0 for cls in self._limits}
+        self._waiting: dict[str, deque[asyncio.Future]] = {cls: deque() for cls in self._limits}
+        self._tasks: dict[str, asyncio.Task] = {}
+        self._wait_hooks: list[Callable[[str, bool], None]] = []
+
+    @property
+    def limits(self) -> dict[str, int]:
+        return dict(self._limits)
+
+    def submit(
+        self,
+        job_id: str,
+        resource_class: str | None,
+        fn: Callable[..., Awaitable[Any]],
+        *args: Any,
+    ) -> asyncio.Task:
+        """Queue ``fn(*args)`` to run once a slot in ``resource_class`` is free.
+
+        With ``resource_class=None`` it starts right away and is expected to
+        take slots itself through ``slot()``.
+        """
+        if resource_class is not None and resource_class not in self._limits:
+            resource_class = "cpu"
+        task = asyncio.create_task(self._run(job_id, resource_class, fn, *args))
+        self._tasks[job_id] = task
+        task.add_done_callback(lambda _t: self._tasks.pop(job_id, None))
+        return task
+
+    async def cancel(self, job_id: str) -> bool:
+        """Cancel a queued or running job and wait until it has unwound.
+
+        A queued job simply leaves its queue. A running job gets
+        ``CancelledError`` at its current ``await``, which kills any child
+        process started through ``app.services.ffmpeg_runner`` and drops
+        executor work that has not started yet. Returns False if the job
+        has no task.
+        """
+        task = self._tasks.get(job_id)
+        if task is None or task.done():
+            return False
+        task.cancel()
+        await asyncio.wait({task})
+        return True
+
+    def add_wait_hook(self, hook: Callable[[str, bool], None]) -> None:
+        """Call ``hook(job_id, waiting)`` when a submitted job's ``slot()`` has to wait.
+
+        ``waiting`` is True when the job joins the queue and False once it
+        gets the slot; a job cancelled while waiting gets no second call.
+        """
+        self._wait_hooks.append(hook)
+
+    @asynccontextmanager
+    async def slot(self, resource_class: str) -> AsyncIterator[None]:
+        """Hold one slot in ``resource_class`` for the duration of the block."""
+        if resource_class not in self._limits:
+            resource_class = "cpu"
+        job_id = _current_job.get()
+        waits = job_id is not None and not self._is_free(resource_class)
+        if waits:
+            self._notify_wait(job_id, True)
+        await self._acquire(resource_class)
+        if waits:
+            self._notify_wait(job_id, False)
+        try:
+            yield
+        finally:
+            self._release(resource_class)
+
+    @contextmanager
+    def extra_slots(self, resource_class: str, count: int) -> Iterator[int]:
+        """Take up to ``count`` free slots in ``resource_class`` without waiting.
+
+        Lets a running job that can split its work (segment encoding) use
+        capacity nobody else is waiting for. Nothing is taken while jobs are
+        queued for the class. Yields the number of slots taken; they are
+        released when the block exits.
+        """
+        if resource_class not in self._limits:
+            resource_class = "cpu"
+        taken = 0
+        if not self._waiting[resource_class]:
+            taken = max(0, min(count, self._limits[resource_class] - self._running[resource_class]))
+            self._running[resource_class] += taken
+        try:
+            yield taken
+        finally:
+            for _ in range(taken):
+                self._release(resource_class)
+
+    def stats(self) -> dict[str, dict[str, int]]:
+        """Return limit, running and queued counts for every resource class."""
+        return {
+            cls: {
+                "limit": self._limits[cls],
+                "running": self._running[cls],
+                "queued": len(self._waiting[cls]),
+            }
+            for cls in self._limits
+        }
+
+    async def _run(
+        self, job_id: str, resource_class: str | None, fn: Callable[..., Awaitable[Any]], *args: Any
+    ) -> None:
+        _current_job.set(job_id)
+        try:
+            if resource_class is None:
+                await fn(*args)
+            else:
+                async with self.slot(resource_class):
+                    await fn(*args)
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            logger.exception("Scheduled job crashed")
+
+    def _is_free(self, resource_class: str) -> bool:
+        """Whether a slot can be taken now without queueing."""
+        return (
+            not self._waiting[resource_class]
+            and self._running[resource_class] < self._limits[resource_class]
+        )
+
+    def _notify_wait(self, job_id: str, waiting: bool) -> None:
+        for hook in self._wait_hooks:
+            hook(job_id, waiting)
+
+    async def _acquire(self, resource_class: str) -> None:
+        if self._is_free(resource_class):
+            self._running[resource_class] += 1
+            return
+
+        waiting = self._waiting[resource_class]
+        fut: asyncio.Future = asyncio.get_running_loop().create_future()
+        waiting.append(fut)
+        try:
+            await fut
+        except asyncio.CancelledError:
+            if fut.done() and not fut.cancelled():
+                # The slot was handed to us just before cancellation; pass it on
+                self._release(resource_class)
+            elif fut in waiting:
+                waiting.remove(fut)
+            raise
+
+    def _release(self, resource_class: str) -> None:
+        waiting = self._waiting[resource_class]
+        while waiting:
+            fut = waiting.popleft()
+            if not fut.done():
+                # Hand the slot directly to the next waiter
+                fut.set_result(None)
+                return
+        self._running[resource_class] -= 1
+
+
+scheduler = JobScheduler()
@@ -0,0 +1,272 @@
+"""Segment-parallel video encoding.
+
+A single libx264 / libx265 / libvpx-vp9 process cannot keep a many-core
+machine busy, especially with slow presets. ``encode_segmented`` splits the
+input at keyframes (found with ffprobe), encodes the segments as separate
+FFmpeg processes with a bounded worker count, then joins them with the
+concat demuxer and muxes the audio from the original file in the same step.
+
+Segmenting is opt-in (``VIMIX_SEGMENT_ENCODING=1``): every segment starts
+with a fresh GOP and encoder rate control, so output is marginally larger at
+the same CRF and quality can dip at the joins. ``benchmarks/segment_encode.py``
+measures speed, size and SSIM against the single-process path.
+
+When enabled, it kicks in for inputs of at least
+``VIMIX_SEGMENT_MIN_DURATION`` seconds (default 60). Each segment encoder
+counts against the scheduler's ``ffmpeg`` limit: the job's own slot runs one,
+and further encoders only start on ``ffmpeg`` slots that are free and not
+waited for, up to ``VIMIX_SEGMENT_WORKERS`` in total (default a quarter of
+the CPU budget). Each encoder gets one slot's share of the CPUs as
+``-threads``. Without a spare slot the input is encoded in a single process.
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import shutil
+import time
+from pathlib import Path
+
+from app.processors.base import ProgressCallback
+from app.services.binary_paths import get_ffmpeg, get_ffprobe
+from app.services.executors import get_executor
+from app.services.ffmpeg_runner import PROGRESS_INTERVAL, run_ffmpeg
+from app.services.resources import available_cpus
+from app.services.scheduler import scheduler
+
+logger = logging.getLogger("vimix.segments")
+
+# Shortest segment worth a separate encoder process
+MIN_SEGMENT_SECONDS = 10
+# Segments per worker, so one slow segment does not leave the others idle
+SEGMENTS_PER_WORKER = 2
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return int(os.environ.get(name, default))
+    except ValueError:
+        return default
+
+
+def segment_workers() -> int:
+    """Most segments encoded at the same time, spare ``ffmpeg`` slots permitting."""
+    return max(1, _env_int("VIMIX_SEGMENT_WORKERS", available_cpus() // 4))
+
+
+def segmentation_enabled(duration: float | None) -> bool:
+    """Whether an input of ``duration`` seconds should be encoded in segments."""
+    if os.environ.get("VIMIX_SEGMENT_ENCODING", "0") != "1":
+        return False
+    if duration is None or duration < _env_int("VIMIX_SEGMENT_MIN_DURATION", 60):
+        return False
+    return segment_workers() >= 2
+
+
+async def keyframe_times(path: Path) -> list[float]:
+    """Return the timestamps of the first video stream's keyframes.
+
+    Times are relative to the container's start time, like input-side
+    ``-ss``. Reads packet flags only, so the video is not decoded.
+    """
+    proc = await asyncio.create_subprocess_exec(
+        get_ffprobe(),
+        "-v", "error",
+        "-select_streams", "v:0",
+        "-show_entries", "packet=pts_time,flags:format=start_time",
+        "-of", "csv",
+        str(path),
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE,
+    )
+    try:
+        stdout, stderr = await proc.communicate()
+    except BaseException:
+        # A cancelled job must not leave ffprobe running
+        if proc.returncode is None:
+            proc.kill()
+            await proc.wait()
+        raise
+    if proc.returncode != 0:
+        raise RuntimeError(f"ffprobe failed: {stderr.decode(errors='replace')}")
+    return _parse_keyframes(stdout.decode(errors="replace"))
+
+
+def _parse_keyframes(output: str) -> list[float]:
+    """Keyframe times from ffprobe's ``packet``/``format`` CSV, shifted by ``start_time``."""
+    times: list[float] = []
+    start = 0.0
+    for line in output.splitlines():
+        section, _, rest = line.partition(",")
+        if section == "format":
+            try:
+                start = float(rest)
+            except ValueError:
+                pass
+            continue
+        pts, _, flags = rest.partition(",")
+        if section != "packet" or "K" not in flags:
+            continue
+        try:
+            times.append(float(pts))
+        except ValueError:
+            continue
+    return sorted(t - start for t in times)
+
+
+def plan_segments(
+    keyframes: list[float], duration: float, count: int, min_length: float = MIN_SEGMENT_SECONDS
+) -> list[tuple[float, float]]:
+    """Pick up to ``count`` keyframe-aligned segments of similar length.
+
+    Returns ``(start, length)`` pairs covering ``[0, duration]``.
+    """
+    target = max(duration / max(count, 1), min_length)
+    starts = [0.0]
+    for kf in keyframes:
+        if kf - starts[-1] >= target and duration - kf >= min_length / 2:
+            starts.append(kf)
+    ends = starts[1:] + [duration]
+    return [(start, end - start) for start, end in zip(starts, ends)]
+
+
+async def encode_segmented(
+    input_path: Path,
+    output_file: Path,
+    video_args: list[str],
+    audio_args: list[str],
+    output_args: list[str],
+    duration: float | None,
+    on_progress: ProgressCallback,
+    *,
+    message: str = "Encoding",
+    error: str = "FFmpeg failed",
+) -> bool:
+    """Encode ``input_path`` in parallel segments.
+
+    ``video_args`` are the video encoder/filter options, ``audio_args`` the
+    audio options (``["-an"]`` to drop audio) and ``output_args`` any muxer
+    options for the final file. Returns False without doing anything when
+    the input is not worth splitting or no ``ffmpeg`` slot is spare; the
+    caller then runs its usual single-process command in its own slot.
+    """
+    if not segmentation_enabled(duration):
+        return False
+    # The caller's slot runs one encoder, spare slots run the others
+    with scheduler.extra_slots("ffmpeg", segment_workers() - 1) as extra:
+        if extra == 0:
+            return False
+        return await _encode_segments(
+            input_path, output_file, video_args, audio_args, output_args, duration,
+            on_progress, extra + 1, message, error,
+        )
+
+
+async def _encode_segments(
+    input_path: Path,
+    output_file: Path,
+    video_args: list[str],
+    audio_args: list[str],
+    output_args: list[str],
+    duration: float,
+    on_progress: ProgressCallback,
+    workers: int,
+    message: str,
+    error: str,
+) -> bool:
+    try:
+        keyframes = await keyframe_times(input_path)
+    except RuntimeError:
+        return False
+    segments = plan_segments(keyframes, duration, workers * SEGMENTS_PER_WORKER)
+    if len(segments) < 2:
+        return False
+
+    seg_dir = output_file.parent / "segments"
+    seg_dir.mkdir(exist_ok=True)
+    threads = max(1, available_cpus() // scheduler.limits["ffmpeg"])
+    limit = asyncio.Semaphore(workers)
+    done = [0.0] * len(segments)
+    started = time.monotonic()
+    last_emit = 0.0
+
+    async def report() -> None:
+        nonlocal last_emit
+        now = time.monotonic()
+        if now - last_emit < PROGRESS_INTERVAL:
+            return
+        last_emit = now
+        frac = min(1.0, sum(done) / duration)
+        text = f"{message} – {frac * 100:.0f}% ({len(segments)} segments, {workers} in parallel"
+        if frac > 0:
+            text += f", ETA {int((now - started) * (1 - frac) / frac)}s"
+        await on_progress(round(10 + frac * 85, 1), text + ")")
+
+    async def encode(index: int, start: float, length: float) -> Path:
+        dest = seg_dir / f"seg_{index:04d}.nut"
+
+        async def seg_progress(pct: float, _msg: str) -> None:
+            done[index] = pct / 100 * length
+            await report()
+
+        async with limit:
+            await run_ffmpeg(
+                [
+                    get_ffmpeg(), "-hide_banner", "-loglevel", "error",
+                    "-ss", f"{start:.6f}",
+                    "-i", str(input_path),
+                    "-t", f"{length:.6f}",
+                    "-map", "0:v:0",
+                    "-an",
+                    *video_args,
+                    "-threads", str(threads),
+                    "-y", str(dest),
+                ],
+                on_progress=seg_progress,
+                duration=length,
+                start_pct=0,
+                end_pct=100,
+                error=error,
+            )
+        done[index] = length
+        return dest
+
+    logger.info(
+        "Encoding %s in %d segments with %d workers", input_path.name, len(segments), workers
+    )
+    tasks = [asyncio.ensure_future(encode(i, start, length)) for i, (start, length) in enumerate(segments)]
+    try:
+        parts = await asyncio.gather(*tasks)
+
+        await on_progress(95, f"{message} – joining {len(parts)} segments...")
+        concat_list = seg_dir / "concat.txt"
+        # Explicit durations keep the joins gapless: the demuxer would otherwise
+        # infer them from timestamps shifted by the encoder's B-frame delay
+        concat_list.write_text("".join(
+            f"file '{part.name}'\nduration {length:.6f}\n"
+            for part, (_, length) in zip(parts, segments)
+        ))
+        cmd = [
+            get_ffmpeg(), "-hide_banner", "-loglevel", "error",
+            "-f", "concat", "-safe", "0", "-i", str(concat_list),
+            "-i", str(input_path),
+            "-map", "0:v:0",
+        ]
+        if audio_args != ["-an"]:
+            # One audio stream, like the single-process command
+            cmd += ["-map", "1:a:0?"]
+        cmd += ["-c:v", "copy", *audio_args, *output_args, "-y", str(output_file)]
+        await run_ffmpeg(cmd, error=error)
+    except BaseException:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        raise
+    finally:
+        await asyncio.get_running_loop().run_in_executor(get_executor("io"), shutil.rmtree, seg_dir, True)
+
+    logger.info(
+        "Segmented encode of %s took %.1fs", input_path.name, time.monotonic() - started
+    )
+    return True
@@ -0,0 +1,65 @@
+"""Encode several outputs from a single decode of one input.
+
+Each output is described by a ``SharedOutput``: a filter chain for the
+video and/or audio stream and the encoder arguments of its file.
+``build_command`` decodes the input once, fans its first video and audio
+stream out with ``split`` / ``asplit`` and runs every chain and encoder in
+the same FFmpeg process, instead of one process (and one decode) per
+output.
+
+Processors that can be part of such a command implement
+``shared_output(options, info)``; see ``app.processors.video_bundle``.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from app.services.binary_paths import get_ffmpeg
+
+
+@dataclass
+class SharedOutput:
+    filename: str
+    # Encoder and muxer arguments for this file
+    args: list[str] = field(default_factory=list)
+    # Filter chains applied to the decoded streams: "" passes the stream
+    # through unchanged and None leaves it out. Chains may contain several
+    # ";"-separated segments; their internal labels must be unique within
+    # the command.
+    video: str | None = None
+    audio: str | None = None
+    # Seconds of media this output covers, if it is only part of the input
+    length: float | None = None
+
+
+def build_command(input_path: Path, output_dir: Path, outputs: list[SharedOutput]) -> list[str]:
+    """Return one FFmpeg command line that writes every output to ``output_dir``."""
+    video_count = sum(1 for o in outputs if o.video is not None)
+    audio_count = sum(1 for o in outputs if o.audio is not None)
+
+    graph: list[str] = []
+    if video_count:
+        graph.append(f"[0:v:0]split={video_count}" + "".join(f"[v{i}]" for i in range(video_count)))
+    if audio_count:
+        graph.append(f"[0:a:0]asplit={audio_count}" + "".join(f"[a{i}]" for i in range(audio_count)))
+
+    output_args: list[str] = []
+    video_index = audio_index = 0
+    for index, output in enumerate(outputs):
+        if output.video is not None:
+            graph.append(f"[v{video_index}]{output.video or 'null'}[out{index}v]")
+            output_args += ["-map", f"[out{index}v]"]
+            video_index += 1
+        if output.audio is not None:
+            graph.append(f"[a{audio_index}]{output.audio or 'anull'}[out{index}a]")
+            output_args += ["-map", f"[out{index}a]"]
+            audio_index += 1
+        output_args += [*output.args, "-y", str(output_dir / output.filename)]
+
+    return [
+        get_ffmpeg(), "-hide_banner", "-loglevel", "error",
+        "-i", str(input_path),
+        "-filter_complex", ";".join(graph),
+        *output_args,
+    ]
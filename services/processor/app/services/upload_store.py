@@ -0,0 +1,219 @@
+"""Reusable uploads: upload a file once, run any number of jobs on it.
+
+``POST /uploads`` stores a file under ``SHARED_UPLOADS_DIR/<upload_id>/``,
+where the upload ID is the SHA-256 of its content; uploading the same
+content again returns the existing upload, under the filename it was first
+uploaded with. Jobs created with ``upload_id``
+read the stored file in place and reuse its hash for the result cache, so
+nothing is copied or hashed again per job.
+
+Each job holds a reference to its upload until it finishes. An upload is
+only deleted once no job references it: after ``max_age`` seconds without
+use by the periodic cleanup, or right away (or when its last job finishes)
+after ``DELETE /uploads/{id}``; from then on no new job can use it, unless
+the same content is uploaded again. Like the result cache, the directory layout
+is the index, so uploads survive restarts with their mtime as last use.
+"""
+from __future__ import annotations
+
+import hashlib
+import os
+import shutil
+import threading
+import time
+import uuid
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, BinaryIO
+
+from app.services.file_manager import CHUNK_SIZE, SHARED_UPLOADS_DIR, SavedUpload
+
+
+def _isoformat(timestamp: float) -> str:
+    return datetime.fromtimestamp(timestamp, timezone.utc).isoformat()
+
+
+@dataclass
+class Upload:
+    id: str
+    path: Path
+    size: int
+    created: float = field(default_factory=time.time)
+    last_used: float = field(default_factory=time.time)
+    # IDs of unfinished jobs reading this upload
+    job_ids: set[str] = field(default_factory=set)
+    delete_requested: bool = False
+
+    @property
+    def filename(self) -> str:
+        return self.path.name
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "id": self.id,
+            "filename": self.filename,
+            "size": self.size,
+            "jobs": len(self.job_ids),
+            "created_at": _isoformat(self.created),
+        }
+
+    def as_input(self) -> SavedUpload:
+        return SavedUpload(path=self.path, size=self.size, sha256=self.id)
+
+
+class UploadStore:
+    """Registry of shared uploads with per-job reference counts."""
+
+    def __init__(self, root: Path) -> None:
+        self._root = root
+        self._uploads: dict[str, Upload] = {}
+        # Reverse index from job ID to the uploads it references
+        self._uploads_of: dict[str, list[str]] = {}
+        self._lock = threading.Lock()
+        self._load()
+
+    def _load(self) -> None:
+        for d in self._root.iterdir():
+            if not d.is_dir():
+                continue
+            if d.name.startswith("."):
+                # Incomplete upload from a previous run
+                shutil.rmtree(d, ignore_errors=True)
+                continue
+            files = [f for f in d.iterdir() if f.is_file()]
+            if len(files) != 1:
+                continue
+            stat = files[0].stat()
+            self._uploads[d.name] = Upload(
+                id=d.name, path=files[0], size=stat.st_size, created=stat.st_mtime, last_used=stat.st_mtime,
+            )
+
+    def save(self, filename: str, src: BinaryIO) -> Upload:
+        """Store an uploaded file object, hashing it while it is written.
+
+        Returns the existing upload, with its original filename, if the same
+        content was uploaded before; this also cancels a requested deletion.
+        Blocking — call it from an executor when running on the event loop.
+        """
+        tmp_dir = self._root / f".{uuid.uuid4().hex}"
+        tmp_dir.mkdir()
+        stale_dir = self._root / f".{uuid.uuid4().hex}"
+        try:
+            dest = tmp_dir / Path(filename).name
+            digest = hashlib.sha256()
+            size = 0
+            with open(dest, "wb") as out:
+                while True:
+                    chunk = src.read(CHUNK_SIZE)
+                    if not chunk:
+                        break
+                    digest.update(chunk)
+                    out.write(chunk)
+                    size += len(chunk)
+            upload_id = digest.hexdigest()
+            with self._lock:
+                upload = self._uploads.get(upload_id)
+                if upload is None:
+                    target = self._root / upload_id
+                    if target.exists():
+                        # Left over by a deleted or expired upload whose directory
+                        # is not removed yet, or not adopted by _load
+                        os.rename(target, stale_dir)
+                    os.rename(tmp_dir, target)
+                    upload = Upload(id=upload_id, path=self._root / upload_id / dest.name, size=size)
+                    self._uploads[upload_id] = upload
+                upload.last_used = time.time()
+                upload.delete_requested = False
+                return upload
+        finally:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+            shutil.rmtree(stale_dir, ignore_errors=True)
+
+    def get(self, upload_id: str) -> Upload | None:
+        return self._uploads.get(upload_id)
+
+    def id_for_path(self, path: Path) -> str | None:
+        """The upload a job input path belongs to, if any."""
+        if path.parent.parent == self._root and path.parent.name in self._uploads:
+            return path.parent.name
+        return None
+
+    def acquire(self, upload_id: str, job_id: str) -> Upload:
+        """Reference an upload from a job until the job finishes.
+
+        Raises KeyError if the upload does not exist (anymore) or its
+        deletion was requested.
+        """
+        with self._lock:
+            upload = self._uploads[upload_id]
+            if upload.delete_requested:
+                raise KeyError(upload_id)
+            upload.job_ids.add(job_id)
+            upload.last_used = time.time()
+            self._uploads_of.setdefault(job_id, []).append(upload_id)
+            return upload
+
+    def release(self, job_id: str) -> list[Path]:
+        """Drop a finished job's references.
+
+        Returns the directories of uploads that were waiting for deletion
+        and are now unreferenced; callers are expected to delete them.
+        """
+        freed: list[Path] = []
+        with self._lock:
+            for upload_id in self._uploads_of.pop(job_id, []):
+                upload = self._uploads.get(upload_id)
+                if upload is None:
+                    continue
+                upload.job_ids.discard(job_id)
+                upload.last_used = time.time()
+                if upload.delete_requested and not upload.job_ids:
+                    del self._uploads[upload_id]
+                    freed.append(upload.path.parent)
+        return freed
+
+    def delete(self, upload_id: str) -> Path | None:
+        """Delete an upload now if unreferenced, otherwise once its jobs finish.
+
+        Returns the directory to delete right away, if any. Raises KeyError
+        if the upload does not exist.
+        """
+        with self._lock:
+            upload = self._uploads[upload_id]
+            if upload.job_ids:
+                upload.delete_requested = True
+                return None
+            del self._uploads[upload_id]
+            return upload.path.parent
+
+    def collect_expired(self, max_age_seconds: float) -> list[Path]:
+        """Drop unreferenced uploads unused for max_age_seconds.
+
+        Returns their directories; callers are expected to delete them.
+        """
+        cutoff = time.time() - max_age_seconds
+        with self._lock:
+            expired = [
+                u for u in self._uploads.values() if not u.job_ids and u.last_used < cutoff
+            ]
+            for upload in expired:
+                del self._uploads[upload.id]
+        return [upload.path.parent for upload in expired]
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "uploads": len(self._uploads),
+                "bytes": sum(u.size for u in self._uploads.values()),
+                "referenced": sum(1 for u in self._uploads.values() if u.job_ids),
+            }
+
+
+def remove_dirs(dirs: list[Path]) -> None:
+    """Delete upload directories returned by the store. Blocking."""
+    for d in dirs:
+        shutil.rmtree(d, ignore_errors=True)
+
+
+upload_store = UploadStore(SHARED_UPLOADS_DIR)
@@ -0,0 +1,102 @@
+"""Compare the thread and process backends on a batch of image jobs.
+
+Generates a batch of JPEGs (500 by default), then runs the same processor
+over all of them with ``VIMIX_CPU_BACKEND=thread`` and ``=process``, with
+as many jobs in flight as the ``cpu`` scheduler class allows, and prints
+wall time and throughput for each.
+
+Usage (from services/processor):
+
+    python -m benchmarks.cpu_backends
+    python -m benchmarks.cpu_backends --count 200 --processor image-convert \\
+        --options '{"format": "webp"}'
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import tempfile
+import time
+from pathlib import Path
+
+from PIL import Image
+
+from app.processors.registry import get_processor
+from app.services import executors, process_pool
+from app.services.scheduler import load_limits
+
+
+def _make_images(dest: Path, count: int, width: int, height: int) -> list[Path]:
+    base = Image.effect_noise((width, height), 48).convert("RGB")
+    gradient = Image.linear_gradient("L").resize((width, height)).convert("RGB")
+    paths = []
+    for i in range(count):
+        im = Image.blend(base, gradient, (i % 10) / 10)
+        path = dest / f"img_{i:04d}.jpg"
+        im.save(path, quality=95)
+        paths.append(path)
+    return paths
+
+
+async def _run(processor_id: str, images: list[Path], options: dict, backend: str, concurrency: int) -> dict:
+    os.environ["VIMIX_CPU_BACKEND"] = backend
+    # Drop the cached pools so the "cpu" executor is rebuilt for this backend
+    executors.shutdown()
+    if backend == "process":
+        await asyncio.get_running_loop().run_in_executor(None, process_pool.start)
+    processor = get_processor(processor_id)
+    limit = asyncio.Semaphore(concurrency)
+
+    async def on_progress(_pct: float, _msg: str) -> None:
+        pass
+
+    with tempfile.TemporaryDirectory() as tmp:
+        async def one(index: int, path: Path) -> None:
+            out = Path(tmp) / str(index)
+            out.mkdir()
+            async with limit:
+                await processor.process(path, out, on_progress, options)
+
+        started = time.perf_counter()
+        await asyncio.gather(*(one(i, p) for i, p in enumerate(images)))
+        elapsed = time.perf_counter() - started
+    cpu = executors.get_executor("cpu").stats()
+
+    return {
+        "backend": backend,
+        "jobs": len(images),
+        "seconds": round(elapsed, 2),
+        "jobs_per_second": round(len(images) / elapsed, 1),
+        "workers": cpu["workers"],
+        "utilization": cpu["utilization"],
+    }
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--count", type=int, default=500)
+    parser.add_argument("--size", default="1600x1200", help="WIDTHxHEIGHT of generated images")
+    parser.add_argument("--processor", default="image-compress")
+    parser.add_argument("--options", default="{}", help="processor options as JSON")
+    args = parser.parse_args()
+    width, height = (int(v) for v in args.size.split("x"))
+    options = json.loads(args.options)
+    concurrency = load_limits()["cpu"]
+
+    with tempfile.TemporaryDirectory() as src:
+        images = _make_images(Path(src), args.count, width, height)
+        results = [
+            await _run(args.processor, images, options, backend, concurrency)
+            for backend in ("thread", "process")
+        ]
+    executors.shutdown()
+
+    for row in results:
+        print(json.dumps(row))
+    print(json.dumps({"speedup": round(results[0]["seconds"] / results[1]["seconds"], 2)}))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,94 @@
+"""Compare segment-parallel encoding against a single FFmpeg process.
+
+Runs the same processor twice on one input — once with
+``VIMIX_SEGMENT_ENCODING=0`` and once with segmenting forced on — and prints
+wall time, output size and SSIM against the source for both. Like a job,
+each run holds an ``ffmpeg`` scheduler slot; ``--workers`` also raises the
+``ffmpeg`` limit (``VIMIX_LIMIT_FFMPEG``) so that many segment encoders can
+start.
+
+Usage (from services/processor):
+
+    python -m benchmarks.segment_encode input.mp4
+    python -m benchmarks.segment_encode input.mp4 --processor video-convert \\
+        --options '{"codec": "vp9"}' --workers 8
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import re
+import tempfile
+import time
+from pathlib import Path
+
+from app.processors.registry import get_processor
+from app.services.binary_paths import get_ffmpeg
+
+
+async def _ssim(reference: Path, encoded: Path) -> float | None:
+    proc = await asyncio.create_subprocess_exec(
+        get_ffmpeg(), "-hide_banner", "-nostats",
+        "-i", str(encoded), "-i", str(reference),
+        "-lavfi", "[0:v][1:v]scale2ref[a][b];[a][b]ssim",
+        "-f", "null", "-",
+        stdout=asyncio.subprocess.DEVNULL,
+        stderr=asyncio.subprocess.PIPE,
+    )
+    _, stderr = await proc.communicate()
+    match = re.search(r"All:([0-9.]+)", stderr.decode(errors="replace"))
+    return float(match.group(1)) if match else None
+
+
+async def _run(processor_id: str, input_path: Path, options: dict, segmented: bool) -> dict:
+    os.environ["VIMIX_SEGMENT_ENCODING"] = "1" if segmented else "0"
+    if segmented:
+        os.environ["VIMIX_SEGMENT_MIN_DURATION"] = "0"
+    processor = get_processor(processor_id)
+    # Imported late so the limits set in main() apply
+    from app.services.scheduler import scheduler
+
+    async def on_progress(_pct: float, _msg: str) -> None:
+        pass
+
+    with tempfile.TemporaryDirectory() as tmp:
+        started = time.perf_counter()
+        async with scheduler.slot(processor.resource_class):
+            result = await processor.process(input_path, Path(tmp), on_progress, options)
+        elapsed = time.perf_counter() - started
+        return {
+            "mode": "segmented" if segmented else "single",
+            "seconds": round(elapsed, 2),
+            "size_bytes": result.stat().st_size,
+            "ssim": await _ssim(input_path, result),
+        }
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("input", type=Path)
+    parser.add_argument("--processor", default="video-compress",
+                        choices=["video-compress", "video-convert"])
+    parser.add_argument("--options", default="{}", help="processor options as JSON")
+    parser.add_argument("--workers", type=int, help="override VIMIX_SEGMENT_WORKERS")
+    args = parser.parse_args()
+    if args.workers:
+        os.environ["VIMIX_SEGMENT_WORKERS"] = str(args.workers)
+        os.environ.setdefault("VIMIX_LIMIT_FFMPEG", str(args.workers))
+    options = json.loads(args.options)
+
+    single = await _run(args.processor, args.input, options, segmented=False)
+    segmented = await _run(args.processor, args.input, options, segmented=True)
+    for row in (single, segmented):
+        print(json.dumps(row))
+    print(json.dumps({
+        "speedup": round(single["seconds"] / segmented["seconds"], 2),
+        "size_change_pct": round((segmented["size_bytes"] / single["size_bytes"] - 1) * 100, 2),
+        "ssim_change": round((segmented["ssim"] or 0) - (single["ssim"] or 0), 5),
+    }))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,114 @@
+"""Measure backend import cost, per processor module.
+
+Every measurement runs in a fresh interpreter, so each module is timed
+with nothing imported yet. Reports the median of ``--repeat`` runs for:
+
+- ``app.main`` (what the sidecar pays before it can serve requests)
+- ``list_processors()`` (first ``GET /processors``)
+- each processor module on its own
+- ``rembg`` and its stack, which is now paid by the first
+  background-removal job instead of at startup
+
+and lists which heavy packages each step left loaded.
+
+With ``--health`` it instead launches the server with uvicorn and reports
+the time from launching the process to the first successful ``/health``
+response, together with the phase timings the server reports itself.
+
+Usage (from services/processor):
+
+    python -m benchmarks.startup
+    python -m benchmarks.startup --repeat 5
+    python -m benchmarks.startup --health
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import socket
+import statistics
+import subprocess
+import sys
+import time
+import urllib.request
+
+from app.processors.registry import processor_modules
+
+HEAVY_PACKAGES = ("rembg", "onnxruntime", "pymatting", "numba", "scipy", "skimage")
+
+_PROBE = """
+import json, sys, time
+started = time.perf_counter()
+{code}
+elapsed = time.perf_counter() - started
+heavy = [name for name in {heavy!r} if name in sys.modules]
+print(json.dumps({{"seconds": elapsed, "heavy": heavy}}))
+"""
+
+
+def _measure(code: str, repeat: int) -> dict:
+    runs = []
+    for _ in range(repeat):
+        out = subprocess.run(
+            [sys.executable, "-c", _PROBE.format(code=code, heavy=HEAVY_PACKAGES)],
+            capture_output=True, text=True, check=True,
+        )
+        runs.append(json.loads(out.stdout.strip().splitlines()[-1]))
+    return {
+        "ms": round(statistics.median(r["seconds"] for r in runs) * 1000, 1),
+        "heavy": runs[-1]["heavy"],
+    }
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _time_to_healthy(timeout: float = 60) -> dict:
+    port = _free_port()
+    url = f"http://127.0.0.1:{port}/health"
+    started = time.perf_counter()
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port), "--log-level", "warning"],
+    )
+    try:
+        while time.perf_counter() - started < timeout:
+            try:
+                with urllib.request.urlopen(url, timeout=1) as resp:
+                    body = json.loads(resp.read())
+                return {"ms": round((time.perf_counter() - started) * 1000, 1), "server": body.get("startup")}
+            except OSError:
+                time.sleep(0.01)
+        raise RuntimeError(f"No healthy response within {timeout}s")
+    finally:
+        server.terminate()
+        server.wait()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--health", action="store_true", help="time to first healthy response instead")
+    args = parser.parse_args()
+
+    if args.health:
+        for _ in range(args.repeat):
+            print(json.dumps({"step": "first /health", **_time_to_healthy()}))
+        return
+
+    steps = {
+        "app.main": "import app.main",
+        "list_processors()": "from app.processors.registry import list_processors; list_processors()",
+    }
+    for module in processor_modules():
+        steps[module] = f"import {module}"
+    steps["rembg (first bg-removal job)"] = "import rembg"
+
+    for name, code in steps.items():
+        print(json.dumps({"step": name, **_measure(code, args.repeat)}))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,44 @@
+from __future__ import annotations
+
+import io
+
+from fastapi import FastAPI, HTTPException
+from fastapi.testclient import TestClient
+
+from app.routers import jobs
+from app.services.file_manager import JOBS_DIR, UPLOADS_DIR
+from app.services.job_manager import job_manager
+
+
+def test_failed_input_discards_the_jobs_already_created(monkeypatch):
+    save_input = jobs._save_input
+    calls = []
+
+    async def failing_save_input(job_id, source):
+        calls.append(job_id)
+        if len(calls) == 2:
+            raise HTTPException(status_code=400, detail="broken input")
+        return await save_input(job_id, source)
+
+    monkeypatch.setattr(jobs, "_save_input", failing_save_input)
+    app = FastAPI()
+    app.include_router(jobs.router)
+    before = job_manager.job_ids()
+
+    with TestClient(app) as client:
+        response = client.post(
+            "/jobs/batch",
+            data={"processor_id": "image-convert"},
+            files=[
+                ("files", ("a.png", io.BytesIO(b"not really a png"), "image/png")),
+                ("files", ("b.png", io.BytesIO(b"not really a png"), "image/png")),
+                ("files", ("c.png", io.BytesIO(b"not really a png"), "image/png")),
+            ],
+        )
+
+    assert response.status_code == 400
+    assert len(calls) == 2
+    assert job_manager.job_ids() == before
+    for job_id in calls:
+        assert not (UPLOADS_DIR / job_id).exists()
+        assert not (JOBS_DIR / job_id).exists()
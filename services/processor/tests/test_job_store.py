@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+from app.services.job_manager import JobManager, JobStatus
+from app.services.job_store import JobStore
+
+
+def _reopen(path: Path) -> tuple[JobManager, list, JobStore]:
+    store = JobStore(path, flush_interval=60)
+    manager = JobManager()
+    interrupted = manager.attach_store(store)
+    return manager, interrupted, store
+
+
+def test_rows_round_trip_and_later_rows_win(tmp_path):
+    store = JobStore(tmp_path / "jobs.db")
+    manager = JobManager()
+    manager.attach_store(store)
+    job = manager.create("image-convert", "photo.png")
+    manager.record_input(job.id, "abc", 123)
+    manager.record_submission(job.id, {"format": "webp", "quality": 80}, [tmp_path / "photo.png"])
+    manager.record_output(job.id, None, tmp_path / "out")
+    batch = manager.create_batch("image-convert", [job.id])
+    manager.mark_failed(job.id, "boom")
+    store.close()
+
+    jobs, batches = JobStore(tmp_path / "jobs.db").load()
+    assert len(jobs) == 1
+    record = jobs[0]
+    assert record["id"] == job.id
+    assert record["status"] == "failed"
+    assert record["error"] == "boom"
+    assert record["input_hash"] == "abc"
+    assert record["input_size"] == 123
+    assert record["options"] == {"format": "webp", "quality": 80}
+    assert record["input_paths"] == [str(tmp_path / "photo.png")]
+    assert record["output_dir"] == str(tmp_path / "out")
+    assert batches == [{
+        "id": batch.id, "processor_id": "image-convert", "created": batch.created, "job_ids": [job.id],
+    }]
+
+
+def test_removed_jobs_and_empty_batches_are_deleted(tmp_path):
+    store = JobStore(tmp_path / "jobs.db")
+    manager = JobManager()
+    manager.attach_store(store)
+    kept = manager.create("pdf-merge", "2_files")
+    dropped = manager.create("image-convert", "a.png")
+    manager.create_batch("image-convert", [dropped.id])
+    store.flush()
+    manager.remove_job(dropped.id)
+    store.close()
+
+    jobs, batches = JobStore(tmp_path / "jobs.db").load()
+    assert [record["id"] for record in jobs] == [kept.id]
+    assert batches == []
+
+
+def test_restart_restores_finished_jobs_and_resumes_interrupted_ones(tmp_path):
+    db = tmp_path / "jobs.db"
+    present = tmp_path / "present.png"
+    present.write_bytes(b"data")
+    result = tmp_path / "result.webp"
+    result.write_bytes(b"data")
+
+    manager, _, store = _reopen(db)
+    done = manager.create("image-convert", "done.png")
+    manager.mark_completed(done.id, result)
+    lost = manager.create("image-convert", "lost.png")
+    manager.mark_completed(lost.id, tmp_path / "gone.webp")
+    running = manager.create("image-convert", "present.png")
+    manager.record_submission(running.id, {"format": "webp"}, [present])
+    manager.mark_processing(running.id)
+    orphan = manager.create("image-convert", "missing.png")
+    manager.record_submission(orphan.id, {}, [tmp_path / "missing.png"])
+    manager.mark_queued(orphan.id)
+    batch = manager.create_batch("image-convert", [done.id, running.id])
+    store.close()
+
+    restarted, interrupted, store = _reopen(db)
+    try:
+        assert [job.id for job in interrupted] == [running.id]
+        assert interrupted[0].options == {"format": "webp"}
+        assert restarted.get(done.id).status == JobStatus.COMPLETED
+        assert restarted.get(lost.id).status == JobStatus.FAILED
+        assert restarted.get(orphan.id).status == JobStatus.FAILED
+        assert restarted.get_batch(batch.id).job_ids == [done.id, running.id]
+        # Finished jobs are indexed for expiry again
+        assert set(restarted.collect_expired(-60)) == {done.id, lost.id, orphan.id}
+    finally:
+        store.close()
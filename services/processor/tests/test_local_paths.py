@@ -0,0 +1,110 @@
+from __future__ import annotations
+
+import os
+
+import pytest
+
+from app.services import local_paths
+from app.services.local_paths import deliver_result, resolve_input, resolve_output
+
+
+@pytest.fixture
+def root(tmp_path, monkeypatch):
+    allowed = tmp_path / "allowed"
+    allowed.mkdir()
+    (tmp_path / "outside").mkdir()
+    (tmp_path / "outside" / "secret.txt").write_text("secret")
+    monkeypatch.setenv("VIMIX_LOCAL_PATH_ROOTS", str(allowed))
+    return allowed
+
+
+def test_paths_under_a_root_are_accepted(root):
+    (root / "in.png").write_bytes(b"data")
+    assert resolve_input(str(root / "in.png")) == (root / "in.png").resolve()
+    assert resolve_output(str(root / "sub" / "out.png")) == (root / "sub" / "out.png").resolve()
+    assert resolve_output(str(root)) == root.resolve()
+
+
+def test_local_paths_are_disabled_without_roots(tmp_path, monkeypatch):
+    monkeypatch.delenv("VIMIX_LOCAL_PATH_ROOTS", raising=False)
+    (tmp_path / "in.png").write_bytes(b"data")
+    with pytest.raises(PermissionError, match="disabled"):
+        resolve_input(str(tmp_path / "in.png"))
+
+
+def test_relative_paths_are_rejected(root):
+    with pytest.raises(PermissionError, match="absolute"):
+        resolve_output("allowed/out.png")
+
+
+def test_dot_dot_cannot_leave_the_root(root):
+    with pytest.raises(PermissionError, match="outside"):
+        resolve_input(str(root / ".." / "outside" / "secret.txt"))
+    with pytest.raises(PermissionError, match="outside"):
+        resolve_output(str(root / ".." / "outside" / "out.png"))
+
+
+def test_symlinks_are_checked_where_they_point(root, tmp_path):
+    os.symlink(tmp_path / "outside" / "secret.txt", root / "link.txt")
+    os.symlink(tmp_path / "outside", root / "linked-dir")
+    with pytest.raises(PermissionError, match="outside"):
+        resolve_input(str(root / "link.txt"))
+    with pytest.raises(PermissionError, match="outside"):
+        resolve_output(str(root / "linked-dir" / "out.png"))
+
+
+def test_sibling_with_a_common_prefix_is_outside(root, tmp_path):
+    sibling = tmp_path / "allowed-not"
+    sibling.mkdir()
+    (sibling / "in.png").write_bytes(b"data")
+    with pytest.raises(PermissionError, match="outside"):
+        resolve_input(str(sibling / "in.png"))
+
+
+def test_missing_input_is_not_found(root):
+    with pytest.raises(FileNotFoundError):
+        resolve_input(str(root / "missing.png"))
+
+
+def test_deliver_moves_an_unshared_result(tmp_path):
+    result = tmp_path / "job" / "output.webp"
+    result.parent.mkdir()
+    result.write_bytes(b"result")
+    inode = result.stat().st_ino
+
+    dest = deliver_result(result, tmp_path / "out" / "photo.webp")
+    assert dest.read_bytes() == b"result"
+    assert dest.stat().st_ino == inode
+    assert not result.exists()
+
+
+def test_deliver_copies_a_result_linked_from_the_cache(tmp_path):
+    result = tmp_path / "output.webp"
+    result.write_bytes(b"result")
+    cached = tmp_path / "cached.webp"
+    os.link(result, cached)
+
+    dest = deliver_result(result, tmp_path / "photo.webp")
+    assert dest.read_bytes() == b"result"
+    assert dest.stat().st_ino != cached.stat().st_ino
+    assert cached.stat().st_nlink == 1
+
+
+def test_deliver_keeps_an_existing_file_unless_overwrite(tmp_path):
+    result = tmp_path / "output.webp"
+    result.write_bytes(b"new")
+    dest = tmp_path / "photo.webp"
+    dest.write_bytes(b"old")
+
+    with pytest.raises(FileExistsError):
+        deliver_result(result, dest)
+    assert dest.read_bytes() == b"old"
+    assert deliver_result(result, dest, overwrite=True).read_bytes() == b"new"
+
+
+def test_copy_file_falls_back_when_reflink_is_unavailable(tmp_path, monkeypatch):
+    monkeypatch.setattr(local_paths, "_reflink", lambda src, dest: False)
+    src = tmp_path / "src.bin"
+    src.write_bytes(b"data")
+    local_paths.copy_file(src, tmp_path / "dest.bin")
+    assert (tmp_path / "dest.bin").read_bytes() == b"data"
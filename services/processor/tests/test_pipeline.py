@@ -0,0 +1,116 @@
+from __future__ import annotations
+
+import pytest
+
+from app.processors.pipeline import _fold_trim, check_step_types, plan_stages
+
+
+def test_fold_trim_into_trim_combines_windows():
+    trim = {"start": 5, "duration": 20}
+    assert _fold_trim(trim, "video-trim", {"start": 2, "duration": 5}) == {
+        "start": 7, "duration": 5, "codec": "copy",
+    }
+    # The inner window is cut at the end of the first clip
+    assert _fold_trim(trim, "video-trim", {"start": 15, "duration": 30}) == {
+        "start": 20, "duration": 5, "codec": "copy",
+    }
+    assert _fold_trim(trim, "video-trim", {"start": 20}) is None
+
+
+def test_fold_trim_keeps_the_first_trims_re_encode():
+    trim = {"start": 0, "duration": 10, "codec": "h264", "quality": 70}
+    assert _fold_trim(trim, "video-trim", {"start": 1, "duration": 2}) == {
+        "start": 1, "duration": 2, "codec": "h264", "quality": 70,
+    }
+    # A re-encoding second trim keeps its own settings
+    assert _fold_trim(trim, "video-trim", {"start": 1, "duration": 2, "codec": "h265"}) == {
+        "start": 1, "duration": 2, "codec": "h265",
+    }
+
+
+def test_fold_trim_into_gif_and_thumbnail():
+    trim = {"start": 30, "duration": 10}
+    assert _fold_trim(trim, "video-to-gif", {"start": 8, "duration": 5, "fps": 12}) == {
+        "start": 38, "duration": 2, "fps": 12,
+    }
+    assert _fold_trim(trim, "video-thumbnail", {"time": 4, "format": "jpg"}) == {
+        "time": 34, "format": "jpg",
+    }
+    assert _fold_trim(trim, "video-thumbnail", {"time": 10}) is None
+    # Default trim window is the first 10 seconds
+    assert _fold_trim({}, "video-thumbnail", {"time": 3}) == {"time": 3}
+    assert _fold_trim(trim, "video-compress", {"quality": 60}) is None
+
+
+def test_plan_stages_folds_trims_into_one_stage():
+    stages = plan_stages([
+        {"processor_id": "video-trim", "options": {"start": 5, "duration": 20}},
+        {"processor_id": "video-trim", "options": {"start": 2, "duration": 10}},
+        {"processor_id": "video-to-gif", "options": {"start": 1, "duration": 4}},
+    ])
+    assert len(stages) == 1
+    assert stages[0].size == 3
+    assert stages[0].processor.id == "video-to-gif"
+    assert stages[0].steps[0][1] == {"start": 8, "duration": 4}
+
+
+def test_plan_stages_keeps_unfoldable_steps_apart():
+    stages = plan_stages([
+        {"processor_id": "video-trim", "options": {"start": 5, "duration": 20}},
+        {"processor_id": "video-compress", "options": {"quality": 60}},
+        {"processor_id": "video-thumbnail"},
+    ])
+    assert [stage.processor.id for stage in stages] == ["video-trim", "video-compress", "video-thumbnail"]
+    assert [stage.size for stage in stages] == [1, 1, 1]
+    assert stages[2].steps[0][1] == {}
+
+    stages = plan_stages([
+        {"processor_id": "video-trim", "options": {"duration": 5}},
+        {"processor_id": "video-thumbnail", "options": {"time": 8}},
+    ])
+    assert [stage.processor.id for stage in stages] == ["video-trim", "video-thumbnail"]
+
+
+def test_plan_stages_groups_pdf_edits_until_protect():
+    stages = plan_stages([
+        {"processor_id": "pdf-rotate", "options": {"angle": 90}},
+        {"processor_id": "pdf-watermark"},
+        {"processor_id": "pdf-protect"},
+        {"processor_id": "pdf-compress"},
+    ])
+    assert [[p.id for p, _ in stage.steps] for stage in stages] == [
+        ["pdf-rotate", "pdf-watermark", "pdf-protect"],
+        ["pdf-compress"],
+    ]
+    assert [stage.size for stage in stages] == [3, 1]
+    assert stages[0].label == " + ".join(p.label for p, _ in stages[0].steps)
+
+
+def test_check_step_types_rejects_an_unreadable_output():
+    with pytest.raises(ValueError, match=r"Step 2 \(.*\) does not accept the .mp4 output of step 1"):
+        check_step_types([
+            {"processor_id": "video-compress", "options": {}},
+            {"processor_id": "pdf-rotate", "options": {}},
+        ])
+    # A copied trim keeps the input's container, none of which is an image
+    with pytest.raises(ValueError, match="step 2"):
+        check_step_types([
+            {"processor_id": "video-trim", "options": {"codec": "copy"}},
+            {"processor_id": "video-thumbnail", "options": {"format": "png"}},
+            {"processor_id": "video-compress", "options": {}},
+        ])
+
+
+def test_check_step_types_accepts_possible_chains():
+    check_step_types([
+        {"processor_id": "video-trim", "options": {"codec": "copy"}},
+        {"processor_id": "video-compress", "options": {}},
+        {"processor_id": "video-thumbnail", "options": {"format": "jpg"}},
+        {"processor_id": "image-convert", "options": {"format": "webp"}},
+    ])
+    # pdf-split may produce a single PDF, so the next step is allowed
+    check_step_types([
+        {"processor_id": "pdf-split", "options": {"mode": "all_pages"}},
+        {"processor_id": "pdf-rotate", "options": {}},
+    ])
+    check_step_types([{"processor_id": "video-to-gif", "options": {}}])
@@ -0,0 +1,115 @@
+from __future__ import annotations
+
+import os
+from pathlib import Path
+
+from app.services.result_cache import ResultCache, materialize
+
+
+def _result(tmp_path: Path, name: str, size: int) -> Path:
+    path = tmp_path / "work" / name
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(b"x" * size)
+    return path
+
+
+def test_key_depends_on_input_processor_and_options():
+    key = ResultCache.key_for("abc", "image-convert", {"format": "png", "quality": 80})
+    assert key == ResultCache.key_for("abc", "image-convert", {"quality": "80", "format": "png"})
+    assert key != ResultCache.key_for("abd", "image-convert", {"format": "png", "quality": 80})
+    assert key != ResultCache.key_for("abc", "image-compress", {"format": "png", "quality": 80})
+    assert key != ResultCache.key_for("abc", "image-convert", {"format": "webp", "quality": 80})
+
+
+def test_put_then_get(tmp_path):
+    cache = ResultCache(tmp_path / "cache", 1000)
+    result = _result(tmp_path, "out.png", 10)
+    assert cache.get("k") is None
+
+    cache.put("k", result)
+    cached = cache.get("k")
+    assert cached == tmp_path / "cache" / "k" / "out.png"
+    assert cached.read_bytes() == result.read_bytes()
+    assert cache.stats() == {
+        "enabled": True,
+        "entries": 1,
+        "size_bytes": 10,
+        "max_bytes": 1000,
+        "hits": 1,
+        "misses": 1,
+        "evictions": 0,
+    }
+
+
+def test_least_recently_used_entry_is_evicted(tmp_path):
+    cache = ResultCache(tmp_path / "cache", 25)
+    cache.put("a", _result(tmp_path, "a.bin", 10))
+    cache.put("b", _result(tmp_path, "b.bin", 10))
+    assert cache.get("a") is not None
+
+    cache.put("c", _result(tmp_path, "c.bin", 10))
+    assert cache.get("b") is None
+    assert not (tmp_path / "cache" / "b").exists()
+    assert cache.get("a") is not None
+    assert cache.get("c") is not None
+    assert cache.stats()["evictions"] == 1
+    assert cache.stats()["size_bytes"] == 20
+
+
+def test_oversized_results_and_disabled_cache_store_nothing(tmp_path):
+    cache = ResultCache(tmp_path / "cache", 5)
+    cache.put("big", _result(tmp_path, "big.bin", 10))
+    assert cache.get("big") is None
+
+    disabled = ResultCache(tmp_path / "off", 0)
+    disabled.put("k", _result(tmp_path, "small.bin", 1))
+    assert not disabled.enabled
+    assert disabled.get("k") is None
+    assert not (tmp_path / "off").exists()
+
+
+def test_second_put_keeps_the_first_entry(tmp_path):
+    cache = ResultCache(tmp_path / "cache", 1000)
+    cache.put("k", _result(tmp_path, "first.bin", 10))
+    cache.put("k", _result(tmp_path, "second.bin", 20))
+    assert cache.get("k").name == "first.bin"
+    assert cache.stats()["size_bytes"] == 10
+
+
+def test_entry_whose_file_vanished_is_dropped(tmp_path):
+    cache = ResultCache(tmp_path / "cache", 1000)
+    cache.put("k", _result(tmp_path, "out.bin", 10))
+    (tmp_path / "cache" / "k" / "out.bin").unlink()
+    assert cache.get("k") is None
+    assert cache.stats()["entries"] == 0
+    assert cache.stats()["size_bytes"] == 0
+
+
+def test_index_is_rebuilt_from_disk_oldest_first(tmp_path):
+    root = tmp_path / "cache"
+    cache = ResultCache(root, 1000)
+    cache.put("old", _result(tmp_path, "old.bin", 10))
+    cache.put("new", _result(tmp_path, "new.bin", 10))
+    os.utime(root / "old", (1, 1))
+    # Leftovers of an interrupted put and a malformed entry
+    (root / ".partial.tmp").mkdir()
+    (root / "empty").mkdir()
+
+    reloaded = ResultCache(root, 15)
+    assert reloaded.get("old") is None
+    assert reloaded.get("new") is not None
+    assert not (root / ".partial.tmp").exists()
+    assert not (root / "empty").exists()
+
+
+def test_materialized_result_outlives_eviction(tmp_path):
+    cache = ResultCache(tmp_path / "cache", 15)
+    cache.put("a", _result(tmp_path, "a.bin", 10))
+    job_dir = tmp_path / "job"
+    job_dir.mkdir()
+
+    exposed = materialize(cache.get("a"), job_dir)
+    assert exposed == job_dir / "a.bin"
+    cache.put("b", _result(tmp_path, "b.bin", 10))
+    assert cache.get("a") is None
+    assert exposed.read_bytes() == b"x" * 10
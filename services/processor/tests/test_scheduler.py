@@ -0,0 +1,285 @@
+from __future__ import annotations
+
+import asyncio
+
+from app.services.scheduler import JobScheduler, default_limits
+
+
+def _run(coro):
+    return asyncio.run(coro)
+
+
+def test_default_limits_scale_with_cpus():
+    assert default_limits(1) == {"ffmpeg": 1, "cpu": 2, "pdf": 2, "onnx": 1}
+    assert default_limits(16) == {"ffmpeg": 4, "cpu": 8, "pdf": 8, "onnx": 1}
+
+
+def test_jobs_beyond_the_limit_wait_in_fifo_order():
+    async def scenario():
+        scheduler = JobScheduler({"ffmpeg": 2, "cpu": 1})
+        gates = {name: asyncio.Event() for name in "abcd"}
+        started: list[str] = []
+
+        async def job(name: str) -> None:
+            started.append(name)
+            await gates[name].wait()
+
+        for name in "abcd":
+            scheduler.submit(name, "ffmpeg", job, name)
+        await asyncio.sleep(0)
+        assert started == ["a", "b"]
+        assert scheduler.stats()["ffmpeg"] == {"limit": 2, "running": 2, "queued": 2}
+
+        gates["b"].set()
+        await asyncio.sleep(0.01)
+        assert started == ["a", "b", "c"]
+
+        gates["a"].set()
+        await asyncio.sleep(0.01)
+        assert started == ["a", "b", "c", "d"]
+
+        gates["c"].set()
+        gates["d"].set()
+        await asyncio.sleep(0.01)
+        assert scheduler.stats()["ffmpeg"] == {"limit": 2, "running": 0, "queued": 0}
+
+    _run(scenario())
+
+
+def test_released_slot_goes_to_the_waiter_not_a_newcomer():
+    async def scenario():
+        scheduler = JobScheduler({"cpu": 1})
+        order: list[str] = []
+        first_done = asyncio.Event()
+
+        async def first() -> None:
+            async with scheduler.slot("cpu"):
+                order.append("first")
+                await first_done.wait()
+
+        async def queued(name: str) -> None:
+            async with scheduler.slot("cpu"):
+                order.append(name)
+
+        tasks = [asyncio.ensure_future(first())]
+        await asyncio.sleep(0)
+        tasks.append(asyncio.ensure_future(queued("waiter")))
+        await asyncio.sleep(0)
+        first_done.set()
+        # Arrives after the release but before the waiter has resumed
+        tasks.append(asyncio.ensure_future(queued("newcomer")))
+        await asyncio.gather(*tasks)
+        assert order == ["first", "waiter", "newcomer"]
+
+    _run(scenario())
+
+
+def test_cancel_queued_job_leaves_the_queue():
+    async def scenario():
+        scheduler = JobScheduler({"cpu": 1})
+        gate = asyncio.Event()
+        ran: list[str] = []
+
+        async def job(name: str) -> None:
+            ran.append(name)
+            await gate.wait()
+
+        for name in ("running", "queued", "next"):
+            scheduler.submit(name, "cpu", job, name)
+        await asyncio.sleep(0)
+        assert await scheduler.cancel("queued") is True
+        assert scheduler.stats()["cpu"]["queued"] == 1
+
+        gate.set()
+        await asyncio.sleep(0.01)
+        assert ran == ["running", "next"]
+        assert await scheduler.cancel("queued") is False
+
+    _run(scenario())
+
+
+def test_cancel_running_job_frees_its_slot():
+    async def scenario():
+        scheduler = JobScheduler({"cpu": 1})
+        cancelled = asyncio.Event()
+        ran: list[str] = []
+
+        async def blocking() -> None:
+            try:
+                await asyncio.Event().wait()
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+
+        async def job() -> None:
+            ran.append("next")
+
+        scheduler.submit("blocking", "cpu", blocking)
+        scheduler.submit("next", "cpu", job)
+        await asyncio.sleep(0)
+        assert await scheduler.cancel("blocking") is True
+        assert cancelled.is_set()
+        await asyncio.sleep(0.01)
+        assert ran == ["next"]
+        assert scheduler.stats()["cpu"] == {"limit": 1, "running": 0, "queued": 0}
+
+    _run(scenario())
+
+
+def test_slot_handed_over_during_cancellation_is_passed_on():
+    async def scenario():
+        scheduler = JobScheduler({"cpu": 1})
+        ran: list[str] = []
+
+        async def job(name: str) -> None:
+            ran.append(name)
+
+        release = asyncio.Event()
+
+        async def holder() -> None:
+            async with scheduler.slot("cpu"):
+                await release.wait()
+
+        holding = asyncio.ensure_future(holder())
+        await asyncio.sleep(0)
+        scheduler.submit("victim", "cpu", job, "victim")
+        scheduler.submit("after", "cpu", job, "after")
+        await asyncio.sleep(0)
+
+        # The release hands the slot to "victim", which is cancelled before it resumes
+        release.set()
+        await asyncio.sleep(0)
+        assert holding.done()
+        await scheduler.cancel("victim")
+        await asyncio.sleep(0.01)
+        assert ran == ["after"]
+        assert scheduler.stats()["cpu"] == {"limit": 1, "running": 0, "queued": 0}
+
+    _run(scenario())
+
+
+def test_unknown_class_uses_cpu_and_none_takes_no_slot():
+    async def scenario():
+        scheduler = JobScheduler({"cpu": 1})
+        gate = asyncio.Event()
+
+        async def job() -> None:
+            await gate.wait()
+
+        scheduler.submit("unknown", "gpu", job)
+        scheduler.submit("unslotted", None, job)
+        await asyncio.sleep(0)
+        assert scheduler.stats()["cpu"] == {"limit": 1, "running": 1, "queued": 0}
+        gate.set()
+        await asyncio.sleep(0.01)
+        assert scheduler.stats()["cpu"]["running"] == 0
+
+    _run(scenario())
+
+
+def test_crashing_job_releases_its_slot():
+    async def scenario():
+        scheduler = JobScheduler({"cpu": 1})
+
+        async def crash() -> None:
+            raise RuntimeError("boom")
+
+        await scheduler.submit("crash", "cpu", crash)
+        assert scheduler.stats()["cpu"]["running"] == 0
+
+    _run(scenario())
+
+
+def test_extra_slots_only_take_free_capacity():
+    async def scenario():
+        scheduler = JobScheduler({"ffmpeg": 3})
+        async with scheduler.slot("ffmpeg"):
+            with scheduler.extra_slots("ffmpeg", 5) as extra:
+                assert extra == 2
+                assert scheduler.stats()["ffmpeg"]["running"] == 3
+            assert scheduler.stats()["ffmpeg"]["running"] == 1
+
+    _run(scenario())
+
+
+def test_released_extra_slot_goes_to_a_queued_job():
+    async def scenario():
+        scheduler = JobScheduler({"ffmpeg": 2})
+        gate = asyncio.Event()
+        ran: list[str] = []
+
+        async def job(name: str) -> None:
+            ran.append(name)
+            await gate.wait()
+
+        async with scheduler.slot("ffmpeg"):
+            with scheduler.extra_slots("ffmpeg", 1) as extra:
+                assert extra == 1
+                scheduler.submit("queued", "ffmpeg", job, "queued")
+                await asyncio.sleep(0)
+                assert ran == []
+            # Releasing the extra slot hands it to the queued job
+            await asyncio.sleep(0)
+            assert ran == ["queued"]
+        gate.set()
+        await asyncio.sleep(0.01)
+        assert scheduler.stats()["ffmpeg"] == {"limit": 2, "running": 0, "queued": 0}
+
+    _run(scenario())
+
+
+def test_wait_hook_reports_a_slot_wait_of_a_submitted_job():
+    async def scenario():
+        scheduler = JobScheduler({"ffmpeg": 1, "cpu": 1})
+        events: list[tuple[str, bool]] = []
+        scheduler.add_wait_hook(lambda job_id, waiting: events.append((job_id, waiting)))
+        gate = asyncio.Event()
+        entered: list[str] = []
+
+        async def blocker() -> None:
+            await gate.wait()
+
+        async def pipeline() -> None:
+            async with scheduler.slot("cpu"):
+                entered.append("cpu")
+            async with scheduler.slot("ffmpeg"):
+                entered.append("ffmpeg")
+
+        scheduler.submit("blocker", "ffmpeg", blocker)
+        task = scheduler.submit("pipeline", None, pipeline)
+        await asyncio.sleep(0)
+        # A free slot is taken without a wait
+        assert entered == ["cpu"]
+        assert events == [("pipeline", True)]
+
+        gate.set()
+        await task
+        assert entered == ["cpu", "ffmpeg"]
+        assert events == [("pipeline", True), ("pipeline", False)]
+
+        # slot() outside a submitted job reports nothing
+        async with scheduler.slot("ffmpeg"):
+            pass
+        assert len(events) == 2
+
+    _run(scenario())
+
+
+def test_wait_hook_is_not_called_back_for_a_cancelled_wait():
+    async def scenario():
+        scheduler = JobScheduler({"ffmpeg": 1})
+        events: list[tuple[str, bool]] = []
+        scheduler.add_wait_hook(lambda job_id, waiting: events.append((job_id, waiting)))
+
+        async def step() -> None:
+            async with scheduler.slot("ffmpeg"):
+                pass
+
+        async with scheduler.slot("ffmpeg"):
+            scheduler.submit("pipeline", None, step)
+            await asyncio.sleep(0)
+            assert await scheduler.cancel("pipeline")
+        assert events == [("pipeline", True)]
+        assert scheduler.stats()["ffmpeg"] == {"limit": 1, "running": 0, "queued": 0}
+
+    _run(scenario())
@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+import pytest
+
+from app.services.segment_encode import _parse_keyframes, plan_segments, segmentation_enabled
+
+
+def _assert_covers(segments, duration):
+    assert segments[0][0] == 0.0
+    for (start, length), (next_start, _) in zip(segments, segments[1:]):
+        assert start + length == pytest.approx(next_start)
+    last_start, last_length = segments[-1]
+    assert last_start + last_length == pytest.approx(duration)
+
+
+def test_segments_start_at_keyframes_and_cover_the_input():
+    keyframes = [float(t) for t in range(0, 120, 2)]
+    segments = plan_segments(keyframes, 120.0, 4)
+    assert [start for start, _ in segments] == [0.0, 30.0, 60.0, 90.0]
+    _assert_covers(segments, 120.0)
+
+
+def test_segments_are_at_least_the_minimum_length():
+    keyframes = [float(t) for t in range(0, 60)]
+    segments = plan_segments(keyframes, 60.0, 16, min_length=10)
+    assert len(segments) == 6
+    assert all(length >= 10 for _, length in segments)
+    _assert_covers(segments, 60.0)
+
+
+def test_no_short_tail_segment():
+    # A keyframe 3 s before the end would leave a tail under half the minimum
+    segments = plan_segments([0.0, 10.0, 20.0, 27.0], 30.0, 3, min_length=10)
+    assert segments == [(0.0, 10.0), (10.0, 10.0), (20.0, 10.0)]
+
+
+def test_sparse_keyframes_give_a_single_segment():
+    assert plan_segments([0.0, 8.3, 16.7], 20.0, 4) == [(0.0, 20.0)]
+    assert plan_segments([], 90.0, 4) == [(0.0, 90.0)]
+
+
+def test_keyframes_are_relative_to_the_start_time():
+    # Packets as ffprobe lists them for a file whose first timestamp is 3.5 s
+    output = "\n".join(
+        [f"packet,{3.5 + t:.6f},{'K__' if t % 20 == 0 else '___'}" for t in range(0, 60, 2)]
+        + ["packet,N/A,K__", "format,3.500000"]
+    )
+    keyframes = _parse_keyframes(output)
+    assert keyframes == pytest.approx([0.0, 20.0, 40.0])
+
+    segments = plan_segments(keyframes, 60.0, 3, min_length=10)
+    assert segments == pytest.approx([(0.0, 20.0), (20.0, 20.0), (40.0, 20.0)])
+    _assert_covers(segments, 60.0)
+
+
+def test_keyframes_without_a_start_time():
+    assert _parse_keyframes("packet,0.000000,K__\npacket,1.000000,___\nformat,N/A") == [0.0]
+
+
+def test_segmentation_is_opt_in(monkeypatch):
+    monkeypatch.setenv("VIMIX_SEGMENT_WORKERS", "4")
+    monkeypatch.delenv("VIMIX_SEGMENT_ENCODING", raising=False)
+    assert not segmentation_enabled(600.0)
+
+    monkeypatch.setenv("VIMIX_SEGMENT_ENCODING", "1")
+    assert segmentation_enabled(600.0)
+    assert not segmentation_enabled(30.0)
+    assert not segmentation_enabled(None)
+
+    monkeypatch.setenv("VIMIX_SEGMENT_WORKERS", "1")
+    assert not segmentation_enabled(600.0)
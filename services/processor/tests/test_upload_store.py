@@ -0,0 +1,135 @@
+from __future__ import annotations
+
+import hashlib
+import io
+import os
+import time
+from pathlib import Path
+
+import pytest
+
+from app.services.upload_store import UploadStore
+
+
+def _store(tmp_path: Path) -> UploadStore:
+    root = tmp_path / "uploads"
+    root.mkdir(exist_ok=True)
+    return UploadStore(root)
+
+
+def test_same_content_is_stored_once(tmp_path):
+    store = _store(tmp_path)
+    first = store.save("a.mp4", io.BytesIO(b"video"))
+    assert first.id == hashlib.sha256(b"video").hexdigest()
+    assert first.path == tmp_path / "uploads" / first.id / "a.mp4"
+    assert first.size == 5
+
+    again = store.save("b.mp4", io.BytesIO(b"video"))
+    assert again is first
+    assert again.filename == "a.mp4"
+    assert [p.name for p in (tmp_path / "uploads").iterdir()] == [first.id]
+
+
+def test_save_replaces_a_stale_directory(tmp_path):
+    root = tmp_path / "uploads"
+    stale = root / hashlib.sha256(b"video").hexdigest()
+    stale.mkdir(parents=True)
+    (stale / "one.mp4").write_bytes(b"video")
+    (stale / "two.mp4").write_bytes(b"video")
+    store = UploadStore(root)
+    assert store.get(stale.name) is None
+
+    upload = store.save("a.mp4", io.BytesIO(b"video"))
+    assert upload.path == stale / "a.mp4"
+    assert sorted(p.name for p in stale.iterdir()) == ["a.mp4"]
+    assert [p.name for p in root.iterdir()] == [stale.name]
+
+
+def test_save_after_delete_before_the_directory_is_removed(tmp_path):
+    store = _store(tmp_path)
+    upload = store.save("a.mp4", io.BytesIO(b"video"))
+    freed = store.delete(upload.id)
+    assert freed == upload.path.parent
+
+    again = store.save("b.mp4", io.BytesIO(b"video"))
+    assert again.path == freed / "b.mp4"
+    assert again.path.read_bytes() == b"video"
+
+
+def test_load_adopts_stored_uploads_and_drops_partial_ones(tmp_path):
+    store = _store(tmp_path)
+    upload = store.save("a.mp4", io.BytesIO(b"video"))
+    partial = tmp_path / "uploads" / ".partial"
+    partial.mkdir()
+
+    reloaded = _store(tmp_path)
+    loaded = reloaded.get(upload.id)
+    assert loaded is not None
+    assert loaded.path == upload.path
+    assert loaded.size == 5
+    assert not partial.exists()
+
+
+def test_delete_waits_for_referencing_jobs(tmp_path):
+    store = _store(tmp_path)
+    upload = store.save("a.mp4", io.BytesIO(b"video"))
+    store.acquire(upload.id, "job-1")
+    store.acquire(upload.id, "job-2")
+    assert store.stats() == {"uploads": 1, "bytes": 5, "referenced": 1}
+
+    assert store.delete(upload.id) is None
+    assert upload.delete_requested
+    with pytest.raises(KeyError):
+        store.acquire(upload.id, "job-3")
+    assert upload.job_ids == {"job-1", "job-2"}
+
+    assert store.release("job-1") == []
+    assert store.get(upload.id) is upload
+    assert store.release("job-2") == [upload.path.parent]
+    assert store.get(upload.id) is None
+    assert store.release("job-2") == []
+
+
+def test_upload_again_cancels_a_requested_delete(tmp_path):
+    store = _store(tmp_path)
+    upload = store.save("a.mp4", io.BytesIO(b"video"))
+    store.acquire(upload.id, "job-1")
+    store.delete(upload.id)
+
+    assert store.save("a.mp4", io.BytesIO(b"video")) is upload
+    assert not upload.delete_requested
+    store.acquire(upload.id, "job-2")
+    assert store.release("job-1") == []
+    assert store.release("job-2") == []
+    assert store.get(upload.id) is upload
+
+
+def test_delete_unknown_upload(tmp_path):
+    store = _store(tmp_path)
+    with pytest.raises(KeyError):
+        store.delete("missing")
+    with pytest.raises(KeyError):
+        store.acquire("missing", "job-1")
+
+
+def test_collect_expired_skips_referenced_uploads(tmp_path):
+    store = _store(tmp_path)
+    idle = store.save("idle.mp4", io.BytesIO(b"idle"))
+    used = store.save("used.mp4", io.BytesIO(b"used"))
+    store.acquire(used.id, "job-1")
+    idle.last_used = used.last_used = time.time() - 100
+
+    assert store.collect_expired(50) == [idle.path.parent]
+    assert store.get(idle.id) is None
+    assert store.get(used.id) is used
+
+    store.release("job-1")
+    assert store.collect_expired(50) == []
+
+
+def test_id_for_path(tmp_path):
+    store = _store(tmp_path)
+    upload = store.save("a.mp4", io.BytesIO(b"video"))
+    assert store.id_for_path(upload.path) == upload.id
+    assert store.id_for_path(tmp_path / "jobs" / upload.id / "a.mp4") is None
+    assert store.id_for_path(Path(os.sep, "elsewhere", "a.mp4")) is None
@@ -0,0 +1,54 @@
+from __future__ import annotations
+
+import asyncio
+
+from app.routers import jobs
+from app.services.job_manager import job_manager
+
+
+def _run(coro):
+    return asyncio.run(coro)
+
+
+def test_stream_ends_when_a_watched_job_is_removed(monkeypatch):
+    monkeypatch.setattr(jobs, "KEEPALIVE_SECONDS", 0.05)
+
+    async def scenario():
+        kept = job_manager.create("image-convert", "a.png")
+        removed = job_manager.create("image-convert", "b.png")
+        job_manager.mark_queued(kept.id)
+        job_manager.mark_queued(removed.id)
+        stream = jobs._watch_jobs([kept.id, removed.id])
+        try:
+            snapshot = await stream.__anext__()
+            assert snapshot["type"] == "snapshot"
+            assert len(snapshot["jobs"]) == 2
+
+            job_manager.remove_job(removed.id)
+            assert (await stream.__anext__())["type"] == "keepalive"
+
+            job_manager.mark_failed(kept.id, "boom")
+            messages = [message async for message in stream]
+        finally:
+            await stream.aclose()
+            job_manager.remove_job(kept.id)
+        assert [message["type"] for message in messages] == ["job_finished", "done"]
+        assert messages[0]["job"]["id"] == kept.id
+        assert messages[-1]["batch"]["total"] == 1
+
+    _run(asyncio.wait_for(scenario(), timeout=5))
+
+
+def test_stream_ends_when_every_watched_job_is_removed(monkeypatch):
+    monkeypatch.setattr(jobs, "KEEPALIVE_SECONDS", 0.05)
+
+    async def scenario():
+        job = job_manager.create("image-convert", "a.png")
+        job_manager.mark_queued(job.id)
+        stream = jobs._watch_jobs([job.id])
+        assert (await stream.__anext__())["type"] == "snapshot"
+        job_manager.remove_job(job.id)
+        messages = [message async for message in stream]
+        assert messages == [{"type": "done", "batch": jobs._batch_summary([])}]
+
+    _run(asyncio.wait_for(scenario(), timeout=5))